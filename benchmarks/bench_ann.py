@@ -0,0 +1,74 @@
+"""Recall/latency benchmark of the IVF index against exact search.
+
+Usage::
+
+    PYTHONPATH=. python benchmarks/bench_ann.py --rows 200000 --dim 256 --nlist 512
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+
+from video_agent.stores.ivf import IVFIndex
+from video_agent.stores.memory import VectorRecord, VectorStore
+
+
+def clustered_vectors(rows: int, dim: int, clusters: int, rng: np.random.Generator) -> np.ndarray:
+    """Gaussian mixture, roughly how frame embeddings of many scenes cluster."""
+    centres = rng.normal(size=(clusters, dim)).astype(np.float32)
+    labels = rng.integers(0, clusters, size=rows)
+    return centres[labels] + 0.35 * rng.normal(size=(rows, dim)).astype(np.float32)
+
+
+def timed_search(store: VectorStore, queries: np.ndarray, k: int, **options) -> tuple[list[set], np.ndarray]:
+    results, latencies = [], []
+    for query in queries:
+        start = time.perf_counter()
+        hits = store.search(query, k, **options)
+        latencies.append(time.perf_counter() - start)
+        results.append({(h.record.video_id, h.record.start_ms) for h in hits})
+    return results, np.asarray(latencies) * 1000.0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--dim", type=int, default=256)
+    parser.add_argument("--clusters", type=int, default=2_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--nlist", type=int, default=512)
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[1, 4, 8, 16, 32, 64])
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    vectors = clustered_vectors(args.rows, args.dim, args.clusters, rng)
+    queries = vectors[rng.choice(args.rows, args.queries, replace=False)]
+    queries = queries + 0.1 * rng.normal(size=queries.shape).astype(np.float32)
+    records = [VectorRecord(f"v{i // 10_000}", i, i + 1, vector) for i, vector in enumerate(vectors)]
+
+    exact = VectorStore()
+    exact.add(records)
+    start = time.perf_counter()
+    ivf = VectorStore(index=IVFIndex(nlist=args.nlist))
+    ivf.add(records)
+    build_s = time.perf_counter() - start
+
+    truth, latencies = timed_search(exact, queries, args.k)
+    print(f"rows {args.rows}, dim {args.dim}, k {args.k}, nlist {args.nlist}, build {build_s:.1f}s")
+    print(f"{'search':>12} {'recall@k':>9} {'p50 ms':>8} {'p99 ms':>8}")
+    print(f"{'exact':>12} {1.0:9.3f} {np.percentile(latencies, 50):8.2f} {np.percentile(latencies, 99):8.2f}")
+    for nprobe in args.nprobe:
+        found, latencies = timed_search(ivf, queries, args.k, nprobe=nprobe)
+        recall = np.mean([len(f & t) / len(t) for f, t in zip(found, truth)])
+        print(
+            f"{'nprobe=' + str(nprobe):>12} {recall:9.3f} "
+            f"{np.percentile(latencies, 50):8.2f} {np.percentile(latencies, 99):8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
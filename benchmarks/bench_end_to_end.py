@@ -0,0 +1,189 @@
+"""End-to-end ingest and query benchmark on synthetic videos.
+
+Generates videos with procedural frames (a background colour per scene and a
+moving square) and speech-like audio (voiced harmonic syllables separated by
+pauses), ingests them through the full pipeline with the deterministic
+stand-in ASR, and answers queries with the stand-in LLM. Reports ingest
+throughput in video-seconds per wall-second, query latency percentiles and
+the per-stage profile. Needs no GPU or network access.
+
+Usage::
+
+    PYTHONPATH=. python benchmarks/bench_end_to_end.py --videos 4 --seconds 300 --queries 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from pathlib import Path
+
+import av
+import numpy as np
+
+from video_agent.agent import StandInLLM, StandInQueryEmbedder, VideoAgent
+from video_agent.asr import BatchingTranscriber, StandInASRBackend, VADTranscriber
+from video_agent.incremental import index_ingested
+from video_agent.pipeline import IngestPipeline
+from video_agent.profiling import Profiler
+from video_agent.stores import BM25Index, IVFIndex, TranscriptStore, VectorStore
+
+
+QUERY_WORDS = ("fourier", "transform", "matrix", "camera", "door", "person", "theorem", "gradient", "motion")
+
+
+def speech_like(seconds: float, rate: int, rng: np.random.Generator) -> np.ndarray:
+    """Syllables of a few harmonics of a drifting pitch, in phrases separated by pauses."""
+    samples = np.zeros(int(seconds * rate), dtype=np.float32)
+    position = 0
+    while position < len(samples):
+        phrase = int(rng.uniform(1.0, 4.0) * rate)
+        t = np.arange(min(phrase, len(samples) - position)) / rate
+        pitch = rng.uniform(100.0, 220.0) * (1.0 + 0.1 * np.sin(2 * np.pi * 0.5 * t))
+        phase = 2 * np.pi * np.cumsum(pitch) / rate
+        voice = sum(np.sin(h * phase) / h for h in (1, 2, 3, 4))
+        envelope = np.clip(np.sin(2 * np.pi * rng.uniform(3.0, 5.0) * t), 0.0, None)
+        samples[position : position + len(t)] = 0.2 * voice * envelope
+        position += len(t) + int(rng.uniform(0.3, 1.5) * rate)
+    return samples
+
+
+def synthetic_video(
+    path: Path,
+    seconds: float,
+    *,
+    width: int = 320,
+    height: int = 240,
+    fps: int = 25,
+    audio_rate: int = 16_000,
+    scene_s: float = 8.0,
+    seed: int = 0,
+) -> None:
+    rng = np.random.default_rng(seed)
+    audio = speech_like(seconds, audio_rate, rng)
+    frames = int(seconds * fps)
+    colours = rng.integers(0, 256, size=(int(seconds / scene_s) + 1, 3), dtype=np.uint8)
+    size = max(8, height // 6)
+    with av.open(str(path), "w") as container:
+        video = container.add_stream("mpeg4", rate=fps)
+        video.width, video.height, video.pix_fmt = width, height, "yuv420p"
+        sound = container.add_stream("aac", rate=audio_rate)
+        sound.layout = "mono"
+        per_frame = audio_rate // fps
+        image = np.empty((height, width, 3), dtype=np.uint8)
+        for i in range(frames):
+            image[:] = colours[int(i / fps / scene_s)]
+            x = (i * 4) % (width - size)
+            y = int((height - size) * (0.5 + 0.4 * np.sin(i / fps)))
+            image[y : y + size, x : x + size] = 255 - colours[int(i / fps / scene_s)]
+            frame = av.VideoFrame.from_ndarray(image, format="rgb24")
+            frame.pts = i
+            container.mux(video.encode(frame))
+            block = audio[i * per_frame : (i + 1) * per_frame]
+            if block.size:
+                chunk = av.AudioFrame.from_ndarray(block[None, :], format="flt", layout="mono")
+                chunk.sample_rate, chunk.pts = audio_rate, i * per_frame
+                container.mux(sound.encode(chunk))
+        container.mux(video.encode())
+        container.mux(sound.encode())
+
+
+def percentiles(latencies_ms: list[float]) -> str:
+    p50, p95, p99 = np.percentile(latencies_ms, [50, 95, 99])
+    return f"p50 {p50:.2f} ms, p95 {p95:.2f} ms, p99 {p99:.2f} ms"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--videos", type=int, default=2)
+    parser.add_argument("--seconds", type=float, default=120.0)
+    parser.add_argument("--width", type=int, default=320)
+    parser.add_argument("--height", type=int, default=240)
+    parser.add_argument("--fps", type=int, default=25)
+    parser.add_argument("--chunk-ms", type=int, default=30_000)
+    parser.add_argument("--sample-fps", type=float, default=1.0)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--coarse-workers", type=int, default=0, help="processes for coarse embedding")
+    parser.add_argument("--asr-ms-per-second", type=float, default=0.0, help="simulated ASR cost")
+    parser.add_argument("--llm-first-token-ms", type=float, default=0.0, help="simulated LLM latency")
+    parser.add_argument("--llm-ms-per-token", type=float, default=0.0)
+    parser.add_argument("--workdir", type=Path, default=None, help="keep generated videos here")
+    args = parser.parse_args()
+
+    workdir = args.workdir or Path(tempfile.mkdtemp(prefix="bench-e2e-"))
+    workdir.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for i in range(args.videos):
+        path = workdir / f"synthetic-{i}-{int(args.seconds)}s-{args.width}x{args.height}.mp4"
+        if not path.exists():
+            synthetic_video(path, args.seconds, width=args.width, height=args.height, fps=args.fps, seed=i)
+        paths.append(path)
+
+    profiler = Profiler()
+    backend = StandInASRBackend(ms_per_audio_second=args.asr_ms_per_second)
+    coarse, fine = VectorStore(), VectorStore(index=IVFIndex(nlist=64))
+    transcripts, lexical = TranscriptStore(), BM25Index()
+    pool = ProcessPoolExecutor(args.coarse_workers) if args.coarse_workers else nullcontext()
+    with BatchingTranscriber(backend) as batching, pool as coarse_pool:
+        pipeline = IngestPipeline(
+            transcriber=VADTranscriber(batching), profiler=profiler, coarse_pool=coarse_pool
+        )
+        start = time.perf_counter()
+        for i, path in enumerate(paths):
+            video_id = f"video-{i}"
+            items = pipeline.ingest(
+                path, scope=f"video:{video_id}", chunk_ms=args.chunk_ms, sample_fps=args.sample_fps
+            )
+            for item in items:
+                index_ingested(video_id, item, coarse, fine, transcripts, lexical)
+        ingest_s = time.perf_counter() - start
+    video_s = args.videos * args.seconds
+    print(f"ingest: {video_s:.0f} video-s in {ingest_s:.2f} s = {video_s / ingest_s:.1f} video-s/s")
+    print(f"stores: {len(coarse)} coarse, {len(fine)} fine, {len(transcripts)} transcript segments")
+
+    agent = VideoAgent(
+        StandInQueryEmbedder(coarse.matrix.shape[1]),
+        coarse,
+        StandInLLM(first_token_ms=args.llm_first_token_ms, ms_per_token=args.llm_ms_per_token),
+        lexical_index=lexical,
+        transcript_store=transcripts,
+        profiler=profiler,
+        fine_store=fine,
+        embed_fine_query=StandInQueryEmbedder(fine.matrix.shape[1]),
+    )
+    rng = np.random.default_rng(0)
+
+    async def run_queries() -> tuple[list[float], list[float]]:
+        first, total = [], []
+        for q in range(args.queries):
+            question = "when is the " + " ".join(rng.choice(QUERY_WORDS, size=3)) + " discussed"
+            video_id = f"video-{q % args.videos}" if q % 2 else None
+            start = time.perf_counter()
+            first_hits = None
+            async for event in agent.astream(question, video_id=video_id):
+                if event.kind == "hits" and first_hits is None:
+                    first_hits = time.perf_counter() - start
+            total.append((time.perf_counter() - start) * 1000.0)
+            first.append(first_hits * 1000.0)
+        return first, total
+
+    first, total = asyncio.run(run_queries())
+    print(f"query, first hits: {percentiles(first)}")
+    print(f"query, full answer: {percentiles(total)}")
+
+    # Totals rather than stats(): per-scope stats only keep the most recent
+    # scopes, and a long query run would evict the ingest ones.
+    print(f"{'kind':>8} {'stage':>20} {'calls':>7} {'wall s':>8} {'cpu s':>8} {'items/s':>9}")
+    for (kind, stage), stats in profiler.totals().items():
+        print(
+            f"{kind:>8} {stage:>20} {stats.calls:7d} {stats.wall_s:8.2f} {stats.cpu_s:8.2f}"
+            f" {stats.items_per_s:9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
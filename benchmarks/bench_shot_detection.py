@@ -0,0 +1,68 @@
+"""Benchmark shot detection per frame against batches of frames.
+
+The baseline is the vectorized detector fed one frame at a time, as the
+chunker does with the default ``batch_size=1``.
+
+Usage::
+
+    PYTHONPATH=. python benchmarks/bench_shot_detection.py --frames 192 --width 640 --height 360
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+
+from video_agent.chunking.shots import ShotDetector
+
+
+def synthetic_frames(count: int, height: int, width: int, shot_len: int, seed: int = 0) -> np.ndarray:
+    """Noisy frames whose base colour changes every ``shot_len`` frames."""
+    rng = np.random.default_rng(seed)
+    colours = rng.integers(0, 256, size=(count // shot_len + 1, 3), dtype=np.int16)
+    frames = np.empty((count, height, width, 3), dtype=np.uint8)
+    for i in range(count):
+        noise = rng.integers(-12, 13, size=(height, width, 3), dtype=np.int16)
+        frames[i] = np.clip(colours[i // shot_len] + noise, 0, 255)
+    return frames
+
+
+def score_in_batches(frames: np.ndarray, batch_size: int, repeat: int) -> tuple[np.ndarray, float]:
+    """Scores of ``frames`` and the best throughput (frames/s) over ``repeat`` runs."""
+    best = 0.0
+    for _ in range(repeat):
+        detector = ShotDetector(batch_size=batch_size)
+        start = time.perf_counter()
+        batches = [frames[i : i + batch_size] for i in range(0, len(frames), batch_size)]
+        scores = np.concatenate([detector.scores(batch) for batch in batches])
+        best = max(best, len(frames) / (time.perf_counter() - start))
+    return scores, best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=192)
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=360)
+    parser.add_argument("--shot-len", type=int, default=75)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[4, 16, 64])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    frames = synthetic_frames(args.frames, args.height, args.width, args.shot_len)
+    baseline, baseline_fps = score_in_batches(frames, 1, args.repeat)
+    print(f"frames           {len(frames)} @ {args.width}x{args.height}")
+    print(f"per frame        {baseline_fps:10.1f} frames/s")
+    for batch_size in args.batch_sizes:
+        scores, fps = score_in_batches(frames, batch_size, args.repeat)
+        error = float(np.abs(scores - baseline).max())
+        speedup = fps / baseline_fps
+        print(f"batch {batch_size:<4d}       {fps:10.1f} frames/s  {speedup:5.2f}x  max error {error:.1e}")
+    cuts = np.flatnonzero(baseline >= ShotDetector().threshold)
+    print(f"boundaries       {cuts.tolist()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Shared fixtures: small synthetic videos written with PyAV."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+import pytest
+
+av = pytest.importorskip("av")
+
+FrameFn = Callable[[int, float], np.ndarray]  # (frame number, seconds) -> (H, W, 3) uint8
+
+
+def write_video(
+    path: Path,
+    seconds: float,
+    frame: FrameFn,
+    *,
+    fps: int = 10,
+    audio: np.ndarray | None = None,
+    audio_rate: int = 16_000,
+    codec: str = "mpeg4",
+    audio_codec: str = "aac",
+    gop: int | None = None,
+) -> Path:
+    """Encode ``frame(i, t)`` for every frame, plus mono float ``audio`` if given."""
+    first = frame(0, 0.0)
+    with av.open(str(path), "w") as container:
+        video = container.add_stream(codec, rate=fps)
+        video.height, video.width = first.shape[:2]
+        video.pix_fmt = "yuv420p"
+        if gop is not None:
+            video.codec_context.gop_size = gop
+        sound = None
+        if audio is not None:
+            sound = container.add_stream(audio_codec, rate=audio_rate)
+            sound.layout = "mono"
+        per_frame = audio_rate // fps
+        for i in range(int(seconds * fps)):
+            image = av.VideoFrame.from_ndarray(np.ascontiguousarray(frame(i, i / fps)), format="rgb24")
+            image.pts = i
+            container.mux(video.encode(image))
+            if sound is not None:
+                block = audio[i * per_frame : (i + 1) * per_frame]
+                if block.size:
+                    pcm = block[None, :].astype(np.float32)
+                    samples = av.AudioFrame.from_ndarray(pcm, format="flt", layout="mono")
+                    samples.sample_rate, samples.pts = audio_rate, i * per_frame
+                    container.mux(sound.encode(samples))
+        container.mux(video.encode())
+        if sound is not None:
+            container.mux(sound.encode())
+    return path
+
+
+def scenes(colours: np.ndarray, scene_s: float, size: tuple[int, int] = (48, 64)) -> FrameFn:
+    """Frames of flat colour ``colours[k]`` during the k-th ``scene_s`` seconds, with a moving square."""
+
+    def frame(i: int, t: float) -> np.ndarray:
+        colour = colours[min(int(t / scene_s), len(colours) - 1)]
+        image = np.empty((*size, 3), dtype=np.uint8)
+        image[:] = colour
+        x = (2 * i) % (size[1] - 8)
+        image[4:12, x : x + 8] = 255 - colour
+        return image
+
+    return frame
+
+
+def tone(seconds: float, rate: int = 16_000, *, amplitude: float = 0.3, hz: float = 220.0) -> np.ndarray:
+    t = np.arange(int(seconds * rate)) / rate
+    return (amplitude * np.sin(2 * np.pi * hz * t)).astype(np.float32)
+
+
+@pytest.fixture(scope="session")
+def scene_video(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """12 s, 10 fps, four 3-second scenes of distinct colours, with a tone track."""
+    colours = np.array([[200, 30, 30], [30, 200, 30], [30, 30, 200], [220, 220, 40]], dtype=np.uint8)
+    path = tmp_path_factory.mktemp("media") / "scenes.mp4"
+    return write_video(path, 12.0, scenes(colours, 3.0), audio=tone(12.0), gop=10)
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import numpy as np
+
+from video_agent.agent import StandInLLM, StandInQueryEmbedder, VideoAgent
+from video_agent.stores import VectorRecord, VectorStore
+
+DIM = 16
+
+
+class RecordingLLM(StandInLLM):
+    def __init__(self) -> None:
+        super().__init__()
+        self.prompts: list[str] = []
+
+    def stream(self, prompt: str):
+        self.prompts.append(prompt)
+        return super().stream(prompt)
+
+
+def _stores(query: np.ndarray) -> tuple[VectorStore, VectorStore]:
+    """Three 10 s chunks of video ``a``; the middle one and its frame at 14 s match ``query``."""
+    rng = np.random.default_rng(0)
+    coarse, fine = VectorStore(), VectorStore()
+    for chunk in range(3):
+        embedding = query + 0.3 * rng.standard_normal(DIM) if chunk == 1 else rng.standard_normal(DIM)
+        coarse.add([VectorRecord("a", 10_000 * chunk, 10_000 * (chunk + 1), embedding)])
+    fine.add(
+        VectorRecord("a", 1000 * s, 1000 * (s + 1), query if s == 14 else rng.standard_normal(DIM))
+        for s in range(30)
+    )
+    return coarse, fine
+
+
+def test_fine_store_pins_the_answer_to_the_best_moment():
+    embed = StandInQueryEmbedder(DIM)
+    question = "when is the goal scored"
+    coarse, fine = _stores(embed(question))
+    llm = RecordingLLM()
+    agent = VideoAgent(embed, coarse, llm, fine_store=fine, k=2)
+
+    answer = agent.ask(question, video_id="a")
+
+    assert (answer.hits[0].start_ms, answer.hits[0].end_ms) == (10_000, 20_000)
+    assert answer.moments[0].record.start_ms == 14_000
+    assert "Best matching moments: a 0:14" in llm.prompts[-1]
+
+
+def test_without_a_fine_store_there_are_no_moments():
+    embed = StandInQueryEmbedder(DIM)
+    coarse, _ = _stores(embed("goal"))
+    llm = RecordingLLM()
+    answer = VideoAgent(embed, coarse, llm).ask("goal")
+    assert answer.moments == () and answer.hits
+    assert "moments" not in llm.prompts[-1]
+
+
+def test_an_empty_fine_store_answers_from_the_coarse_store():
+    embed = StandInQueryEmbedder(DIM)
+    question = "when is the goal scored"
+    coarse, _ = _stores(embed(question))
+    assert coarse.search(embed(question), 1)[0].score >= 0.2  # so the fine store is searched
+    answer = VideoAgent(embed, coarse, RecordingLLM(), fine_store=VectorStore()).ask(question)
+    assert (answer.hits[0].start_ms, answer.hits[0].end_ms) == (10_000, 20_000)
+    assert answer.moments == ()
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import asyncio
+
+import numpy as np
+import pytest
+
+django = pytest.importorskip("django")
+
+from django.conf import settings  # noqa: E402
+
+if not settings.configured:
+    settings.configure(
+        ROOT_URLCONF=__name__,
+        INSTALLED_APPS=["video_agent.api"],
+        MIDDLEWARE=["django.middleware.csrf.CsrfViewMiddleware"],
+        VIDEO_AGENT_FACTORY=f"{__name__}.make_agent",
+    )
+    django.setup()
+
+from django.core.files.uploadedfile import SimpleUploadedFile  # noqa: E402
+from django.test import AsyncClient, Client, override_settings  # noqa: E402
+from django.urls import include, path  # noqa: E402
+
+from video_agent.agent import StandInLLM, StandInQueryEmbedder, VideoAgent  # noqa: E402
+from video_agent.api import services  # noqa: E402
+from video_agent.stores import MmapVectorStore, VectorRecord  # noqa: E402
+
+urlpatterns = [path("api/", include("video_agent.api.urls"))]
+
+DIM = 16
+STORE_DIR = None  # set by the fixture before the agent is built
+
+
+def make_agent() -> VideoAgent:
+    return VideoAgent(StandInQueryEmbedder(DIM), MmapVectorStore(STORE_DIR, DIM), StandInLLM())
+
+
+@pytest.fixture
+def api(tmp_path, monkeypatch):
+    monkeypatch.setattr(f"{__name__}.STORE_DIR", tmp_path / "coarse")
+    MmapVectorStore(tmp_path / "coarse", DIM)
+    services.get_agent.cache_clear()
+    services.get_job_queue.cache_clear()
+    monkeypatch.setattr(services, "_refreshed_generation", None)
+    with override_settings(VIDEO_AGENT_JOB_DB=str(tmp_path / "jobs.db"), VIDEO_AGENT_UPLOAD_DIR=tmp_path):
+        yield tmp_path
+    services.get_agent.cache_clear()
+    services.get_job_queue.cache_clear()
+
+
+def test_upload_needs_no_csrf_token(api):
+    client = Client(enforce_csrf_checks=True)
+    response = client.post(
+        "/api/videos", {"file": SimpleUploadedFile("clip.mp4", b"data"), "video_id": "cam"}
+    )
+    assert response.status_code == 202
+    job = services.get_job_queue().get(response.json()["job_id"])
+    assert job.video_id == "cam" and job.status == "queued"
+
+
+def test_finished_jobs_make_the_workers_records_searchable(api):
+    agent = services.get_agent()
+    services.refresh_stores()
+    worker_store = MmapVectorStore(api / "coarse")
+    worker_store.add([VectorRecord("cam", 0, 1000, np.ones(DIM))])
+    assert len(agent.coarse_store) == 0
+
+    services.refresh_stores()
+    assert len(agent.coarse_store) == 0  # no job has finished yet
+
+    queue = services.get_job_queue()
+    queue.enqueue("cam", api / "cam.mp4")
+    queue.finish(queue.claim().id)
+    services.refresh_stores()
+    assert len(agent.coarse_store) == 1
+
+
+def test_questions_see_records_from_jobs_finished_since_startup(api):
+    services.get_agent()
+    MmapVectorStore(api / "coarse").add([VectorRecord("cam", 0, 1000, np.ones(DIM))])
+    queue = services.get_job_queue()
+    queue.enqueue("cam", api / "cam.mp4")
+    queue.finish(queue.claim().id)
+
+    async def ask() -> str:
+        response = await AsyncClient().get("/api/ask/stream", {"q": "anything"})
+        return b"".join([part async for part in response.streaming_content]).decode()
+
+    body = asyncio.run(ask())
+    assert body.startswith("event: hits") and '"video_id": "cam"' in body
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from video_agent.asr import BatchingTranscriber, StandInASRBackend
+from video_agent.chunking import AudioSpan
+
+
+class RecordingBackend(StandInASRBackend):
+    def __init__(self, *, fail: bool = False) -> None:
+        super().__init__()
+        self.fail = fail
+        self.batches: list[list[int]] = []
+
+    def transcribe_batch(self, spans):
+        self.batches.append([span.start_ms for span in spans])
+        if self.fail:
+            raise RuntimeError("model crashed")
+        return super().transcribe_batch(spans)
+
+
+def _span(k: int) -> AudioSpan:
+    rng = np.random.default_rng(k)
+    return AudioSpan(1000 * k, 1000 * (k + 1), (0.1 * rng.standard_normal(16_000)).astype(np.float32), 16_000)
+
+
+def test_full_batches_go_out_without_waiting():
+    backend = RecordingBackend()
+    with BatchingTranscriber(backend, batch_size=4, max_wait_ms=10_000) as batcher:
+        start = time.monotonic()
+        results = batcher.transcribe_many([_span(k) for k in range(8)])
+        assert time.monotonic() - start < 5.0
+    assert backend.batches == [[0, 1000, 2000, 3000], [4000, 5000, 6000, 7000]]
+    assert results == [backend.transcribe(_span(k)) for k in range(8)]
+
+
+def test_a_partial_batch_is_flushed_after_max_wait():
+    backend = RecordingBackend()
+    with BatchingTranscriber(backend, batch_size=16, max_wait_ms=50) as batcher:
+        start = time.monotonic()
+        futures = [batcher.submit(_span(k)) for k in range(3)]
+        for future in futures:
+            future.result(timeout=5)
+        assert 0.04 <= time.monotonic() - start < 5.0
+    assert backend.batches == [[0, 1000, 2000]]
+
+
+def test_concurrent_callers_share_batches():
+    backend = RecordingBackend()
+    results = {}
+    with BatchingTranscriber(backend, batch_size=8, max_wait_ms=200) as batcher:
+        threads = [
+            threading.Thread(target=lambda k=k: results.__setitem__(k, batcher.transcribe(_span(k))))
+            for k in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    assert sorted(results) == list(range(8))
+    assert len(backend.batches) < 8 and sum(map(len, backend.batches)) == 8
+
+
+def test_a_backend_error_reaches_every_caller_in_the_batch():
+    with BatchingTranscriber(RecordingBackend(fail=True), batch_size=3, max_wait_ms=1000) as batcher:
+        futures = [batcher.submit(_span(k)) for k in range(3)]
+        for future in futures:
+            with pytest.raises(RuntimeError, match="model crashed"):
+                future.result(timeout=5)
+
+
+def test_close_finishes_queued_work_then_rejects_new_requests():
+    backend = RecordingBackend()
+    batcher = BatchingTranscriber(backend, batch_size=16, max_wait_ms=10_000)
+    futures = [batcher.submit(_span(k)) for k in range(2)]
+    batcher.close()
+    assert all(future.done() and future.exception() is None for future in futures)
+    with pytest.raises(RuntimeError, match="closed"):
+        batcher.submit(_span(2))
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+
+import numpy as np
+
+from video_agent.asr import StandInASRBackend
+from video_agent.cache import DiskCache, cache_key, config_of, file_digest
+from video_agent.pipeline import IngestPipeline
+
+
+@dataclass(frozen=True)
+class Embedder:
+    model: str
+    dim: int = 8
+
+
+def _bounds(chunk) -> tuple:
+    return chunk.index, chunk.start_ms, chunk.end_ms, chunk.active, chunk.segment
+
+
+def test_keys_depend_on_content_stage_and_config(tmp_path):
+    a, b = tmp_path / "a.bin", tmp_path / "b.bin"
+    a.write_bytes(b"same")
+    b.write_bytes(b"same")
+    assert file_digest(a) == file_digest(b)
+    b.write_bytes(b"other")
+    assert file_digest(a) != file_digest(b)
+
+    digest = file_digest(a)
+    assert cache_key(digest, "asr", {"x": 1, "y": 2}) == cache_key(digest, "asr", {"y": 2, "x": 1})
+    assert cache_key(digest, "asr") != cache_key(digest, "coarse")
+    assert cache_key(digest, "coarse", Embedder("clip")) != cache_key(digest, "coarse", Embedder("siglip"))
+    assert config_of(Embedder("clip"))["model"] == "clip"
+
+
+def test_changing_one_stage_only_invalidates_that_stage():
+    options = {"chunk_ms": 30_000}
+    before = IngestPipeline(transcriber=StandInASRBackend(), embed=Embedder("clip")).cache_keys("d", options)
+    after = IngestPipeline(transcriber=StandInASRBackend(), embed=Embedder("siglip")).cache_keys("d", options)
+    assert {stage for stage in before if before[stage] != after[stage]} == {"coarse"}
+
+    rechunked = IngestPipeline(transcriber=StandInASRBackend(), embed=Embedder("clip")).cache_keys(
+        "d", {"chunk_ms": 10_000}
+    )
+    assert all(before[stage] != rechunked[stage] for stage in before)
+
+
+def test_values_round_trip_and_corrupt_entries_read_as_missing(tmp_path):
+    cache = DiskCache(tmp_path)
+    value = {"embedding": np.arange(4, dtype=np.float32), "text": "hello"}
+    cache.put("ab" * 32, value)
+    assert "ab" * 32 in cache
+    loaded = cache.get("ab" * 32)
+    np.testing.assert_array_equal(loaded["embedding"], value["embedding"])
+    assert loaded["text"] == "hello"
+
+    cache._path("cd" * 32).parent.mkdir()
+    cache._path("cd" * 32).write_bytes(b"not a pickle")
+    assert cache.get("cd" * 32, "missing") == "missing"
+    assert "cd" * 32 not in cache
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = DiskCache(tmp_path, max_bytes=3_500)
+    keys = [f"{i:02d}" * 32 for i in range(3)]
+    for age, key in enumerate(keys):
+        cache.put(key, bytes(1000))
+        os.utime(cache._path(key), (1000 + age, 1000 + age))
+    cache.get(keys[0])  # now the most recently used
+
+    cache.put("99" * 32, bytes(1000))
+    assert keys[0] in cache and keys[1] not in cache and keys[2] in cache
+    assert cache.size_bytes() <= 3_500
+
+
+def test_a_second_ingest_is_served_from_the_cache(tmp_path, scene_video):
+    calls = []
+
+    class CountingASR(StandInASRBackend):
+        def transcribe(self, audio):
+            calls.append(audio.start_ms)
+            return super().transcribe(audio)
+
+    pipeline = IngestPipeline(transcriber=CountingASR(), cache=DiskCache(tmp_path))
+    options = dict(chunk_ms=3000, snap_to_keyframes=True)
+    first = list(pipeline.ingest(scene_video, **options))
+    transcribed = len(calls)
+    second = list(pipeline.ingest(scene_video, **options))
+
+    assert transcribed == 4 and len(calls) == transcribed
+    for a, b in zip(first, second, strict=True):
+        assert _bounds(a.chunk) == _bounds(b.chunk) and b.chunk.segment is not None
+        assert a.transcript == b.transcript
+        np.testing.assert_array_equal(a.coarse.embedding, b.coarse.embedding)
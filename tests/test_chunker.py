@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from conftest import write_video
+from video_agent.chunking import (
+    AVDecoder,
+    KeyframeIndex,
+    MotionGate,
+    ShotDetector,
+    StreamingChunker,
+    iter_chunks,
+)
+
+RATE = 16_000
+
+
+def _spans(chunks) -> list[tuple[int, int]]:
+    return [(chunk.start_ms, chunk.end_ms) for chunk in chunks]
+
+
+def _assert_tiles(chunks, end_ms: int) -> None:
+    assert [chunk.index for chunk in chunks] == list(range(len(chunks)))
+    assert chunks[0].start_ms == 0 and chunks[-1].end_ms >= end_ms
+    for before, after in zip(chunks, chunks[1:]):
+        assert before.end_ms == after.start_ms
+    for chunk in chunks:
+        assert all(chunk.start_ms <= frame.timestamp_ms < chunk.end_ms for frame in chunk.frames)
+
+
+def _stepped_audio(seconds: int) -> np.ndarray:
+    """A 440 Hz tone whose amplitude steps up every second."""
+    t = np.arange(seconds * RATE) / RATE
+    return (0.05 * (1 + np.floor(t)) * np.sin(2 * np.pi * 440.0 * t)).astype(np.float32)
+
+
+@pytest.fixture(scope="module")
+def stepped_video(tmp_path_factory):
+    def frame(i: int, t: float) -> np.ndarray:
+        return np.full((48, 64, 3), 20 * int(t), dtype=np.uint8)
+
+    path = tmp_path_factory.mktemp("media") / "stepped.mp4"
+    return write_video(path, 8.0, frame, audio=_stepped_audio(8))
+
+
+def test_fixed_cuts_carry_the_audio_of_their_own_span(stepped_video):
+    chunks = list(
+        iter_chunks(stepped_video, chunk_ms=2500, min_chunk_ms=0, sample_fps=10, audio_rate=RATE)
+    )
+    assert _spans(chunks)[:3] == [(0, 2500), (2500, 5000), (5000, 7500)]
+    _assert_tiles(chunks, 8000)
+    for chunk in chunks:
+        audio = chunk.audio
+        assert (audio.start_ms, audio.end_ms, audio.sample_rate) == (chunk.start_ms, chunk.end_ms, RATE)
+        assert len(audio.samples) == chunk.duration_ms * RATE // 1000
+        # The middle of every whole second in the chunk has that second's amplitude.
+        for second in range(-(-chunk.start_ms // 1000), min(chunk.end_ms // 1000, 8)):
+            offset = (1000 * second + 250 - chunk.start_ms) * RATE // 1000
+            window = audio.samples[offset : offset + RATE // 2]
+            rms = float(np.sqrt(np.mean(window**2)))
+            assert rms == pytest.approx(0.05 * (second + 1) / np.sqrt(2), rel=0.1)
+
+
+def test_shot_cuts_follow_scene_changes(scene_video):
+    chunks = list(
+        iter_chunks(scene_video, chunk_ms=10_000, min_chunk_ms=1000, sample_fps=10, detector=ShotDetector())
+    )
+    assert [chunk.start_ms for chunk in chunks] == [0, 3000, 6000, 9000]
+    _assert_tiles(chunks, 12_000)
+    for chunk in chunks:
+        assert chunk.audio.start_ms == chunk.start_ms
+        assert len(chunk.audio.samples) == chunk.duration_ms * RATE // 1000
+
+
+def test_shot_cuts_never_make_chunks_shorter_than_the_minimum(scene_video):
+    chunks = list(
+        iter_chunks(scene_video, chunk_ms=10_000, min_chunk_ms=4000, sample_fps=10, detector=ShotDetector())
+    )
+    assert [chunk.start_ms for chunk in chunks] == [0, 6000]
+
+
+def test_keyframe_cuts_are_stream_copyable(scene_video):
+    chunks = list(iter_chunks(scene_video, chunk_ms=2500, min_chunk_ms=0, snap_to_keyframes=True))
+    assert [chunk.start_ms for chunk in chunks] == [0, 3000, 6000, 9000]
+    _assert_tiles(chunks, 12_000)
+    for chunk in chunks:
+        segment = chunk.segment
+        assert (segment.start_ms, segment.end_ms) == (chunk.start_ms, chunk.end_ms)
+        assert segment.byte_start is not None and segment.byte_start < segment.byte_end
+
+
+def test_shot_cuts_move_back_to_the_latest_keyframe(scene_video):
+    keyframes = KeyframeIndex(np.arange(0, 12_000, 2500), np.full(5, -1))
+    chunker = StreamingChunker(10_000, detector=ShotDetector(), min_chunk_ms=1000, keyframes=keyframes)
+    with AVDecoder(scene_video, sample_fps=10, audio_rate=RATE) as source:
+        chunks = list(chunker.split(source))
+    assert [chunk.start_ms for chunk in chunks] == [0, 2500, 5000, 7500]
+    _assert_tiles(chunks, 12_000)
+    # Frames sampled between the keyframe and the shot open the next chunk.
+    assert chunks[1].frames[0].timestamp_ms == 2500
+    assert len(chunks[1].audio.samples) == 2500 * RATE // 1000
+
+
+def test_motion_gate_folds_still_stretches_into_idle_chunks(tmp_path):
+    def frame(i: int, t: float) -> np.ndarray:
+        image = np.full((48, 64, 3), 80, dtype=np.uint8)
+        x = (4 * i) % 48 if 3.0 <= t < 6.0 else 20
+        image[10:26, x : x + 16] = 230
+        return image
+
+    path = write_video(tmp_path / "still.mp4", 12.0, frame, audio=np.zeros(12 * RATE, dtype=np.float32))
+    gate = MotionGate(min_idle_ms=2000, stride=2)
+    chunks = list(iter_chunks(path, chunk_ms=30_000, sample_fps=10, motion=gate))
+    _assert_tiles(chunks, 12_000)
+    assert [chunk.active for chunk in chunks] == [False, True, False]
+    idle, active = chunks[0], chunks[1]
+    assert (idle.end_ms, len(idle.frames), idle.audio) == (3000, 1, None)
+    # The background takes a few frames to settle once the square stops.
+    assert active.start_ms == 3000 and 6000 <= active.end_ms < 9000
+    assert len(active.audio.samples) == active.duration_ms * RATE // 1000
+
+
+def test_short_fixed_chunks_need_no_minimum_length(scene_video):
+    chunks = list(iter_chunks(scene_video, chunk_ms=1000))
+    assert [chunk.start_ms for chunk in chunks] == list(range(0, 12_000, 1000))
+    assert StreamingChunker(1000, detector=ShotDetector()).min_chunk_ms == 1000
+    with pytest.raises(ValueError, match="min_chunk_ms"):
+        StreamingChunker(1000, min_chunk_ms=-1)
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import numpy as np
+
+from video_agent.analysis import FrameDeduplicator, dhash
+from video_agent.analysis.dedup import hamming
+from video_agent.chunking import Chunk, Frame
+
+
+def _slide(seed: int) -> np.ndarray:
+    """A light slide with a few dark text blocks."""
+    rng = np.random.default_rng(seed)
+    image = np.full((240, 320, 3), 235, dtype=np.uint8)
+    for _ in range(6):
+        y, x = rng.integers(20, 200), rng.integers(20, 240)
+        image[y : y + 12, x : x + 60] = 30
+    return image
+
+
+def _noisy(image: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """``image`` with +-1 sensor noise on every pixel."""
+    return (image.astype(np.int16) + rng.integers(-1, 2, image.shape)).clip(0, 255).astype(np.uint8)
+
+
+def _chunk(images: list[np.ndarray]) -> Chunk:
+    frames = tuple(Frame(i, 1000 * i, image) for i, image in enumerate(images))
+    return Chunk(0, 0, 1000 * len(images), frames, None)
+
+
+def test_flat_noisy_frames_hash_alike():
+    rng = np.random.default_rng(0)
+    flat = np.full((240, 320, 3), 128, dtype=np.uint8)
+    hashes = dhash(np.stack([_noisy(flat, rng) for _ in range(10)]))
+    assert hamming(hashes[1:], hashes[0]).max() <= 2
+
+
+def test_static_run_collapses_and_a_scene_change_splits_it():
+    rng = np.random.default_rng(1)
+    first, second = _slide(1), _slide(2)
+    images = [_noisy(first, rng) for _ in range(6)] + [_noisy(second, rng) for _ in range(4)]
+    segments = FrameDeduplicator()(_chunk(images))
+    assert [(s.start_ms, s.end_ms) for s in segments] == [(0, 6000), (6000, 10_000)]
+
+
+def test_short_chunks_are_passed_through():
+    chunk = _chunk([_slide(1)])
+    assert FrameDeduplicator().representatives(chunk) is chunk
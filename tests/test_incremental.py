@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import numpy as np
+
+from conftest import scenes, tone, write_video
+from video_agent.asr import StandInASRBackend
+from video_agent.incremental import IncrementalIngestor, IngestState
+from video_agent.pipeline import IngestPipeline
+from video_agent.stores import VectorStore
+
+COLOURS = np.array([[200, 30, 30], [30, 200, 30], [30, 30, 200], [220, 220, 40]], dtype=np.uint8)
+
+
+def _spans(store: VectorStore, video_id: str = "cam") -> list[tuple[int, int]]:
+    return sorted((r.start_ms, r.end_ms) for r in map(store.record, map(int, store.rows(video_id))))
+
+
+def _ingestor(store: VectorStore, state: IngestState | None = None) -> IncrementalIngestor:
+    pipeline = IngestPipeline(transcriber=StandInASRBackend())
+    return IncrementalIngestor("cam", pipeline, store, state=state, chunk_ms=2000)
+
+
+def _assert_contiguous(spans: list[tuple[int, int]]) -> None:
+    assert spans[0][0] == 0
+    for (_, end), (start, _) in zip(spans, spans[1:]):
+        assert end == start
+
+
+def test_growing_file_holds_back_the_last_chunk_and_resumes(tmp_path):
+    path = tmp_path / "live.mp4"
+    frame = scenes(COLOURS, 3.0)
+    store = VectorStore()
+    ingestor = _ingestor(store)
+
+    write_video(path, 6.0, frame, audio=tone(6.0))
+    assert ingestor.update(path) == 2  # [4 s, end) may still grow
+    assert _spans(store) == [(0, 2000), (2000, 4000)]
+    assert (ingestor.state.end_ms, ingestor.state.next_index) == (4000, 2)
+
+    write_video(path, 12.0, frame, audio=tone(12.0))
+    assert ingestor.update(path) == 3
+    # A new process picks up from the saved state.
+    resumed = _ingestor(store, IngestState(ingestor.state.end_ms, ingestor.state.next_index))
+    assert resumed.update(path, final=True) == 1
+
+    spans = _spans(store)
+    assert len(spans) == 6 and spans[-1][1] >= 12_000
+    _assert_contiguous(spans)
+    assert resumed.state.next_index == 6 and resumed.update(path, final=True) == 0
+
+
+def test_segment_files_continue_the_timeline(tmp_path):
+    store = VectorStore()
+    ingestor = _ingestor(store)
+    first = write_video(tmp_path / "a.mp4", 4.0, scenes(COLOURS[:2], 2.0), audio=tone(4.0))
+    second = write_video(tmp_path / "b.mp4", 4.0, scenes(COLOURS[2:], 2.0), audio=tone(4.0))
+
+    assert ingestor.add_segment(first) == 2
+    offset = ingestor.state.end_ms
+    assert offset >= 4000 and ingestor.state.next_index == 2
+    assert ingestor.add_segment(second) == 2
+
+    spans = _spans(store)
+    assert len(spans) == 4 and spans[2][0] == offset
+    _assert_contiguous(spans)
+    assert ingestor.state.next_index == 4
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import numpy as np
+
+from video_agent.stores import IntervalIndex, TemporalIndex
+
+
+def _brute_force(starts, ends, start_ms, end_ms) -> list[int]:
+    return [i for i, (s, e) in enumerate(zip(starts, ends)) if s < end_ms and e > start_ms]
+
+
+def test_overlap_queries_match_brute_force_with_mixed_lengths():
+    rng = np.random.default_rng(0)
+    starts = np.sort(rng.integers(0, 100_000, 300))
+    ends = starts + rng.choice([0, 1, 40, 1_000, 30_000, 5_000_000], 300)
+    index = IntervalIndex()
+    for part in np.array_split(rng.permutation(300), 4):  # out of order: forces a sort
+        index.add(starts[part], ends[part], part)
+    assert len(index) == 300
+    for _ in range(200):
+        start_ms = int(rng.integers(-1_000, 110_000))
+        end_ms = start_ms + int(rng.integers(1, 5_000))
+        found = index.overlapping(start_ms, end_ms)
+        assert sorted(found.tolist()) == _brute_force(starts, ends, start_ms, end_ms)
+        assert np.all(np.diff(starts[found]) >= 0)  # ordered by start
+
+
+def test_half_open_bounds():
+    index = IntervalIndex()
+    index.add([0, 1_000, 2_000], [1_000, 2_000, 3_000], [0, 1, 2])
+    assert index.at(1_000).tolist() == [1]
+    assert index.overlapping(999, 1_001).tolist() == [0, 1]
+    assert index.overlapping(3_000, 4_000).tolist() == []
+
+
+def test_one_long_span_does_not_widen_other_queries():
+    index = IntervalIndex()
+    index.add([0], [36_000_000], [-1])  # ten hours of idle footage
+    index.add(np.arange(10_000) * 1_000, np.arange(10_000) * 1_000 + 1_000, np.arange(10_000))
+    assert index.overlapping(5_000_500, 5_001_500).tolist() == [-1, 5_000, 5_001]
+    # The second-long spans are scanned with their own window, not a ten-hour one.
+    assert sorted(bucket.max_length for bucket in index._buckets.values()) == [1_000, 36_000_000]
+
+
+def test_temporal_index_keeps_keys_apart():
+    index: TemporalIndex[str] = TemporalIndex()
+    index.add("a", [0], [1_000], [1])
+    index.add("b", [0], [1_000], [2])
+    assert index.overlapping("a", 0, 500).tolist() == [1]
+    index.remove("a")
+    assert index.overlapping("a", 0, 500).tolist() == []
+    assert index.overlapping("b", 0, 500).tolist() == [2]
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import time
+
+from video_agent.asr import StandInASRBackend
+from video_agent.incremental import index_ingested
+from video_agent.jobs import DONE, FAILED, JobQueue, WorkerPool, pipeline_handler
+from video_agent.pipeline import IngestPipeline
+from video_agent.stores import BM25Index, TranscriptStore, VectorStore
+
+
+def _wait_for(queue: JobQueue, job_ids: list[int], timeout_s: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout_s
+    while time.monotonic() < deadline:
+        jobs = [queue.get(job_id) for job_id in job_ids]
+        assert not [job.error for job in jobs if job.status == FAILED]
+        if all(job.status == DONE for job in jobs):
+            return
+        time.sleep(0.05)
+    raise AssertionError([queue.get(job_id) for job_id in job_ids])
+
+
+def test_concurrent_jobs_share_stores_without_losing_records(tmp_path, scene_video):
+    queue = JobQueue(tmp_path / "jobs.db")
+    coarse, fine = VectorStore(), VectorStore()
+    transcripts, lexical = TranscriptStore(), BM25Index()
+    pipeline = IngestPipeline(transcriber=StandInASRBackend())
+
+    def index(video_id, item):
+        index_ingested(video_id, item, coarse, fine, transcripts, lexical)
+
+    videos = [f"video-{i}" for i in range(6)]
+    job_ids = [queue.enqueue(video_id, scene_video, chunk_ms=1000, min_chunk_ms=0) for video_id in videos]
+    pool = WorkerPool(queue, pipeline_handler(pipeline, index), workers=4, poll_s=0.01)
+    pool.start()
+    try:
+        _wait_for(queue, job_ids)
+    finally:
+        pool.stop()
+
+    assert len(coarse) == 12 * len(videos)
+    assert len(fine) == 12 * len(videos)
+    assert len(lexical) == 12 * len(videos)
+    for video_id in videos:
+        assert len(coarse.rows(video_id)) == 12
+        assert transcripts.text_between(video_id, 0, 12_000)
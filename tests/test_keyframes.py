@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import av
+
+from video_agent.chunking.keyframes import KeyframeIndex, copy_segment
+
+
+def _packet_times(path, start_s: float = 0.0, end_s: float = float("inf")) -> dict[str, list[float]]:
+    times: dict[str, list[float]] = {}
+    with av.open(str(path)) as container:
+        for packet in container.demux():
+            if packet.pts is not None:
+                t = float(packet.pts * packet.time_base)
+                if start_s <= t < end_s:
+                    times.setdefault(packet.stream.type, []).append(round(t - start_s, 3))
+    return {kind: sorted(values) for kind, values in times.items()}
+
+
+def test_keyframe_index_lists_every_gop(scene_video):
+    index = KeyframeIndex.from_file(scene_video)
+    assert index.timestamps_ms.tolist() == list(range(0, 12_000, 1000))
+    assert index.at_or_before(3_500) == 3_000 and index.at_or_after(3_500) == 4_000
+    start, end = index.byte_range(3_000, 6_000)
+    assert start is not None and end is not None and start < end <= index.size
+
+
+def test_copied_segment_keeps_audio_in_sync(tmp_path, scene_video):
+    segment = KeyframeIndex.from_file(scene_video).segment(scene_video, 3_000, 6_000)
+    copy_segment(segment, tmp_path / "segment.mp4")
+    copied = _packet_times(tmp_path / "segment.mp4")
+    # Every packet keeps its offset from the keyframe, so the first audio
+    # packet does not start at zero (AAC frames do not line up with it).
+    assert copied == _packet_times(scene_video, 3.0, 6.0)
+    assert copied["video"][0] == 0.0 and copied["audio"][0] > 0.0
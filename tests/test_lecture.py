@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import numpy as np
+
+from video_agent.analysis import SlideAnalyzer, SlideFrameEmbedder, StandInOCR, find_slides
+from video_agent.chunking import Chunk, Frame
+from video_agent.chunking.slides import SlideDetector
+
+
+def _slide(seed: int) -> np.ndarray:
+    """A light slide with a few dark text blocks."""
+    rng = np.random.default_rng(seed)
+    image = np.full((240, 320, 3), 235, dtype=np.uint8)
+    for _ in range(6):
+        y, x = rng.integers(20, 200), rng.integers(20, 240)
+        image[y : y + 12, x : x + 60] = 30
+    return image
+
+
+SLIDES = [_slide(seed) for seed in range(3)]
+
+
+def _frames(shown: list[int], start_ms: int = 0, step_ms: int = 500) -> tuple[Frame, ...]:
+    """One frame per entry of ``shown`` (an index into ``SLIDES``), each with +-2 noise."""
+    rng = np.random.default_rng(start_ms)
+    return tuple(
+        Frame(
+            start_ms // step_ms + i,
+            start_ms + i * step_ms,
+            (SLIDES[k].astype(np.int16) + rng.integers(-2, 3, SLIDES[k].shape)).clip(0, 255).astype(np.uint8),
+        )
+        for i, k in enumerate(shown)
+    )
+
+
+def _chunk(index: int, start_ms: int, shown: list[int], step_ms: int = 500) -> Chunk:
+    frames = _frames(shown, start_ms, step_ms)
+    return Chunk(index, start_ms, start_ms + len(shown) * step_ms, frames, None)
+
+
+class CountingOCR(StandInOCR):
+    def __init__(self) -> None:
+        super().__init__()
+        self.calls = 0
+
+    def recognize(self, image):
+        self.calls += 1
+        return super().recognize(image)
+
+
+def test_boundaries_follow_slide_changes_and_carry_over_between_batches():
+    detector = SlideDetector()
+    first = detector.boundaries(_frames([0, 0, 0, 1, 1]))
+    assert first.tolist() == [False, False, False, True, False]
+    assert detector.boundaries(_frames([1, 1, 2], start_ms=2500)).tolist() == [False, False, True]
+
+    detector.reset()
+    assert not detector.boundaries(_frames([2, 2])).any()
+
+
+def test_find_slides_marks_a_slide_continued_from_the_previous_chunk():
+    detector = SlideDetector()
+    chunk = _chunk(1, 3000, [0, 0, 1, 1, 1])
+    slides, last = find_slides(chunk, detector)
+    assert [(s.start_ms, s.end_ms, s.continued) for s in slides] == [(3000, 4000, False), (4000, 5500, False)]
+    assert slides[1].frame is chunk.frames[2]
+
+    reference = detector.thumbnails(SLIDES[0][None])[0]
+    slides, _ = find_slides(chunk, detector, reference)
+    assert [s.continued for s in slides] == [True, False]
+    reference = detector.thumbnails(SLIDES[2][None])[0]
+    assert [s.continued for s in find_slides(chunk, detector, reference)[0]] == [False, False]
+
+    np.testing.assert_allclose(last, detector.thumbnails(chunk.frames[2].image[None])[0])
+
+
+def test_slide_text_is_read_once_per_slide_and_carried_into_the_next_chunk():
+    ocr = CountingOCR()
+    analyzer = SlideAnalyzer(ocr)
+    first = analyzer(_chunk(0, 0, [0, 0, 1, 1]))
+    second = analyzer(_chunk(1, 2000, [1, 1, 2, 2]))
+
+    assert ocr.calls == 3
+    text = {k: StandInOCR().recognize(SLIDES[k]) for k in range(3)}
+    assert first.text.splitlines() == [text[0], text[1]]
+    assert second.text.splitlines() == [text[1], text[2]]
+    assert (second.start_ms, second.end_ms) == (2000, 4000) and second.embedding.size > 0
+
+
+def test_slides_are_read_again_after_a_gap_or_reset():
+    ocr = CountingOCR()
+    analyzer = SlideAnalyzer(ocr)
+    analyzer(_chunk(0, 0, [0, 0, 1, 1]))
+    analyzer(_chunk(2, 4000, [1, 1]))  # not contiguous with the first chunk
+    assert ocr.calls == 3
+
+    analyzer.reset()
+    analyzer(_chunk(3, 5000, [1, 1]))
+    assert ocr.calls == 4
+
+
+def test_slide_frame_embedder_embeds_one_frame_per_slide():
+    chunk = _chunk(0, 1000, [0, 0, 0, 1, 1, 2])
+    segments = SlideFrameEmbedder()(chunk)
+    assert [(s.start_ms, s.end_ms) for s in segments] == [(1000, 2500), (2500, 3500), (3500, 4000)]
+
+    single = _chunk(0, 0, [0])
+    assert SlideFrameEmbedder().representatives(single) is single
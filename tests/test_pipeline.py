@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pytest
+
+from video_agent.analysis import SlideAnalyzer, StandInOCR
+from video_agent.asr import StandInASRBackend
+from video_agent.pipeline import IngestPipeline
+from video_agent.profiling import Profiler
+
+
+def test_coarse_pool_keeps_chunk_order_and_results(scene_video):
+    options = dict(chunk_ms=1000, min_chunk_ms=0)
+    inline = list(IngestPipeline(transcriber=StandInASRBackend()).ingest(scene_video, **options))
+    profiler = Profiler()
+    with ProcessPoolExecutor(2) as pool:
+        pipeline = IngestPipeline(
+            transcriber=StandInASRBackend(), profiler=profiler, coarse_pool=pool, coarse_in_flight=3
+        )
+        pooled = list(pipeline.ingest(scene_video, scope="pooled", **options))
+
+    assert [item.chunk.index for item in pooled] == list(range(12))
+    for a, b in zip(inline, pooled):
+        assert (a.coarse.start_ms, a.coarse.end_ms) == (b.coarse.start_ms, b.coarse.end_ms)
+        np.testing.assert_array_equal(a.coarse.embedding, b.coarse.embedding)
+        assert a.transcript == b.transcript
+        assert len(a.fine) == len(b.fine)
+    coarse = profiler.stats()["pooled"]["coarse"]
+    assert coarse.calls == 12 and coarse.cpu_s > 0
+
+
+def test_closing_a_pooled_ingest_early_stops_it(scene_video):
+    with ProcessPoolExecutor(2) as pool:
+        items = IngestPipeline(coarse_pool=pool).ingest(scene_video, chunk_ms=1000, min_chunk_ms=0)
+        first = next(items)
+        items.close()
+    assert first.chunk.index == 0
+
+
+def test_slide_analyzer_is_rejected_on_a_coarse_pool():
+    with ProcessPoolExecutor(1) as pool:
+        with pytest.raises(ValueError, match="sequential"):
+            IngestPipeline(embed=SlideAnalyzer(StandInOCR()), coarse_pool=pool)
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import time
+
+import numpy as np
+
+from video_agent.agent import StandInLLM, StandInQueryEmbedder, VideoAgent
+from video_agent.profiling import Profiler
+from video_agent.stores import VectorRecord, VectorStore
+
+
+def _series(text: str, metric: str) -> dict[str, float]:
+    return {
+        line.split(" ")[0]: float(line.split(" ")[1])
+        for line in text.splitlines()
+        if line.startswith(metric + "{")
+    }
+
+
+def test_prometheus_totals_stay_bounded_and_monotonic():
+    profiler = Profiler(max_scopes=3)
+    for _ in range(10):
+        profiler.record(profiler.query_scope(), "agent.reason", wall_s=0.5)
+    profiler.record("video:a", "asr", items=4)
+    calls = _series(profiler.to_prometheus(), "video_agent_stage_calls_total")
+    assert calls == {
+        'video_agent_stage_calls_total{kind="query",stage="agent.reason"}': 10.0,
+        'video_agent_stage_calls_total{kind="video",stage="asr"}': 1.0,
+    }
+    wall = _series(profiler.to_prometheus(), "video_agent_stage_wall_seconds_total")
+    assert wall['video_agent_stage_wall_seconds_total{kind="query",stage="agent.reason"}'] == 5.0
+    assert len(profiler.stats()) == 3  # per-scope detail is still capped
+
+
+class SlowStore(VectorStore):
+    """Burns CPU on every search, like a large exact scan."""
+
+    def search(self, query, k=10, *, video_id=None, nprobe=None):
+        deadline = time.thread_time() + 0.05
+        while time.thread_time() < deadline:
+            pass
+        return super().search(query, k, video_id=video_id, nprobe=nprobe)
+
+
+def test_retrieve_cpu_time_is_measured_on_the_tool_threads():
+    store = SlowStore()
+    store.add([VectorRecord("a", 0, 1000, np.ones(8, dtype=np.float32))])
+    profiler = Profiler()
+    agent = VideoAgent(StandInQueryEmbedder(8), store, StandInLLM(), profiler=profiler)
+    agent.ask("anything")
+    [stages] = profiler.stats().values()
+    assert stages["agent.retrieve"].cpu_s >= 0.04
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import threading
+
+import av
+import numpy as np
+import pytest
+
+from conftest import scenes, tone, write_video
+from video_agent.cache import file_digest
+from video_agent.chunking import iter_chunks
+from video_agent.chunking import proxy as proxy_module
+from video_agent.chunking.proxy import ProxyCache
+
+COLOURS = np.array([[200, 30, 30], [30, 200, 30]], dtype=np.uint8)
+
+
+def test_concurrent_requests_share_one_proxy(tmp_path, scene_video):
+    cache = ProxyCache(tmp_path / "proxies", max_size=32, fps=2.0, codec="mpeg4")
+    paths = []
+    threads = [threading.Thread(target=lambda: paths.append(cache.path_for(scene_video))) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(set(paths)) == 1 and len(paths) == 3
+    assert [p.name for p in (tmp_path / "proxies").iterdir()] == [paths[0].name]
+    with av.open(str(paths[0])) as container:
+        video = container.streams.video[0]
+        assert max(video.width, video.height) <= 32
+        assert container.streams.audio
+
+
+def test_known_digest_is_not_recomputed(tmp_path, scene_video, monkeypatch):
+    cache = ProxyCache(tmp_path / "proxies", max_size=32, fps=2.0, codec="mpeg4")
+    expected = cache.path_for(scene_video)
+    digest = file_digest(scene_video)
+
+    def no_hashing(path):
+        raise AssertionError("hashed the source again")
+
+    monkeypatch.setattr(proxy_module, "file_digest", no_hashing)
+    assert cache.path_for(scene_video, digest=digest) == expected
+
+
+@pytest.mark.parametrize("audio_codec", ["pcm_mulaw", "g726"])
+def test_camera_audio_survives_the_proxy(tmp_path, audio_codec):
+    # G.711 (pcm_mulaw) is copied as is; G.726 is decoded to PCM.
+    rate = 8000
+    path = write_video(
+        tmp_path / "camera.avi",
+        4.0,
+        scenes(COLOURS, 2.0),
+        audio=tone(4.0, rate),
+        audio_rate=rate,
+        audio_codec=audio_codec,
+    )
+    cache = ProxyCache(tmp_path / "proxies", max_size=32, fps=2.0, codec="mpeg4")
+    direct = list(iter_chunks(path, chunk_ms=1000, audio_rate=rate))
+    proxied = list(iter_chunks(path, chunk_ms=1000, audio_rate=rate, proxy=cache))
+    assert [(c.start_ms, c.end_ms) for c in proxied] == [(c.start_ms, c.end_ms) for c in direct]
+    for a, b in zip(direct, proxied, strict=True):
+        np.testing.assert_array_equal(a.audio.samples, b.audio.samples)
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import numpy as np
+
+from video_agent.agent import QueryCache
+from video_agent.jobs import JobQueue
+
+
+def test_similar_queries_hit_and_invalidate_drops_video_and_global_entries():
+    cache: QueryCache[str] = QueryCache(threshold=0.9)
+    query = np.array([1.0, 0.0, 0.0])
+    cache.put("a", query, "answer a")
+    cache.put(None, query, "answer all")
+    assert cache.get("a", np.array([1.0, 0.05, 0.0])) == "answer a"
+    assert cache.get("a", np.array([0.0, 1.0, 0.0])) is None
+    cache.invalidate("a")
+    assert cache.get("a", query) is None
+    assert cache.get(None, query) is None
+
+
+def test_entries_expire_after_ttl():
+    now = [0.0]
+    cache: QueryCache[str] = QueryCache(ttl_s=10.0, clock=lambda: now[0])
+    cache.put("a", np.ones(4), "answer")
+    now[0] = 9.0
+    assert cache.get("a", np.ones(4)) == "answer"
+    now[0] = 11.0
+    assert cache.get("a", np.ones(4)) is None
+
+
+def test_finished_job_in_another_process_invalidates_cached_answers(tmp_path):
+    writer = JobQueue(tmp_path / "jobs.db")  # the ingest worker's connection
+    reader = JobQueue(tmp_path / "jobs.db")  # the API process's connection
+    cache: QueryCache[str] = QueryCache(generation=reader.generation)
+    query = np.ones(4)
+    cache.put("a", query, "answer a")
+    cache.put("b", query, "answer b")
+    cache.put(None, query, "answer all")
+
+    job_id = writer.enqueue("a", "/videos/a.mp4")
+    assert writer.claim().id == job_id
+    assert cache.get("a", query) == "answer a"  # still ingesting: not finished yet
+    writer.finish(job_id)
+
+    assert cache.get("a", query) is None
+    assert cache.get(None, query) is None
+    assert cache.get("b", query) == "answer b"
+    cache.put("a", query, "fresh answer")
+    assert cache.get("a", query) == "fresh answer"
+
+    job_id = writer.enqueue("a", "/videos/a.mp4")
+    writer.claim()
+    writer.fail(job_id, "RuntimeError: decode error")
+    assert cache.get("a", query) is None
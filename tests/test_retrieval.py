@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from video_agent.retrieval import HybridRetriever, reciprocal_rank_fusion
+from video_agent.stores import BM25Index, LexicalHit, SearchHit, VectorRecord, VectorStore
+
+
+def _transcripts() -> BM25Index:
+    index = BM25Index()
+    index.add("a", 0, 1000, "the fourier transform of a signal")
+    index.add("a", 1000, 2000, "a signal through a filter, then another filter")
+    index.add("b", 0, 1000, "gradient descent on the model")
+    return index
+
+
+def test_bm25_ranks_by_term_rarity_and_frequency():
+    index = _transcripts()
+    assert [(h.video_id, h.start_ms) for h in index.search("filter")] == [("a", 1000)]
+    # "signal" is in two documents and "fourier" in one, so the rarer term wins.
+    hits = index.search("fourier signal")
+    assert [(h.video_id, h.start_ms) for h in hits] == [("a", 0), ("a", 1000)]
+    assert hits[0].score > hits[1].score > 0
+    assert index.search("Fourier") == index.search("fourier")
+    assert index.search("absent") == []
+
+
+def test_bm25_filters_by_video_and_forgets_removed_videos():
+    index = _transcripts()
+    assert [h.video_id for h in index.search("the", video_id="b")] == ["b"]
+    index.remove_video("a")
+    assert len(index) == 1
+    assert index.search("signal") == []
+
+
+def _vector_hit(video_id: str, start_ms: int) -> SearchHit:
+    return SearchHit(VectorRecord(video_id, start_ms, start_ms + 1000, np.zeros(2)), 1.0)
+
+
+def test_rrf_rewards_spans_found_by_both_rankings():
+    lexical = [LexicalHit("a", 0, 1000, 9.0), LexicalHit("a", 1000, 2000, 5.0)]
+    vector = [_vector_hit("b", 0), _vector_hit("a", 1000)]
+    fused = reciprocal_rank_fusion(lexical, vector, rank_constant=60)
+
+    assert [(h.video_id, h.start_ms) for h in fused] == [("a", 1000), ("a", 0), ("b", 0)]
+    assert fused[0].score == pytest.approx(1 / 62 + 1 / 62)
+    assert fused[1].score == pytest.approx(fused[2].score) == pytest.approx(1 / 61)
+    assert fused[0].lexical is lexical[1] and fused[0].vector is vector[1]
+    assert fused[1].vector is None and fused[2].lexical is None
+    assert len(reciprocal_rank_fusion(lexical, vector, 1)) == 1
+
+
+def test_hybrid_search_finds_exact_terms_the_embedding_misses():
+    index = _transcripts()
+    store = VectorStore()
+    rng = np.random.default_rng(0)
+    store.add(
+        VectorRecord(video_id, start_ms, start_ms + 1000, rng.standard_normal(8))
+        for video_id, start_ms in [("a", 0), ("a", 1000), ("b", 0)]
+    )
+    query = store.record(2).embedding  # the embedding points at the gradient chunk
+    retriever = HybridRetriever(index, store)
+
+    fused = retriever.search("filter", query, k=3)
+    assert {(h.video_id, h.start_ms) for h in fused[:2]} == {("a", 1000), ("b", 0)}
+    assert [(h.video_id, h.start_ms) for h in retriever.search("filter")] == [("a", 1000)]
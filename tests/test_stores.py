@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import threading
+
+import numpy as np
+import pytest
+
+from video_agent.stores import (
+    IVFIndex,
+    MmapVectorStore,
+    ProductQuantizer,
+    ScalarQuantizer,
+    VectorRecord,
+    VectorStore,
+)
+
+
+def _records(video_id: str, count: int, dim: int = 16, seed: int = 0) -> list[VectorRecord]:
+    rng = np.random.default_rng(seed)
+    return [
+        VectorRecord(video_id, 1000 * i, 1000 * (i + 1), rng.standard_normal(dim).astype(np.float32))
+        for i in range(count)
+    ]
+
+
+def test_concurrent_add_keeps_every_record():
+    store = VectorStore()
+    threads = [
+        threading.Thread(target=lambda v=v: [store.add([r]) for r in _records(f"v{v}", 2000, seed=v)])
+        for v in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(store) == 8000
+    for v in range(4):
+        rows = store.rows(f"v{v}")
+        assert len(rows) == 2000
+        starts = sorted(int(store.record(int(row)).start_ms) for row in rows)
+        assert starts == [1000 * i for i in range(2000)]
+
+
+def test_product_quantizer_rejects_an_indivisible_dimension_before_storing_anything():
+    store = VectorStore(quantizer=ProductQuantizer(subspaces=16, train_rows=256))
+    with pytest.raises(ValueError, match="not divisible"):
+        store.add(_records("a", 10, dim=65))
+    assert len(store) == 0
+    store.add(_records("a", 300, dim=64))
+    assert len(store) == 300 and store.nbytes() == 300 * 16
+
+
+def test_failed_add_leaves_the_store_unchanged():
+    class FlakyQuantizer(ScalarQuantizer):
+        failures = 1
+
+        def train(self, vectors):
+            if self.failures:
+                self.failures -= 1
+                raise RuntimeError("training failed")
+            super().train(vectors)
+
+    store = VectorStore(quantizer=FlakyQuantizer(train_rows=50))
+    store.add(_records("a", 40))
+    with pytest.raises(RuntimeError):
+        store.add(_records("b", 20, seed=1))
+    assert len(store) == 40 and not store.rows("b").size
+    assert not store.rows_overlapping("b", 0, 100_000).size
+    store.add(_records("b", 20, seed=1))
+    assert len(store) == 60 and len(store.rows("b")) == 20
+    [hit] = store.search(_records("b", 1, seed=1)[0].embedding, k=1)
+    assert (hit.record.video_id, hit.record.start_ms) == ("b", 0)
+
+
+def test_exact_search_skips_removed_rows():
+    store = VectorStore()
+    store.add(_records("a", 50))
+    store.add(_records("b", 50, seed=1))
+    store.remove_video("a")
+    query = _records("a", 1)[0].embedding  # best match is a removed row
+    hits = store.search(query, k=100)
+    assert len(hits) == 50
+    assert {hit.record.video_id for hit in hits} == {"b"}
+    assert [hit.score for hit in hits] == sorted((hit.score for hit in hits), reverse=True)
+
+
+def test_ivf_index_needs_a_training_vector_per_cell():
+    with pytest.raises(ValueError, match="train_rows"):
+        IVFIndex(nlist=64, train_rows=32)
+
+
+def _unit(vector: np.ndarray) -> np.ndarray:
+    return vector / np.linalg.norm(vector)
+
+
+def test_mmap_store_reopens_from_disk(tmp_path):
+    store = MmapVectorStore(tmp_path, 16)
+    store.add(_records("a", 20))
+    store.add(_records("b", 20, seed=1))
+
+    reopened = MmapVectorStore(tmp_path)
+    assert reopened.dim == 16 and len(reopened) == 40
+    record = reopened.record(25)
+    assert (record.video_id, record.start_ms) == ("b", 5000)
+    np.testing.assert_allclose(record.embedding, _unit(_records("b", 20, seed=1)[5].embedding), rtol=1e-6)
+    [hit] = reopened.search(record.embedding, k=1, video_id="b")
+    assert (hit.record.video_id, hit.record.start_ms) == ("b", 5000)
+    with pytest.raises(ValueError, match="dim"):
+        MmapVectorStore(tmp_path, 32)
+
+
+def test_mmap_store_in_float16_halves_the_file(tmp_path):
+    store = MmapVectorStore(tmp_path, 16, dtype="float16")
+    records = _records("a", 50)
+    store.add(records)
+    assert (tmp_path / "embeddings.bin").stat().st_size == 50 * 16 * 2
+    hits = store.search(records[7].embedding, k=3)
+    assert hits[0].record.start_ms == 7000 and hits[0].score == pytest.approx(1.0, abs=1e-3)
+    np.testing.assert_allclose(store.record(7).embedding, _unit(records[7].embedding), atol=1e-3)
+
+
+def test_mmap_store_tombstones_removed_videos(tmp_path):
+    store = MmapVectorStore(tmp_path, 16)
+    store.add(_records("a", 30))
+    store.add(_records("b", 30, seed=1))
+    store.remove_video("a")
+    query = _records("a", 1)[0].embedding
+    assert len(store) == 30
+    assert {hit.record.video_id for hit in store.search(query, k=100)} == {"b"}
+    assert store.search(query, k=5, video_id="a") == []
+    assert len(MmapVectorStore(tmp_path)) == 30
+
+
+def test_mmap_store_refresh_sees_another_writer(tmp_path):
+    reader = MmapVectorStore(tmp_path, 16)
+    writer = MmapVectorStore(tmp_path)
+    writer.add(_records("a", 10))
+    assert len(reader) == 0
+    reader.refresh()
+    assert len(reader) == 10 and reader.record(3).video_id == "a"
+    writer.add(_records("b", 5, seed=1))
+    reader.refresh()
+    [hit] = reader.search(_records("b", 1, seed=1)[0].embedding, k=1)
+    assert len(reader) == 15 and hit.record.video_id == "b"
+
+
+def test_quantized_mmap_store_reranks_with_exact_scores(tmp_path):
+    store = MmapVectorStore(tmp_path, 16, quantizer=ProductQuantizer(subspaces=4, train_rows=256))
+    records = _records("a", 400)
+    store.add(records[:300])
+    store.add(records[300:])
+    assert (tmp_path / "codes.bin").stat().st_size == 400 * 4
+
+    query = records[123].embedding + 0.1 * np.random.default_rng(9).standard_normal(16)
+    exact = store.scores(query, exact=True)
+    approximate = store.search(query, k=5)
+    reranked = MmapVectorStore(tmp_path).search(query, k=5, rerank=50)
+    assert [hit.record.start_ms for hit in reranked][0] == 123_000
+    assert [hit.score for hit in reranked] == pytest.approx(np.sort(exact)[::-1][:5].tolist(), rel=1e-5)
+    assert [hit.score for hit in approximate] != pytest.approx([hit.score for hit in reranked], rel=1e-5)
+
+
+def test_ivf_searches_during_adds_never_lose_rows():
+    store = VectorStore(index=IVFIndex(nlist=8, nprobe=8, train_rows=64))
+    store.add(_records("a", 64))
+    query = np.ones(16, dtype=np.float32)
+    done = threading.Event()
+
+    def search() -> None:
+        while not done.is_set():
+            store.search(query, k=5)
+
+    readers = [threading.Thread(target=search) for _ in range(3)]
+    for reader in readers:
+        reader.start()
+    try:
+        for seed in range(1, 200):
+            store.add(_records(f"v{seed}", 5, seed=seed))
+    finally:
+        done.set()
+        for reader in readers:
+            reader.join()
+    candidates = store.index.candidates(query, nprobe=8)
+    assert sorted(candidates.tolist()) == list(range(64 + 199 * 5))
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import numpy as np
+
+from video_agent.asr import StandInASRBackend, VADTranscriber
+from video_agent.asr.vad import speech_spans
+from video_agent.chunking import AudioSpan
+
+RATE = 16_000
+
+
+def _db(level: float) -> float:
+    return 10.0 ** (level / 20.0)
+
+
+def _voice(seconds: float, envelope) -> np.ndarray:
+    """A harmonic voice at 0 dBFS RMS shaped by ``envelope(t)``."""
+    t = np.arange(int(seconds * RATE)) / RATE
+    phase = 2 * np.pi * np.cumsum(150.0 * (1.0 + 0.1 * np.sin(2 * np.pi * 0.5 * t))) / RATE
+    voice = sum(np.sin(h * phase) / h for h in (1, 2, 3, 4))
+    return (voice / np.sqrt(np.mean(voice**2)) * envelope(t)).astype(np.float32)
+
+
+def _syllables(level: float, depth: float = 1.0):
+    """Syllable envelope at ~5 per second; ``depth`` 1 dips to silence between syllables."""
+    return lambda t: _db(level) * ((1.0 - depth) + depth * np.abs(np.sin(2 * np.pi * 2.5 * t)))
+
+
+def _noise(seconds: float, level: float, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return (rng.standard_normal(int(seconds * RATE)) * _db(level)).astype(np.float32)
+
+
+def test_stationary_noise_is_not_speech_however_loud():
+    assert speech_spans(_noise(60.0, -30.0), RATE) == []
+    assert speech_spans(_noise(60.0, -10.0), RATE) == []
+    t = np.arange(60 * RATE) / RATE
+    hum = (_db(-20.0) * np.sqrt(2) * np.sin(2 * np.pi * 50 * t)).astype(np.float32) + _noise(60.0, -40.0)
+    assert speech_spans(hum, RATE) == []
+
+
+def test_silence_is_not_speech():
+    assert speech_spans(np.zeros(10 * RATE, dtype=np.float32), RATE) == []
+
+
+def test_continuous_speech_is_kept_whole():
+    speech = _voice(20.0, _syllables(-20.0, depth=0.65))
+    assert speech_spans(speech, RATE) == [(0, 20_000)]
+
+
+def test_speech_between_pauses_is_found():
+    audio = np.concatenate([_noise(5.0, -60.0), _voice(5.0, _syllables(-20.0)), _noise(10.0, -60.0, seed=1)])
+    [(start_ms, end_ms)] = speech_spans(audio, RATE)
+    assert 4_700 <= start_ms <= 5_100
+    assert 9_900 <= end_ms <= 10_300
+
+
+def test_speech_over_stationary_noise_is_found():
+    audio = _noise(30.0, -30.0)
+    audio[10 * RATE : 14 * RATE] += _voice(4.0, _syllables(-15.0))
+    [(start_ms, end_ms)] = speech_spans(audio, RATE)
+    assert 9_700 <= start_ms <= 10_100
+    assert 13_900 <= end_ms <= 14_300
+
+
+def test_transcriber_sees_only_speech_on_the_source_timeline():
+    class Recorder:
+        def __init__(self) -> None:
+            self.spans: list[AudioSpan] = []
+            self.backend = StandInASRBackend()
+
+        def transcribe(self, audio):
+            self.spans.append(audio)
+            return self.backend.transcribe(audio)
+
+    audio = np.concatenate([_noise(5.0, -60.0), _voice(5.0, _syllables(-20.0)), _noise(10.0, -60.0, seed=1)])
+    recorder = Recorder()
+    segments = VADTranscriber(recorder).transcribe(AudioSpan(60_000, 80_000, audio, RATE))
+    [span] = recorder.spans
+    assert 64_700 <= span.start_ms and span.end_ms <= 70_300
+    assert span.samples.size == (span.end_ms - span.start_ms) * RATE // 1000
+    assert [(s.start_ms, s.end_ms) for s in segments] == [(span.start_ms, span.end_ms)]
@@ -0,0 +1,3 @@
+"""PolyU Video Agent: Video-RAG pipeline for surveillance and lecture videos."""
+
+__version__ = "0.1.0"
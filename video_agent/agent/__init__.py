@@ -0,0 +1,18 @@
+"""Agent scheduling: the LangGraph question-answering agent."""
+
+from video_agent.agent.cache import QueryCache
+from video_agent.agent.graph import AgentEvent, AgentState, Answer, VideoAgent
+from video_agent.agent.llm import LanguageModel, build_prompt
+from video_agent.agent.standin import StandInLLM, StandInQueryEmbedder
+
+__all__ = [
+    "AgentEvent",
+    "AgentState",
+    "Answer",
+    "LanguageModel",
+    "QueryCache",
+    "StandInLLM",
+    "StandInQueryEmbedder",
+    "VideoAgent",
+    "build_prompt",
+]
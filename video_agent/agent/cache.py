@@ -0,0 +1,118 @@
+"""Semantic query result cache for the agent.
+
+Many users ask near-identical questions about the same popular video. An
+answer is cached under ``(video_id, query embedding)`` and returned for any
+later query on that video whose normalised embedding has cosine similarity
+of at least ``threshold`` with the cached one, skipping retrieval and the
+LLM call. Entries expire after ``ttl_s`` seconds and are dropped by
+:meth:`QueryCache.invalidate` when the video's stores change. When the
+stores are written by another process (the ingest worker), a ``generation``
+callable reports a per-video counter that the writer bumps, such as
+:meth:`~video_agent.jobs.JobQueue.generation`; entries cached under an
+older generation are dropped on lookup.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable, Generic, TypeVar
+
+import numpy as np
+
+V = TypeVar("V")
+
+
+class _Bucket(Generic[V]):
+    """Cached entries of one video, oldest first."""
+
+    def __init__(self, dim: int, generation: int | None) -> None:
+        self.generation = generation
+        self.vectors = np.zeros((0, dim), dtype=np.float32)
+        self.expires = np.zeros(0, dtype=np.float64)
+        self.values: list[V] = []
+
+    def keep(self, mask: np.ndarray) -> None:
+        self.vectors = self.vectors[mask]
+        self.expires = self.expires[mask]
+        self.values = [value for value, kept in zip(self.values, mask) if kept]
+
+
+class QueryCache(Generic[V]):
+    """Answers keyed by video id and query embedding, matched by similarity.
+
+    ``video_id=None`` keys queries over all videos; those entries are
+    invalidated together with any single video's entries, and
+    ``generation(None)`` must change whenever any video's does.
+    """
+
+    def __init__(
+        self,
+        *,
+        threshold: float = 0.95,
+        ttl_s: float = 3600.0,
+        max_entries: int = 1024,
+        clock: Callable[[], float] = time.monotonic,
+        generation: Callable[[str | None], int] | None = None,
+    ) -> None:
+        if not -1.0 <= threshold <= 1.0:
+            raise ValueError("threshold must be a cosine similarity in [-1, 1]")
+        if max_entries < 1:
+            raise ValueError("max_entries must be >= 1")
+        self.threshold = threshold
+        self.ttl_s = ttl_s
+        self.max_entries = max_entries
+        self.clock = clock
+        self.generation = generation
+        self._buckets: dict[str | None, _Bucket[V]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(bucket.values) for bucket in self._buckets.values())
+
+    @staticmethod
+    def _normalise(query: np.ndarray) -> np.ndarray:
+        query = np.asarray(query, dtype=np.float32).ravel()
+        return query / (np.linalg.norm(query) or 1.0)
+
+    def get(self, video_id: str | None, query: np.ndarray) -> V | None:
+        """The cached value of the most similar live query, if similar enough."""
+        query = self._normalise(query)
+        generation = None if self.generation is None else self.generation(video_id)
+        with self._lock:
+            bucket = self._buckets.get(video_id)
+            if bucket is not None and bucket.generation != generation:
+                del self._buckets[video_id]  # the stores changed since these answers
+                return None
+            if bucket is None or not bucket.values or bucket.vectors.shape[1] != len(query):
+                return None
+            scores = bucket.vectors @ query
+            scores[bucket.expires <= self.clock()] = -np.inf
+            best = int(np.argmax(scores))
+            return bucket.values[best] if scores[best] >= self.threshold else None
+
+    def put(self, video_id: str | None, query: np.ndarray, value: V) -> None:
+        query = self._normalise(query)
+        generation = None if self.generation is None else self.generation(video_id)
+        with self._lock:
+            bucket = self._buckets.get(video_id)
+            if bucket is None or bucket.vectors.shape[1] != len(query) or bucket.generation != generation:
+                bucket = self._buckets[video_id] = _Bucket(len(query), generation)
+            now = self.clock()
+            if bucket.values:
+                bucket.keep(bucket.expires > now)
+            if len(bucket.values) >= self.max_entries:
+                bucket.keep(np.arange(len(bucket.values)) > len(bucket.values) - self.max_entries)
+            bucket.vectors = np.vstack([bucket.vectors, query[None]])
+            bucket.expires = np.append(bucket.expires, now + self.ttl_s)
+            bucket.values.append(value)
+
+    def invalidate(self, video_id: str | None = None) -> None:
+        """Drop entries that may depend on ``video_id``'s stores (all if None)."""
+        with self._lock:
+            if video_id is None:
+                self._buckets.clear()
+            else:
+                self._buckets.pop(video_id, None)
+                self._buckets.pop(None, None)
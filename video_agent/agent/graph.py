@@ -0,0 +1,236 @@
+"""LangGraph agent answering questions about indexed videos.
+
+The graph embeds the question and looks it up in the query cache. On a miss
+the retrieval tools (coarse vector search, transcript keyword search and
+video metadata lookup) are independent, so a single node dispatches them
+concurrently with asyncio and joins before the reasoning node; the latency
+of retrieval is that of the slowest tool rather than their sum. The
+reasoning node fuses both rankings and asks the language model to answer
+from the retrieved spans, and the answer is cached for similar questions
+about the same video. With a fine-grained store, the vector tool is a
+:class:`~video_agent.retrieval.HierarchicalRetriever`: its coarse hits are
+fused as before, and the best frames within them are passed to the model as
+the precise moments to cite.
+
+:meth:`VideoAgent.astream` reports progress as :class:`AgentEvent` objects:
+the matched spans as soon as retrieval has been fused, then the answer
+token by token, so clients can show timestamps before the text finishes.
+With a profiler, each node's time is recorded as stage ``agent.<node>``
+under a fresh ``query:<n>`` scope per question.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass, replace
+from functools import wraps
+from typing import Any, AsyncIterator, Callable, Literal, Mapping, TypedDict
+
+import numpy as np
+from langgraph.config import get_stream_writer
+from langgraph.graph import END, START, StateGraph
+
+from video_agent.agent.cache import QueryCache
+from video_agent.agent.llm import LanguageModel, build_prompt
+from video_agent.profiling import Profiler, stage_timer
+from video_agent.retrieval import CoarseIndex, FusedHit, HierarchicalRetriever, reciprocal_rank_fusion
+from video_agent.stores.lexical import BM25Index, LexicalHit
+from video_agent.stores.memory import SearchHit, VectorStore
+from video_agent.stores.transcripts import TranscriptStore
+
+
+@dataclass(frozen=True)
+class Answer:
+    """The agent's answer, the spans it was based on and the best fine-grained moments."""
+
+    text: str
+    hits: tuple[FusedHit, ...]
+    cached: bool = False
+    moments: tuple[SearchHit, ...] = ()
+
+
+@dataclass(frozen=True)
+class AgentEvent:
+    """A streamed step: matched ``"hits"``, one answer ``"token"`` or the final ``"answer"``."""
+
+    kind: Literal["hits", "token", "answer"]
+    data: Any
+
+
+def _with_cpu_time(tool: Callable[[AgentState], Any], state: AgentState) -> tuple[Any, float]:
+    """``tool(state)`` and the CPU time it took on the calling thread."""
+    cpu = time.thread_time()
+    result = tool(state)
+    return result, time.thread_time() - cpu
+
+
+class AgentState(TypedDict, total=False):
+    question: str
+    video_id: str | None
+    scope: str
+    query: np.ndarray
+    coarse: list[SearchHit]
+    fine: list[SearchHit]
+    lexical: list[LexicalHit]
+    metadata: Mapping[str, Any]
+    answer: Answer
+
+
+class VideoAgent:
+    """Question answering over the coarse store and transcripts.
+
+    ``embed_query`` maps a question into the coarse store's embedding
+    space. ``lexical_index`` and ``transcript_store`` are optional: without
+    them retrieval is vector-only and the prompt carries timestamps only.
+    ``metadata`` looks up descriptive fields (title, type, ...) of the
+    video a question is scoped to.
+
+    With a ``fine_store``, the ``k`` best fine-grained records within the
+    top ``depth`` coarse hits (or, if those are not confident, in the whole
+    fine store) become the answer's moments. ``embed_fine_query`` maps a
+    question into the fine store's space; by default both stores share the
+    coarse query embedding.
+    """
+
+    def __init__(
+        self,
+        embed_query: Callable[[str], np.ndarray],
+        coarse_store: CoarseIndex,
+        llm: LanguageModel,
+        *,
+        lexical_index: BM25Index | None = None,
+        transcript_store: TranscriptStore | None = None,
+        cache: QueryCache[Answer] | None = None,
+        metadata: Callable[[str], Mapping[str, Any]] | None = None,
+        profiler: Profiler | None = None,
+        fine_store: VectorStore | None = None,
+        embed_fine_query: Callable[[str], np.ndarray] | None = None,
+        k: int = 5,
+        depth: int = 50,
+    ) -> None:
+        if k < 1:
+            raise ValueError("k must be >= 1")
+        self.embed_query = embed_query
+        self.coarse_store = coarse_store
+        self.llm = llm
+        self.lexical_index = lexical_index
+        self.transcript_store = transcript_store
+        self.cache = cache
+        self.metadata = metadata
+        self.profiler = profiler
+        self.k = k
+        self.depth = max(depth, k)
+        self.fine_store = fine_store
+        self.embed_fine_query = embed_fine_query
+        self.retriever = None
+        if fine_store is not None:
+            self.retriever = HierarchicalRetriever(coarse_store, fine_store, coarse_k=self.depth)
+        self.graph = self._build()
+
+    def _build(self):
+        graph = StateGraph(AgentState)
+        graph.add_node("lookup_cache", self._timed("lookup_cache", self._lookup_cache))
+        graph.add_node("retrieve", self._retrieve)
+        graph.add_node("reason", self._timed("reason", self._reason))
+        graph.add_edge(START, "lookup_cache")
+        graph.add_conditional_edges("lookup_cache", lambda state: END if "answer" in state else "retrieve")
+        graph.add_edge("retrieve", "reason")
+        graph.add_edge("reason", END)
+        return graph.compile()
+
+    def _timed(self, name: str, node: Callable[[AgentState], AgentState]) -> Callable[[AgentState], AgentState]:
+        @wraps(node)
+        def timed(state: AgentState) -> AgentState:
+            with stage_timer(self.profiler, state["scope"], f"agent.{name}"):
+                return node(state)
+
+        return timed
+
+    def _inputs(self, question: str, video_id: str | None) -> AgentState:
+        scope = "query" if self.profiler is None else self.profiler.query_scope()
+        return {"question": question, "video_id": video_id, "scope": scope}
+
+    def ask(self, question: str, *, video_id: str | None = None) -> Answer:
+        """Answer ``question``; must not be called from a running event loop."""
+        return asyncio.run(self.aask(question, video_id=video_id))
+
+    async def aask(self, question: str, *, video_id: str | None = None) -> Answer:
+        state = await self.graph.ainvoke(self._inputs(question, video_id))
+        return state["answer"]
+
+    async def astream(self, question: str, *, video_id: str | None = None) -> AsyncIterator[AgentEvent]:
+        """Answer ``question``, yielding events as they become available."""
+        stream = self.graph.astream(self._inputs(question, video_id), stream_mode=["custom", "updates"])
+        async for mode, payload in stream:
+            if mode == "custom":
+                yield payload
+                continue
+            for update in payload.values():
+                if update and "answer" in update:
+                    yield AgentEvent("answer", update["answer"])
+
+    def _lookup_cache(self, state: AgentState) -> AgentState:
+        query = np.asarray(self.embed_query(state["question"]), dtype=np.float32)
+        if self.cache is not None:
+            answer = self.cache.get(state.get("video_id"), query)
+            if answer is not None:
+                write = get_stream_writer()
+                write(AgentEvent("hits", answer.hits))
+                write(AgentEvent("token", answer.text))
+                return {"query": query, "answer": replace(answer, cached=True)}
+        return {"query": query}
+
+    async def _retrieve(self, state: AgentState) -> AgentState:
+        # The tools run on worker threads; the event loop thread's CPU time
+        # would miss their work and count other queries' instead.
+        with stage_timer(self.profiler, state["scope"], "agent.retrieve") as call:
+            results = await asyncio.gather(
+                asyncio.to_thread(_with_cpu_time, self._vector_search, state),
+                asyncio.to_thread(_with_cpu_time, self._keyword_search, state),
+                asyncio.to_thread(_with_cpu_time, self._metadata, state),
+            )
+            call.cpu_s = sum(cpu_s for _, cpu_s in results)
+        (coarse, fine), lexical, metadata = (result for result, _ in results)
+        return {"coarse": coarse, "fine": fine, "lexical": lexical, "metadata": metadata}
+
+    def _vector_search(self, state: AgentState) -> tuple[list[SearchHit], list[SearchHit]]:
+        """Coarse hits for fusion and, with a fine store, the best moments within them."""
+        video_id = state.get("video_id")
+        if self.retriever is None:
+            return self.coarse_store.search(state["query"], self.depth, video_id=video_id), []
+        fine_query = None if self.embed_fine_query is None else self.embed_fine_query(state["question"])
+        result = self.retriever.search(state["query"], fine_query, self.k, video_id=video_id)
+        return result.coarse, result.fine
+
+    def _keyword_search(self, state: AgentState) -> list[LexicalHit]:
+        if self.lexical_index is None:
+            return []
+        return self.lexical_index.search(state["question"], self.depth, video_id=state.get("video_id"))
+
+    def _metadata(self, state: AgentState) -> Mapping[str, Any]:
+        video_id = state.get("video_id")
+        if self.metadata is None or video_id is None:
+            return {}
+        return self.metadata(video_id)
+
+    def _reason(self, state: AgentState) -> AgentState:
+        write = get_stream_writer()
+        hits = tuple(reciprocal_rank_fusion(state["lexical"], state["coarse"], self.k))
+        write(AgentEvent("hits", hits))
+        context = [self._transcript(hit) for hit in hits]
+        moments = tuple(state["fine"])
+        prompt = build_prompt(state["question"], hits, context, metadata=state["metadata"], moments=moments)
+        tokens = []
+        for token in self.llm.stream(prompt):
+            tokens.append(token)
+            write(AgentEvent("token", token))
+        answer = Answer("".join(tokens), hits, moments=moments)
+        if self.cache is not None:
+            self.cache.put(state.get("video_id"), state["query"], answer)
+        return {"answer": answer}
+
+    def _transcript(self, hit: FusedHit) -> str:
+        if self.transcript_store is None:
+            return ""
+        return self.transcript_store.text_between(hit.video_id, hit.start_ms, hit.end_ms)
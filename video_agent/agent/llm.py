@@ -0,0 +1,43 @@
+"""Language model interface and prompt construction for the agent."""
+
+from __future__ import annotations
+
+from typing import Any, Iterable, Iterator, Mapping, Protocol
+
+from video_agent.retrieval import FusedHit
+from video_agent.stores.memory import SearchHit
+
+
+class LanguageModel(Protocol):
+    """Generates an answer to a prompt, token by token."""
+
+    def stream(self, prompt: str) -> Iterator[str]: ...
+
+
+def timestamp(ms: int) -> str:
+    """``ms`` as ``h:mm:ss`` or ``m:ss``."""
+    minutes, seconds = divmod(ms // 1000, 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes}:{seconds:02d}"
+
+
+def build_prompt(
+    question: str,
+    hits: Iterable[FusedHit],
+    context: Iterable[str],
+    *,
+    metadata: Mapping[str, Any] | None = None,
+    moments: Iterable[SearchHit] = (),
+) -> str:
+    """A prompt listing video metadata, each span with its transcript, then the best moments."""
+    lines = ["Answer the question using the video segments below. Cite timestamps.", ""]
+    if metadata:
+        lines += [f"{key}: {value}" for key, value in metadata.items()] + [""]
+    for hit, text in zip(hits, context):
+        span = f"{timestamp(hit.start_ms)}-{timestamp(hit.end_ms)}"
+        lines.append(f"[{hit.video_id} {span}] {text}".rstrip())
+    moments = [f"{m.record.video_id} {timestamp(m.record.start_ms)}" for m in moments]
+    if moments:
+        lines += ["", "Best matching moments: " + ", ".join(moments)]
+    lines += ["", f"Question: {question}"]
+    return "\n".join(lines)
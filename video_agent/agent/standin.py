@@ -0,0 +1,58 @@
+"""Deterministic local stand-ins for the language model and query embedder.
+
+The answer only restates the segments listed in the prompt, and query
+embeddings are derived from hashes of the words, so identical inputs give
+identical outputs. Optional simulated latencies mimic a remote model, so
+the agent can be run and timed offline.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import time
+from typing import Iterator
+
+import numpy as np
+
+from video_agent.stores.lexical import tokenize
+
+_SEGMENT = re.compile(r"^\[(\S+) ([\d:]+-[\d:]+)\]", re.MULTILINE)
+
+
+class StandInLLM:
+    """Streams an answer citing the segments in the prompt.
+
+    ``first_token_ms`` is slept before the first token and ``ms_per_token``
+    before each one.
+    """
+
+    def __init__(self, *, first_token_ms: float = 0.0, ms_per_token: float = 0.0) -> None:
+        self.first_token_ms = first_token_ms
+        self.ms_per_token = ms_per_token
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        segments = [f"{video} {span}" for video, span in _SEGMENT.findall(prompt)]
+        text = "Relevant segments: " + "; ".join(segments) + "." if segments else "No relevant segment found."
+        if self.first_token_ms > 0:
+            time.sleep(self.first_token_ms / 1000.0)
+        for i, word in enumerate(text.split(" ")):
+            if self.ms_per_token > 0:
+                time.sleep(self.ms_per_token / 1000.0)
+            yield word if i == 0 else " " + word
+
+
+class StandInQueryEmbedder:
+    """Maps text to a unit vector: the sum of one pseudo-random vector per word."""
+
+    def __init__(self, dim: int) -> None:
+        if dim < 1:
+            raise ValueError("dim must be >= 1")
+        self.dim = dim
+
+    def __call__(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for token in tokenize(text):
+            seed = int.from_bytes(hashlib.blake2b(token.encode(), digest_size=8).digest(), "little")
+            vector += np.random.default_rng(seed).normal(size=self.dim).astype(np.float32)
+        return vector / (np.linalg.norm(vector) or 1.0)
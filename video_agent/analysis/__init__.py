@@ -0,0 +1,24 @@
+"""Coarse- and fine-grained analysis of video chunks."""
+
+from video_agent.analysis.coarse import CoarseSegment, describe_chunk
+from video_agent.analysis.dedup import FrameDeduplicator, dhash
+from video_agent.analysis.fine import FineSegment, describe_frames
+from video_agent.analysis.lecture import Slide, SlideAnalyzer, SlideFrameEmbedder, TextRecognizer, find_slides
+from video_agent.analysis.parallel import ParallelAnalyzer
+from video_agent.analysis.standin import StandInOCR
+
+__all__ = [
+    "CoarseSegment",
+    "FineSegment",
+    "FrameDeduplicator",
+    "ParallelAnalyzer",
+    "Slide",
+    "SlideAnalyzer",
+    "SlideFrameEmbedder",
+    "StandInOCR",
+    "TextRecognizer",
+    "describe_chunk",
+    "describe_frames",
+    "dhash",
+    "find_slides",
+]
@@ -0,0 +1,51 @@
+"""Coarse-grained analysis of video chunks.
+
+Each chunk is reduced to a single descriptor vector summarising its visual
+and audio content, which is what the coarse-grained vector store indexes
+for first-stage retrieval.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from video_agent.chunking.chunker import Chunk
+
+_HIST_BINS = 4  # per channel, 64 joint colour bins
+
+
+@dataclass(frozen=True)
+class CoarseSegment:
+    """Result of coarse-grained analysis for one chunk.
+
+    ``text`` is on-screen text (such as slide OCR) to index with the
+    chunk's transcript.
+    """
+
+    index: int
+    start_ms: int
+    end_ms: int
+    embedding: np.ndarray
+    text: str = ""
+
+
+def describe_chunk(chunk: Chunk) -> CoarseSegment:
+    """Summarise a chunk as a unit-norm colour-histogram + audio-energy vector."""
+    hist = np.zeros(_HIST_BINS**3, dtype=np.float32)
+    if chunk.frames:
+        images = np.stack([frame.image[::8, ::8] for frame in chunk.frames])
+        q = (images >> (8 - int(np.log2(_HIST_BINS)))).astype(np.int64)
+        codes = (q[..., 0] * _HIST_BINS + q[..., 1]) * _HIST_BINS + q[..., 2]
+        hist = np.bincount(codes.ravel(), minlength=hist.size).astype(np.float32)
+        hist /= codes.size
+    energy = 0.0
+    if chunk.audio is not None and chunk.audio.samples.size:
+        energy = float(np.sqrt(np.mean(np.square(chunk.audio.samples))))
+    vector = np.append(hist, np.float32(energy))
+    norm = np.linalg.norm(vector)
+    if norm > 0:
+        vector /= norm
+    return CoarseSegment(chunk.index, chunk.start_ms, chunk.end_ms, vector)
+
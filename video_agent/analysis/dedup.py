@@ -0,0 +1,83 @@
+"""Perceptual-hash deduplication of sampled frames.
+
+Lectures show one slide for minutes and fixed cameras a static scene for
+hours, so consecutive sampled frames are often near-identical. Each frame
+gets a 64-bit difference hash (dHash: whether each cell of an area-averaged
+grayscale thumbnail is brighter than its left neighbour), computed for a
+whole chunk in a few NumPy operations. A cell only counts as brighter by
+more than a small ``tolerance``, so flat areas such as a slide's background
+hash to zeros instead of to the sign of sensor noise. Frames within
+``max_distance`` bits of the first frame of the current run join that run,
+and only the first frame of every run is embedded; its fine-grained segment
+spans the whole run, so coverage of the timeline is unchanged.
+"""
+
+from __future__ import annotations
+
+from dataclasses import replace
+from typing import Callable
+
+import numpy as np
+
+from video_agent.analysis.fine import FineSegment, describe_frames
+from video_agent.chunking.chunker import Chunk
+from video_agent.chunking.imaging import run_starts, thumbnails
+
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def dhash(images: np.ndarray, size: int = 8, tolerance: float = 0.01) -> np.ndarray:
+    """Difference hashes of an ``(N, H, W, 3)`` uint8 batch as ``(N, size*size/8)`` bytes.
+
+    ``tolerance`` is the brightness step, in ``[0, 1]`` intensity units, a
+    cell must exceed over its left neighbour to set its bit.
+    """
+    if images.shape[1] < size or images.shape[2] < size + 1:
+        raise ValueError(f"frames must be at least {size + 1}x{size} pixels")
+    small = thumbnails(images, size, size + 1, min_cell=4)
+    bits = small[:, :, 1:] > small[:, :, :-1] + tolerance
+    return np.packbits(bits.reshape(len(images), -1), axis=1)
+
+
+def hamming(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Bitwise distances between packed hashes, broadcasting over leading axes."""
+    return _POPCOUNT[np.bitwise_xor(a, b)].sum(axis=-1, dtype=np.int64)
+
+
+class FrameDeduplicator:
+    """Fine-grained embedder that skips near-duplicate frames.
+
+    Wraps ``embed`` (a ``Chunk -> list[FineSegment]`` callable such as
+    :func:`describe_frames`, which spans each frame until the next one) and
+    hands it only the first frame of every run.
+    """
+
+    def __init__(
+        self,
+        embed: Callable[[Chunk], list[FineSegment]] = describe_frames,
+        *,
+        max_distance: int = 6,
+        hash_size: int = 8,
+        tolerance: float = 0.01,
+    ) -> None:
+        if max_distance < 0:
+            raise ValueError("max_distance must be >= 0")
+        if hash_size < 1 or hash_size * hash_size % 8:
+            raise ValueError("hash_size squared must be a multiple of 8")
+        if tolerance < 0:
+            raise ValueError("tolerance must be >= 0")
+        self.embed = embed
+        self.max_distance = max_distance
+        self.hash_size = hash_size
+        self.tolerance = tolerance
+
+    def representatives(self, chunk: Chunk) -> Chunk:
+        """``chunk`` with only the first frame of each run of near-identical frames."""
+        if len(chunk.frames) < 2:
+            return chunk
+        hashes = dhash(np.stack([frame.image for frame in chunk.frames]), self.hash_size, self.tolerance)
+        starts = run_starts(hashes, lambda later, first: hamming(later, first) > self.max_distance)
+        return replace(chunk, frames=tuple(chunk.frames[i] for i in starts))
+
+    def __call__(self, chunk: Chunk) -> list[FineSegment]:
+        return self.embed(self.representatives(chunk))
@@ -0,0 +1,40 @@
+"""Fine-grained analysis: one descriptor per sampled frame."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from video_agent.chunking.chunker import Chunk
+
+_THUMB = 16  # thumbnail side, 256-dimensional descriptors
+
+
+@dataclass(frozen=True)
+class FineSegment:
+    """A frame-level embedding valid for ``[start_ms, end_ms)``."""
+
+    start_ms: int
+    end_ms: int
+    embedding: np.ndarray
+
+
+def describe_frames(chunk: Chunk) -> list[FineSegment]:
+    """Embed each sampled frame as a zero-mean, unit-norm grayscale thumbnail.
+
+    A frame's span runs until the next sampled frame (or the chunk's end).
+    """
+    if not chunk.frames:
+        return []
+    images = np.stack([frame.image for frame in chunk.frames])
+    rows = np.linspace(0, images.shape[1] - 1, _THUMB).astype(np.intp)
+    cols = np.linspace(0, images.shape[2] - 1, _THUMB).astype(np.intp)
+    thumbs = images[:, rows][:, :, cols].astype(np.float32) @ np.float32([0.299, 0.587, 0.114])
+    vectors = thumbs.reshape(len(images), -1)
+    vectors -= vectors.mean(axis=1, keepdims=True)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    vectors /= np.where(norms > 0, norms, 1.0)
+    starts = [frame.timestamp_ms for frame in chunk.frames]
+    ends = starts[1:] + [chunk.end_ms]
+    return [FineSegment(start, max(end, start + 1), vector) for start, end, vector in zip(starts, ends, vectors)]
@@ -0,0 +1,147 @@
+"""Slide-aware analysis of lecture videos.
+
+A lecture shows a handful of slides per chunk, each for many sampled frames.
+Slides are found with a :class:`~video_agent.chunking.slides.SlideDetector`
+and the expensive per-image work, OCR and fine-grained embedding, runs on
+one frame per slide instead of every sampled frame. The text of a chunk's
+slides is attached to its :class:`CoarseSegment`, from which
+:func:`~video_agent.incremental.index_ingested` adds it to the keyword
+index next to the transcript.
+
+Nothing here classifies videos: use these analyzers in the pipeline that
+ingests lectures.
+"""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass, replace
+from typing import Callable, Protocol
+
+import numpy as np
+
+from video_agent.analysis.coarse import CoarseSegment, describe_chunk
+from video_agent.analysis.fine import FineSegment, describe_frames
+from video_agent.chunking.chunker import Chunk
+from video_agent.chunking.decode import Frame
+from video_agent.chunking.slides import SlideDetector
+
+
+class TextRecognizer(Protocol):
+    """OCR: the text shown in an ``(H, W, 3)`` uint8 RGB image."""
+
+    def recognize(self, image: np.ndarray) -> str: ...
+
+
+@dataclass(frozen=True)
+class Slide:
+    """A slide shown over ``[start_ms, end_ms)``, represented by its first frame.
+
+    ``continued`` is true for a slide already on screen before the chunk.
+    """
+
+    start_ms: int
+    end_ms: int
+    frame: Frame
+    continued: bool = False
+
+
+def find_slides(
+    chunk: Chunk, detector: SlideDetector, reference: np.ndarray | None = None
+) -> tuple[list[Slide], np.ndarray | None]:
+    """The slides of ``chunk`` and the thumbnail of its last slide.
+
+    ``reference`` is the thumbnail of the slide shown before the chunk; if
+    the chunk opens on that slide, its first :class:`Slide` is marked
+    ``continued``. The first slide always starts at the chunk's start.
+    """
+    if not chunk.frames:
+        return [], reference
+    thumbs = detector.thumbnails(np.stack([frame.image for frame in chunk.frames]))
+    starts = detector.slide_starts(thumbs, reference)
+    continued = len(starts) == 0 or starts[0] != 0
+    if continued:
+        starts = np.concatenate([[0], starts]).astype(np.intp)
+    ends = [chunk.frames[i].timestamp_ms for i in starts[1:]] + [chunk.end_ms]
+    slides = [
+        Slide(chunk.frames[i].timestamp_ms, end, chunk.frames[i], k == 0 and continued)
+        for k, (i, end) in enumerate(zip(starts, ends))
+    ]
+    slides[0] = replace(slides[0], start_ms=chunk.start_ms)
+    return slides, thumbs[starts[-1]]
+
+
+class SlideAnalyzer:
+    """Coarse-grained embedder that attaches slide text to each segment.
+
+    Wraps ``embed`` (a ``Chunk -> CoarseSegment`` callable such as
+    :func:`describe_chunk`) and runs ``ocr`` once per slide. A slide still
+    on screen when the next chunk starts is not read again, so chunks must
+    be passed in order, as the ingest pipeline does. For the same reason it
+    cannot run on :class:`~video_agent.pipeline.IngestPipeline`'s
+    ``coarse_pool``: worker processes would each see a share of the chunks
+    and lose the last slide, so the pipeline rejects it there.
+    """
+
+    sequential = True  # keeps state between chunks; see IngestPipeline(coarse_pool=...)
+
+    def __init__(
+        self,
+        ocr: TextRecognizer,
+        *,
+        embed: Callable[[Chunk], CoarseSegment] = describe_chunk,
+        detector: SlideDetector | None = None,
+    ) -> None:
+        self.ocr = ocr
+        self.embed = embed
+        self.detector = detector or SlideDetector()
+        self._lock = threading.Lock()
+        self._last: tuple[int, np.ndarray, str] | None = None  # (chunk end, thumbnail, text)
+
+    def reset(self) -> None:
+        """Forget the last slide, e.g. before a new video."""
+        with self._lock:
+            self._last = None
+
+    def __call__(self, chunk: Chunk) -> CoarseSegment:
+        segment = self.embed(chunk)
+        with self._lock:
+            last = self._last
+            if last is not None and last[0] != chunk.start_ms:
+                last = None  # not a continuation of the previous chunk
+            slides, thumb = find_slides(chunk, self.detector, None if last is None else last[1])
+            texts = [last[2] if slide.continued else self._read(slide) for slide in slides]
+            if slides:
+                self._last = (chunk.end_ms, thumb, texts[-1])
+        return replace(segment, text="\n".join(dict.fromkeys(text for text in texts if text)))
+
+    def _read(self, slide: Slide) -> str:
+        return self.ocr.recognize(self.detector.crop(slide.frame.image)).strip()
+
+
+class SlideFrameEmbedder:
+    """Fine-grained embedder that sees each slide once.
+
+    Slides come from :func:`find_slides` with ``detector``; ``embed`` gets
+    the chunk reduced to the first frame of each slide, so with
+    :func:`describe_frames` every fine segment covers a whole slide.
+    """
+
+    def __init__(
+        self,
+        embed: Callable[[Chunk], list[FineSegment]] = describe_frames,
+        *,
+        detector: SlideDetector | None = None,
+    ) -> None:
+        self.embed = embed
+        self.detector = detector or SlideDetector()
+
+    def representatives(self, chunk: Chunk) -> Chunk:
+        """``chunk`` with only the first frame of each slide."""
+        if len(chunk.frames) < 2:
+            return chunk
+        slides, _ = find_slides(chunk, self.detector)
+        return replace(chunk, frames=tuple(slide.frame for slide in slides))
+
+    def __call__(self, chunk: Chunk) -> list[FineSegment]:
+        return self.embed(self.representatives(chunk))
@@ -0,0 +1,63 @@
+"""Process-pool fan-out with ordered reassembly.
+
+Chunks are analysed concurrently on a pool of worker processes, but results
+are yielded strictly in submission order so temporal alignment with the
+source video is preserved. The number of chunks in flight is bounded, which
+keeps the streaming chunker's memory bound intact and provides backpressure
+when workers fall behind.
+"""
+
+from __future__ import annotations
+
+import os
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from typing import Callable, Generic, Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class ParallelAnalyzer(Generic[T, R]):
+    """Apply a picklable ``analyze`` function to items on a process pool.
+
+    ``workers`` defaults to one per CPU core; ``workers <= 1`` runs inline in
+    the calling process. ``max_in_flight`` caps submitted-but-unconsumed
+    items (default ``2 * workers``).
+    """
+
+    def __init__(
+        self,
+        analyze: Callable[[T], R],
+        *,
+        workers: int | None = None,
+        max_in_flight: int | None = None,
+    ) -> None:
+        self.analyze = analyze
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.max_in_flight = max_in_flight if max_in_flight is not None else 2 * max(self.workers, 1)
+        if self.max_in_flight < 1:
+            raise ValueError("max_in_flight must be >= 1")
+
+    def map(self, items: Iterable[T]) -> Iterator[R]:
+        """Yield ``analyze(item)`` for each item, in input order."""
+        if self.workers <= 1:
+            for item in items:
+                yield self.analyze(item)
+            return
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            yield from self.map_on(pool, items)
+
+    def map_on(self, pool: Executor, items: Iterable[T]) -> Iterator[R]:
+        """Like :meth:`map`, but on an executor owned by the caller."""
+        in_flight: deque[Future[R]] = deque()
+        try:
+            for item in items:
+                in_flight.append(pool.submit(self.analyze, item))
+                if len(in_flight) >= self.max_in_flight:
+                    yield in_flight.popleft().result()
+            while in_flight:
+                yield in_flight.popleft().result()
+        finally:
+            for future in in_flight:
+                future.cancel()
@@ -0,0 +1,44 @@
+"""Deterministic local stand-in for an OCR model.
+
+Produces pseudo-words derived from a coarse, quantized thumbnail of the
+image, so the same slide always yields the same text, with an optional
+simulated inference cost. Stands in for a real OCR engine when
+exercising the slide analysers.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import time
+
+import numpy as np
+
+_VOCABULARY = (
+    "theorem", "proof", "lemma", "definition", "example", "outline", "summary", "figure",
+    "table", "equation", "matrix", "vector", "fourier", "transform", "gradient", "graph",
+    "model", "data", "network", "signal", "filter", "sample", "energy", "frequency",
+    "algorithm", "complexity", "result", "method", "input", "output", "error", "bound",
+)
+
+
+class StandInOCR:
+    """Returns ``words`` pseudo-words per image; ``ms_per_image`` is slept per call."""
+
+    def __init__(self, *, words: int = 8, ms_per_image: float = 0.0) -> None:
+        if words < 1:
+            raise ValueError("words must be >= 1")
+        self.words = words
+        self.ms_per_image = ms_per_image
+
+    def cache_config(self) -> dict:
+        return {"type": "StandInOCR", "words": self.words}
+
+    def recognize(self, image: np.ndarray) -> str:
+        if self.ms_per_image > 0:
+            time.sleep(self.ms_per_image / 1000.0)
+        h, w = image.shape[:2]
+        rows = np.linspace(0, h - 1, 8).astype(np.intp)
+        cols = np.linspace(0, w - 1, 8).astype(np.intp)
+        levels = (image[rows][:, cols].mean(axis=2) // 64).astype(np.uint8)
+        digest = hashlib.sha256(levels.tobytes()).digest()
+        return " ".join(_VOCABULARY[b % len(_VOCABULARY)] for b in digest[: self.words])
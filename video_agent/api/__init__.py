@@ -0,0 +1,12 @@
+"""Django app exposing the agent over HTTP.
+
+Add ``"video_agent.api"`` to ``INSTALLED_APPS``, point
+``VIDEO_AGENT_FACTORY`` at a callable returning the process-wide
+:class:`~video_agent.agent.VideoAgent`, and include ``video_agent.api.urls``
+in the project's URLconf.
+
+Uploads are ingested by ``python manage.py ingest_worker``, which runs the
+:data:`~video_agent.jobs.JobHandler` at ``VIDEO_AGENT_INGEST_HANDLER`` on
+jobs from the SQLite queue at ``VIDEO_AGENT_JOB_DB``; uploaded files are
+saved under ``VIDEO_AGENT_UPLOAD_DIR``.
+"""
@@ -0,0 +1,6 @@
+from django.apps import AppConfig
+
+
+class VideoAgentApiConfig(AppConfig):
+    name = "video_agent.api"
+    label = "video_agent_api"
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from video_agent.api.services import get_ingest_handler, get_job_queue
+from video_agent.jobs import WorkerPool
+
+
+class Command(BaseCommand):
+    help = "Process queued ingest jobs until interrupted."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=2, help="concurrent jobs")
+        parser.add_argument("--poll", type=float, default=1.0, help="seconds between queue polls when idle")
+        parser.add_argument(
+            "--requeue-running",
+            action="store_true",
+            help="requeue jobs left running by a crashed worker (only if no other worker is alive)",
+        )
+
+    def handle(self, *args, workers, poll, requeue_running, **options):
+        queue = get_job_queue()
+        if requeue_running:
+            self.stdout.write(f"requeued {queue.requeue_running()} job(s)")
+        self.stdout.write(f"ingest worker started with {workers} worker(s)")
+        WorkerPool(queue, get_ingest_handler(), workers=workers, poll_s=poll).run_forever()
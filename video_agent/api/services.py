@@ -0,0 +1,76 @@
+"""Process-wide objects shared by the API views.
+
+The ingest worker runs in its own process and writes to its own stores.
+Only file-backed stores, i.e. a
+:class:`~video_agent.stores.MmapVectorStore` coarse store opened on the
+same directory, see those writes from the API process;
+:func:`refresh_stores` re-maps them whenever a job finishes. Stores kept
+in memory (:class:`~video_agent.stores.VectorStore`,
+:class:`~video_agent.stores.BM25Index`,
+:class:`~video_agent.stores.TranscriptStore`) only hold what this process
+itself indexed, so with a separate worker they must be loaded by the
+agent factory (e.g. rebuilt from the ingest cache) rather than expected
+to fill up as uploads are processed.
+"""
+
+from __future__ import annotations
+
+import threading
+from functools import lru_cache
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from video_agent.agent import VideoAgent
+from video_agent.jobs import JobHandler, JobQueue
+
+
+@lru_cache(maxsize=None)
+def get_agent() -> VideoAgent:
+    """The agent built by ``settings.VIDEO_AGENT_FACTORY``, created once.
+
+    If the agent has a query cache without a ``generation`` source, it is
+    given the job queue's, so answers cached here are dropped once the
+    ingest worker finishes a job for the video.
+    """
+    agent = import_string(settings.VIDEO_AGENT_FACTORY)()
+    cache = agent.cache
+    if cache is not None and cache.generation is None and getattr(settings, "VIDEO_AGENT_JOB_DB", None):
+        cache.generation = get_job_queue().generation
+    return agent
+
+
+@lru_cache(maxsize=None)
+def get_job_queue() -> JobQueue:
+    """The ingest job queue in the SQLite database ``settings.VIDEO_AGENT_JOB_DB``."""
+    return JobQueue(settings.VIDEO_AGENT_JOB_DB)
+
+
+def get_ingest_handler() -> JobHandler:
+    """The job handler at ``settings.VIDEO_AGENT_INGEST_HANDLER``."""
+    return import_string(settings.VIDEO_AGENT_INGEST_HANDLER)
+
+
+_refresh_lock = threading.Lock()
+_refreshed_generation: int | None = None
+
+
+def refresh_stores() -> None:
+    """Re-map the agent's file-backed stores if an ingest job finished since the last call.
+
+    Stores with a ``refresh()`` method are refreshed; others are left
+    alone. Does nothing without ``settings.VIDEO_AGENT_JOB_DB``.
+    """
+    global _refreshed_generation
+    if not getattr(settings, "VIDEO_AGENT_JOB_DB", None):
+        return
+    generation = get_job_queue().generation(None)
+    with _refresh_lock:
+        if generation == _refreshed_generation:
+            return
+        agent = get_agent()
+        for store in (agent.coarse_store, agent.fine_store, agent.lexical_index, agent.transcript_store):
+            refresh = getattr(store, "refresh", None)
+            if refresh is not None:
+                refresh()
+        _refreshed_generation = generation
@@ -0,0 +1,12 @@
+from django.urls import path
+
+from video_agent.api import views
+
+app_name = "video_agent_api"
+
+urlpatterns = [
+    path("ask/stream", views.ask_stream, name="ask-stream"),
+    path("videos", views.upload_video, name="upload-video"),
+    path("jobs/<int:job_id>", views.job_status, name="job-status"),
+    path("metrics", views.metrics, name="metrics"),
+]
@@ -0,0 +1,128 @@
+"""API views.
+
+``ask_stream`` answers a question as Server-Sent Events: one ``hits`` event
+with the matched timestamps as soon as retrieval finishes, a ``token`` event
+per generated token, then ``done`` (with the best fine-grained moments, if
+the agent has a fine store). Time to first byte is the retrieval
+latency rather than the whole LLM call.
+
+``upload_video`` only stores the file and enqueues an ingest job, answering
+202 with the job's URL; ``job_status`` reports its status and per-stage
+progress while a worker processes it. The upload endpoint is exempt from
+CSRF checks: it is a JSON API for scripts and services, which carry no CSRF
+cookie, so put authentication in front of it where uploads must be
+restricted. Before answering a question, the agent's file-backed stores are
+refreshed if the worker has finished a job since (see
+:func:`~video_agent.api.services.refresh_stores`).
+
+``metrics`` exports the agent's profiler in Prometheus text format (totals
+per stage and scope kind), or per query as JSON with ``?format=json``.
+Ingest runs in the worker processes, so their stage timings are not
+included here.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import json
+import logging
+import uuid
+from pathlib import Path
+from typing import Any, AsyncIterator
+
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse, JsonResponse, StreamingHttpResponse
+from django.urls import reverse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET, require_POST
+
+from video_agent.agent import VideoAgent
+from video_agent.api.services import get_agent, get_job_queue, refresh_stores
+from video_agent.retrieval import FusedHit
+from video_agent.stores.memory import SearchHit
+
+logger = logging.getLogger(__name__)
+
+
+def _sse(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def _hit_json(hit: FusedHit) -> dict[str, Any]:
+    return {"video_id": hit.video_id, "start_ms": hit.start_ms, "end_ms": hit.end_ms, "score": hit.score}
+
+
+def _moment_json(hit: SearchHit) -> dict[str, Any]:
+    record = hit.record
+    return {"video_id": record.video_id, "start_ms": record.start_ms, "end_ms": record.end_ms, "score": hit.score}
+
+
+async def _events(agent: VideoAgent, question: str, video_id: str | None) -> AsyncIterator[str]:
+    try:
+        async for event in agent.astream(question, video_id=video_id):
+            if event.kind == "hits":
+                yield _sse("hits", [_hit_json(hit) for hit in event.data])
+            elif event.kind == "token":
+                yield _sse("token", {"text": event.data})
+            else:
+                moments = [_moment_json(hit) for hit in event.data.moments]
+                yield _sse("done", {"cached": event.data.cached, "moments": moments})
+    except Exception:
+        # The status line is already sent, so report the failure in-stream.
+        logger.exception("streaming answer failed")
+        yield _sse("error", {"message": "internal error"})
+
+
+@require_GET
+async def ask_stream(request: HttpRequest) -> HttpResponse:
+    question = request.GET.get("q", "").strip()
+    if not question:
+        return JsonResponse({"error": "missing query parameter 'q'"}, status=400)
+    video_id = request.GET.get("video_id") or None
+    await asyncio.to_thread(refresh_stores)
+    response = StreamingHttpResponse(
+        _events(get_agent(), question, video_id), content_type="text/event-stream"
+    )
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"  # stop reverse proxies buffering the stream
+    return response
+
+
+@csrf_exempt
+@require_POST
+def upload_video(request: HttpRequest) -> HttpResponse:
+    upload = request.FILES.get("file")
+    if upload is None:
+        return JsonResponse({"error": "missing file field 'file'"}, status=400)
+    name = uuid.uuid4().hex
+    directory = Path(settings.VIDEO_AGENT_UPLOAD_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{name}{Path(upload.name or '').suffix.lower()}"
+    with open(path, "wb") as f:
+        for block in upload.chunks():
+            f.write(block)
+    video_id = request.POST.get("video_id") or name
+    job_id = get_job_queue().enqueue(video_id, path)
+    status_url = reverse("video_agent_api:job-status", args=[job_id])
+    return JsonResponse({"job_id": job_id, "video_id": video_id, "status_url": status_url}, status=202)
+
+
+@require_GET
+def job_status(request: HttpRequest, job_id: int) -> HttpResponse:
+    job = get_job_queue().get(job_id)
+    if job is None:
+        return JsonResponse({"error": "no such job"}, status=404)
+    fields = dataclasses.asdict(job)
+    del fields["path"], fields["options"]  # server-side details
+    return JsonResponse(fields)
+
+
+@require_GET
+def metrics(request: HttpRequest) -> HttpResponse:
+    profiler = get_agent().profiler
+    if profiler is None:
+        return JsonResponse({"error": "profiling is disabled"}, status=404)
+    if request.GET.get("format") == "json":
+        return HttpResponse(profiler.to_json(), content_type="application/json")
+    return HttpResponse(profiler.to_prometheus(), content_type="text/plain; version=0.0.4")
@@ -0,0 +1,16 @@
+"""Audio-to-Text conversion."""
+
+from video_agent.asr.base import TranscriptSegment, Transcriber
+from video_agent.asr.batching import ASRBackend, BatchingTranscriber
+from video_agent.asr.standin import StandInASRBackend
+from video_agent.asr.vad import VADTranscriber, speech_spans
+
+__all__ = [
+    "ASRBackend",
+    "BatchingTranscriber",
+    "StandInASRBackend",
+    "TranscriptSegment",
+    "Transcriber",
+    "VADTranscriber",
+    "speech_spans",
+]
@@ -0,0 +1,23 @@
+"""Audio-to-Text interfaces."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Protocol
+
+from video_agent.chunking.chunker import AudioSpan
+
+
+@dataclass(frozen=True)
+class TranscriptSegment:
+    """Transcribed text with timestamps on the source video's timeline."""
+
+    start_ms: int
+    end_ms: int
+    text: str
+
+
+class Transcriber(Protocol):
+    """Turns an audio span into timestamped transcript segments."""
+
+    def transcribe(self, audio: AudioSpan) -> list[TranscriptSegment]: ...
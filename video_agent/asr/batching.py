@@ -0,0 +1,124 @@
+"""Dynamic batching of transcription requests.
+
+Many videos ingest concurrently, each pipeline calling its transcriber from
+its own thread. :class:`BatchingTranscriber` queues those requests and hands
+them to the backend in batches of up to ``batch_size`` spans, waiting at
+most ``max_wait_ms`` after the first request of a batch for others to
+arrive. Batched inference is much more efficient than one span at a time,
+and the wait bound keeps latency predictable when traffic is light.
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Protocol, Sequence
+
+from video_agent.asr.base import TranscriptSegment
+from video_agent.chunking.chunker import AudioSpan
+
+_STOP = object()
+
+
+class ASRBackend(Protocol):
+    """A speech model that transcribes several audio spans per call."""
+
+    def transcribe_batch(self, spans: Sequence[AudioSpan]) -> list[list[TranscriptSegment]]: ...
+
+
+class BatchingTranscriber:
+    """Thread-safe :class:`~video_agent.asr.base.Transcriber` that batches across callers."""
+
+    def __init__(self, backend: ASRBackend, *, batch_size: int = 16, max_wait_ms: float = 50.0) -> None:
+        if batch_size < 1:
+            raise ValueError("batch_size must be >= 1")
+        if max_wait_ms < 0:
+            raise ValueError("max_wait_ms must be >= 0")
+        self.backend = backend
+        self.batch_size = batch_size
+        self.max_wait_ms = max_wait_ms
+        self._queue: queue.Queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._closed = False
+
+    def cache_config(self) -> Any:
+        # Batching does not change results; only the backend does.
+        return self.backend
+
+    def submit(self, span: AudioSpan) -> Future[list[TranscriptSegment]]:
+        """Queue ``span`` for transcription and return a future for its segments."""
+        future: Future[list[TranscriptSegment]] = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("BatchingTranscriber is closed")
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._dispatch, name="asr-batcher", daemon=True)
+                self._thread.start()
+            self._queue.put((span, future))
+        return future
+
+    def transcribe(self, audio: AudioSpan) -> list[TranscriptSegment]:
+        return self.submit(audio).result()
+
+    def transcribe_many(self, spans: Sequence[AudioSpan]) -> list[list[TranscriptSegment]]:
+        """Submit all spans before waiting, so they can share batches."""
+        futures = [self.submit(span) for span in spans]
+        return [future.result() for future in futures]
+
+    def close(self) -> None:
+        """Finish queued requests and stop the dispatcher thread."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            thread = self._thread
+        if thread is not None:
+            self._queue.put(_STOP)
+            thread.join()
+
+    def __enter__(self) -> "BatchingTranscriber":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _dispatch(self) -> None:
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is _STOP:
+                return
+            batch = [first]
+            deadline = time.monotonic() + self.max_wait_ms / 1000.0
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    if remaining > 0:
+                        item = self._queue.get(timeout=remaining)
+                    else:
+                        item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._run(batch)
+
+    def _run(self, batch: list[tuple[AudioSpan, Future]]) -> None:
+        batch = [(span, future) for span, future in batch if future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+        try:
+            results = self.backend.transcribe_batch([span for span, _ in batch])
+            if len(results) != len(batch):
+                raise RuntimeError(f"backend returned {len(results)} results for {len(batch)} spans")
+        except BaseException as exc:
+            for _, future in batch:
+                future.set_exception(exc)
+            return
+        for (_, future), segments in zip(batch, results):
+            future.set_result(list(segments))
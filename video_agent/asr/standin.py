@@ -0,0 +1,72 @@
+"""Deterministic local stand-in for a speech recognition model.
+
+Produces pseudo-words derived from the audio's energy and zero-crossing
+rate, so identical audio always yields identical text, with an optional
+simulated inference cost. Lets the pipeline transcribe on a CPU-only
+machine without downloading a model.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Sequence
+
+import numpy as np
+
+from video_agent.asr.base import TranscriptSegment
+from video_agent.chunking.chunker import AudioSpan
+
+_VOCABULARY = (
+    "signal", "fourier", "transform", "matrix", "vector", "camera", "door", "person",
+    "entry", "exit", "lecture", "slide", "theorem", "proof", "example", "network",
+    "gradient", "energy", "sample", "frequency", "filter", "model", "data", "graph",
+    "node", "edge", "time", "space", "motion", "object", "scene", "summary",
+)
+
+
+class StandInASRBackend:
+    """Batch backend (and plain transcriber) returning one segment per span.
+
+    ``batch_overhead_ms`` is slept once per call and ``ms_per_audio_second``
+    per second of audio, to mimic an inference engine that favours batches.
+    """
+
+    def __init__(
+        self,
+        *,
+        words_per_second: float = 2.0,
+        batch_overhead_ms: float = 0.0,
+        ms_per_audio_second: float = 0.0,
+    ) -> None:
+        if words_per_second <= 0:
+            raise ValueError("words_per_second must be positive")
+        self.words_per_second = words_per_second
+        self.batch_overhead_ms = batch_overhead_ms
+        self.ms_per_audio_second = ms_per_audio_second
+
+    def cache_config(self) -> dict:
+        return {"type": "StandInASRBackend", "words_per_second": self.words_per_second}
+
+    def transcribe_batch(self, spans: Sequence[AudioSpan]) -> list[list[TranscriptSegment]]:
+        audio_seconds = sum(span.samples.size / span.sample_rate for span in spans)
+        cost_ms = self.batch_overhead_ms + self.ms_per_audio_second * audio_seconds
+        if cost_ms > 0:
+            time.sleep(cost_ms / 1000.0)
+        return [self._transcribe(span) for span in spans]
+
+    def transcribe(self, audio: AudioSpan) -> list[TranscriptSegment]:
+        return self.transcribe_batch([audio])[0]
+
+    def _transcribe(self, span: AudioSpan) -> list[TranscriptSegment]:
+        if span.samples.size == 0:
+            return []
+        seconds = span.samples.size / span.sample_rate
+        count = max(1, round(seconds * self.words_per_second))
+        words = []
+        for window in np.array_split(span.samples, count):
+            if window.size == 0:
+                continue
+            rms = int(np.sqrt(np.mean(np.square(window, dtype=np.float64))) * 1000)
+            crossings = int(np.count_nonzero(np.diff(np.signbit(window))))
+            words.append(_VOCABULARY[(rms * 31 + crossings) % len(_VOCABULARY)])
+        return [TranscriptSegment(span.start_ms, span.end_ms, " ".join(words))]
@@ -0,0 +1,153 @@
+"""Energy-based voice activity detection in front of a transcriber.
+
+Surveillance audio is mostly silence and lectures have long pauses. A cheap
+vectorized energy pass over fixed-length PCM frames finds the speech spans,
+and only those are sent to the (expensive) transcriber. Spans are cut on
+millisecond-aligned frame boundaries and passed on with their original
+start time, so transcript timestamps stay exact on the source timeline.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+from video_agent.asr.base import TranscriptSegment, Transcriber
+from video_agent.chunking.chunker import AudioSpan
+
+
+def _runs(mask: np.ndarray) -> np.ndarray:
+    """``(n, 2)`` array of ``[start, stop)`` index pairs of True runs in ``mask``."""
+    edges = np.diff(np.concatenate([[0], mask.astype(np.int8), [0]]))
+    return np.stack([np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)], axis=1)
+
+
+def speech_frames(
+    samples: np.ndarray,
+    sample_rate: int,
+    *,
+    frame_ms: int = 30,
+    threshold_db: float = -45.0,
+    margin_db: float = 12.0,
+) -> np.ndarray:
+    """Boolean speech mask with one entry per ``frame_ms`` frame.
+
+    A frame is speech if its RMS level exceeds both ``threshold_db`` (dBFS)
+    and the estimated noise floor (10th percentile level) plus ``margin_db``.
+    Speech is modulated by syllables and pauses, while hum, fans and tape
+    hiss are stationary: audio whose loudest frame is less than
+    ``margin_db / 2`` above the floor has no speech, however loud it is.
+    Above that, the margin shrinks to half the range between floor and
+    loudest frame, so audio that is speech throughout (and whose floor is
+    therefore speech too) is kept.
+    """
+    frame_len = sample_rate * frame_ms // 1000
+    count = samples.size // frame_len
+    if count == 0:
+        return np.zeros(0, dtype=bool)
+    frames = samples[: count * frame_len].reshape(count, frame_len).astype(np.float32)
+    rms = np.sqrt(np.mean(np.square(frames), axis=1))
+    level = 20.0 * np.log10(np.maximum(rms, 1e-10))
+    floor = np.percentile(level, 10)
+    spread = level.max() - floor
+    if spread < margin_db / 2:
+        return np.zeros(count, dtype=bool)
+    return level > max(threshold_db, floor + min(margin_db, spread / 2))
+
+
+def speech_spans(
+    samples: np.ndarray,
+    sample_rate: int,
+    *,
+    frame_ms: int = 30,
+    threshold_db: float = -45.0,
+    margin_db: float = 12.0,
+    min_speech_ms: int = 150,
+    min_silence_ms: int = 300,
+    pad_ms: int = 150,
+) -> list[tuple[int, int]]:
+    """Speech spans as ``(start_ms, end_ms)`` offsets from the start of ``samples``.
+
+    Silences shorter than ``min_silence_ms`` are bridged, speech shorter
+    than ``min_speech_ms`` is dropped and every span is padded by ``pad_ms``
+    on both sides (clipped to the audio).
+    """
+    mask = speech_frames(
+        samples, sample_rate, frame_ms=frame_ms, threshold_db=threshold_db, margin_db=margin_db
+    )
+    if not mask.any():
+        return []
+    runs = _runs(mask)
+    gaps = runs[1:, 0] - runs[:-1, 1]
+    # A run opens a new span unless the silence before it is short.
+    opens = np.concatenate([[True], gaps * frame_ms >= min_silence_ms])
+    starts = runs[opens, 0]
+    stops = np.append(runs[np.flatnonzero(opens)[1:] - 1, 1], runs[-1, 1])
+    long_enough = (stops - starts) * frame_ms >= min_speech_ms
+    total_ms = samples.size * 1000 // sample_rate
+    spans = []
+    for start, stop in zip(starts[long_enough] * frame_ms, stops[long_enough] * frame_ms):
+        start_ms = max(0, int(start) - pad_ms)
+        end_ms = min(total_ms, int(stop) + pad_ms)
+        if spans and start_ms <= spans[-1][1]:
+            spans[-1] = (spans[-1][0], end_ms)
+        else:
+            spans.append((start_ms, end_ms))
+    return spans
+
+
+class VADTranscriber:
+    """Wrap a transcriber so it only sees the speech spans of each audio span."""
+
+    def __init__(
+        self,
+        transcriber: Transcriber,
+        *,
+        frame_ms: int = 30,
+        threshold_db: float = -45.0,
+        margin_db: float = 12.0,
+        min_speech_ms: int = 150,
+        min_silence_ms: int = 300,
+        pad_ms: int = 150,
+    ) -> None:
+        if frame_ms <= 0:
+            raise ValueError("frame_ms must be positive")
+        self.transcriber = transcriber
+        self.frame_ms = frame_ms
+        self.threshold_db = threshold_db
+        self.margin_db = margin_db
+        self.min_speech_ms = min_speech_ms
+        self.min_silence_ms = min_silence_ms
+        self.pad_ms = pad_ms
+
+    def speech(self, audio: AudioSpan) -> list[AudioSpan]:
+        """The speech sub-spans of ``audio``, on the source timeline."""
+        rate = audio.sample_rate
+        spans = speech_spans(
+            audio.samples,
+            rate,
+            frame_ms=self.frame_ms,
+            threshold_db=self.threshold_db,
+            margin_db=self.margin_db,
+            min_speech_ms=self.min_speech_ms,
+            min_silence_ms=self.min_silence_ms,
+            pad_ms=self.pad_ms,
+        )
+        return [
+            AudioSpan(
+                audio.start_ms + start_ms,
+                audio.start_ms + end_ms,
+                audio.samples[start_ms * rate // 1000 : end_ms * rate // 1000],
+                rate,
+            )
+            for start_ms, end_ms in spans
+        ]
+
+    def transcribe(self, audio: AudioSpan) -> list[TranscriptSegment]:
+        spans = self.speech(audio)
+        # Batching transcribers accept all spans at once so they can share batches.
+        transcribe_many = getattr(self.transcriber, "transcribe_many", None)
+        if transcribe_many is not None:
+            results = transcribe_many(spans)
+        else:
+            results = [self.transcriber.transcribe(span) for span in spans]
+        return [segment for segments in results for segment in segments]
@@ -0,0 +1,145 @@
+"""Content-addressed disk cache for ingest stage results.
+
+Stage results are keyed by a hash of the source video's content plus the
+configuration of the stage and of every stage it depends on, so re-ingesting
+an unchanged video reuses everything, while changing e.g. the embedding
+model only invalidates the embedding stage. Entries are pickled files under
+a cache directory; the least recently used entries are evicted once the
+directory exceeds ``max_bytes``. Only point the cache at a directory you
+trust, since entries are unpickled on read.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import json
+import os
+import pickle
+import threading
+from pathlib import Path
+from typing import Any
+
+_MISSING = object()
+
+
+def file_digest(path: str | Path, *, block_size: int = 1 << 20) -> str:
+    """SHA-256 of a file's content, read in blocks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while block := f.read(block_size):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def config_of(obj: Any) -> Any:
+    """A JSON-serialisable description of a stage component's configuration.
+
+    Objects may define ``cache_config()`` to control this; otherwise
+    dataclasses contribute their fields, functions their qualified name and
+    other objects their type plus public attributes.
+    """
+    if obj is None or isinstance(obj, (str, int, float, bool)):
+        return obj
+    if isinstance(obj, (list, tuple)):
+        return [config_of(item) for item in obj]
+    if isinstance(obj, dict):
+        return {str(key): config_of(value) for key, value in obj.items()}
+    if hasattr(obj, "cache_config"):
+        return config_of(obj.cache_config())
+    name = f"{type(obj).__module__}.{type(obj).__qualname__}"
+    if dataclasses.is_dataclass(obj):
+        return {"type": name, **config_of(dataclasses.asdict(obj))}
+    if callable(obj) and hasattr(obj, "__qualname__"):
+        return f"{obj.__module__}.{obj.__qualname__}"
+    fields = {key: value for key, value in vars(obj).items() if not key.startswith("_")}
+    return {"type": name, **config_of(fields)}
+
+
+def cache_key(parent: str, stage: str, config: Any = None) -> str:
+    """Key for ``stage`` run with ``config`` on the output identified by ``parent``.
+
+    ``parent`` is a :func:`file_digest` for the first stage and the key of
+    the upstream stage otherwise, so keys chain through the pipeline.
+    """
+    payload = json.dumps([parent, stage, config_of(config)], sort_keys=True, default=repr)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class DiskCache:
+    """Pickle-per-entry cache with size-bounded LRU eviction.
+
+    Reads refresh an entry's modification time, which is what eviction
+    orders by, so several processes can share one directory.
+    """
+
+    def __init__(self, root: str | Path, *, max_bytes: int = 10 * 2**30) -> None:
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be positive")
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.pkl"
+
+    def get(self, key: str, default: Any = None) -> Any:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+        except FileNotFoundError:
+            return default
+        except (pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            self.delete(key)
+            return default
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return value
+
+    def __contains__(self, key: str) -> bool:
+        return self._path(key).exists()
+
+    def put(self, key: str, value: Any) -> None:
+        path = self._path(key)
+        path.parent.mkdir(exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp, "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+        self._evict()
+
+    def delete(self, key: str) -> None:
+        try:
+            self._path(key).unlink()
+        except FileNotFoundError:
+            pass
+
+    def size_bytes(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def _entries(self) -> list[tuple[float, int, Path]]:
+        entries = []
+        for path in self.root.glob("*/*.pkl"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _evict(self) -> None:
+        with self._lock:
+            entries = self._entries()
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+                total -= size
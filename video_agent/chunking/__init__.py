@@ -0,0 +1,28 @@
+"""Video chunking: single-pass decoding and adaptive cutting."""
+
+from video_agent.chunking.chunker import AudioSpan, Chunk, StreamingChunker, iter_chunks
+from video_agent.chunking.decode import AudioBlock, AVDecoder, Frame, MediaSource
+from video_agent.chunking.keyframes import KeyframeIndex, SegmentRef, copy_segment
+from video_agent.chunking.motion import MotionGate
+from video_agent.chunking.proxy import ProxyCache, make_proxy
+from video_agent.chunking.shots import ShotDetector
+from video_agent.chunking.slides import SlideDetector
+
+__all__ = [
+    "AVDecoder",
+    "AudioBlock",
+    "AudioSpan",
+    "Chunk",
+    "Frame",
+    "KeyframeIndex",
+    "MediaSource",
+    "MotionGate",
+    "ProxyCache",
+    "SegmentRef",
+    "ShotDetector",
+    "SlideDetector",
+    "StreamingChunker",
+    "copy_segment",
+    "iter_chunks",
+    "make_proxy",
+]
@@ -0,0 +1,310 @@
+"""Streaming video chunker for the adaptive cutting stage.
+
+The chunker consumes a :class:`~video_agent.chunking.decode.MediaSource` in a
+single pass and yields :class:`Chunk` objects as soon as both the video and
+the audio stream have moved past a chunk's end. Only the chunk currently
+being filled (plus any audio still needed for it) is held in memory, so
+multi-hour recordings are processed with bounded memory and the first
+segments are available for analysis within seconds of starting ingest.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Iterator
+
+import numpy as np
+
+from video_agent.chunking.decode import AudioBlock, AVDecoder, Frame, MediaSource
+from video_agent.chunking.keyframes import KeyframeIndex, SegmentRef
+from video_agent.chunking.motion import MotionGate
+from video_agent.chunking.proxy import ProxyCache
+from video_agent.chunking.shots import ShotDetector
+from video_agent.chunking.slides import SlideDetector
+
+
+@dataclass(frozen=True)
+class AudioSpan:
+    """Mono PCM samples covering ``[start_ms, end_ms)`` of the source."""
+
+    start_ms: int
+    end_ms: int
+    samples: np.ndarray
+    sample_rate: int
+
+
+@dataclass(frozen=True)
+class Chunk:
+    """A temporal segment of a video: sampled frames plus its audio span.
+
+    ``active`` is false for a "no activity" chunk of motion-gated footage,
+    which carries a single representative frame and no audio. ``segment``
+    locates the chunk's compressed packets in the source file when it was
+    cut on keyframes.
+    """
+
+    index: int
+    start_ms: int
+    end_ms: int
+    frames: tuple[Frame, ...]
+    audio: AudioSpan | None
+    active: bool = True
+    segment: SegmentRef | None = None
+
+    @property
+    def duration_ms(self) -> int:
+        return self.end_ms - self.start_ms
+
+
+class _AudioBuffer:
+    """FIFO of contiguous PCM samples addressed by absolute sample index."""
+
+    def __init__(self, sample_rate: int, start_ms: int = 0) -> None:
+        self.sample_rate = sample_rate
+        self._parts: list[np.ndarray] = []
+        self._origin = start_ms * sample_rate // 1000  # absolute index of the first buffered sample
+        self._length = 0
+
+    @property
+    def end_ms(self) -> int:
+        return (self._origin + self._length) * 1000 // self.sample_rate
+
+    def push(self, block: AudioBlock) -> None:
+        samples = block.samples
+        expected = self._origin + self._length
+        gap = block.timestamp_ms * self.sample_rate // 1000 - expected
+        # Block timestamps are rounded to the millisecond; only treat larger
+        # discrepancies as real gaps (padded with silence) or overlaps.
+        if gap > self.sample_rate // 1000:
+            self._append(np.zeros(gap, dtype=np.float32))
+        elif gap < -(self.sample_rate // 1000):
+            samples = samples[-gap:]
+        self._append(samples)
+
+    def _append(self, samples: np.ndarray) -> None:
+        if samples.size:
+            self._parts.append(samples)
+            self._length += samples.size
+
+    def take(self, end_ms: int) -> np.ndarray:
+        """Remove and return all buffered samples before ``end_ms``."""
+        stop = min(max(end_ms * self.sample_rate // 1000 - self._origin, 0), self._length)
+        if not self._parts:
+            return np.zeros(0, dtype=np.float32)
+        data = self._parts[0] if len(self._parts) == 1 else np.concatenate(self._parts)
+        head, tail = data[:stop], data[stop:]
+        self._parts = [tail] if tail.size else []
+        self._origin += stop
+        self._length -= stop
+        return head
+
+
+class StreamingChunker:
+    """Cut a media stream into chunks in a single pass.
+
+    Without a ``detector`` the stream is cut every ``chunk_ms``. With a
+    :class:`~video_agent.chunking.shots.ShotDetector` (or, for lectures, a
+    :class:`~video_agent.chunking.slides.SlideDetector`), cuts are placed on
+    shot boundaries once a chunk is at least ``min_chunk_ms`` long (capped
+    at ``chunk_ms``), and ``chunk_ms`` becomes the maximum chunk length. Frames are scored in
+    batches of ``detector.batch_size`` (one by default), which delays
+    emission by at most one batch.
+
+    With a :class:`~video_agent.chunking.motion.MotionGate` (for
+    surveillance footage), once frames have been motionless for
+    ``motion.min_idle_ms`` the current chunk is closed where the stillness
+    began and a single inactive chunk covers the idle stretch until motion
+    resumes, however long it lasts. Only its first frame is kept and its
+    audio is discarded as it arrives.
+
+    With a :class:`~video_agent.chunking.keyframes.KeyframeIndex`, fixed and
+    shot cuts are snapped to keyframes so every chunk can be stream-copied
+    from the source: a fixed-length chunk ends at the first keyframe at or
+    after ``chunk_ms``, and a shot cut moves back to the latest keyframe
+    after the chunk's start (frames past it go to the next chunk). Without a
+    suitable keyframe the chunk keeps growing. Motion-gated boundaries are
+    not snapped.
+    """
+
+    def __init__(
+        self,
+        chunk_ms: int = 30_000,
+        *,
+        detector: ShotDetector | SlideDetector | None = None,
+        min_chunk_ms: int = 2_000,
+        motion: MotionGate | None = None,
+        keyframes: KeyframeIndex | None = None,
+    ) -> None:
+        if chunk_ms <= 0:
+            raise ValueError("chunk_ms must be positive")
+        if min_chunk_ms < 0:
+            raise ValueError("min_chunk_ms must be >= 0")
+        self.chunk_ms = chunk_ms
+        self.detector = detector
+        self.min_chunk_ms = min(min_chunk_ms, chunk_ms)
+        self.motion = motion
+        self.keyframes = keyframes
+
+    def split(self, source: MediaSource, *, start_ms: int = 0, first_index: int = 0) -> Iterator[Chunk]:
+        """Yield the chunks of ``source``.
+
+        ``start_ms`` and ``first_index`` resume cutting part-way through a
+        recording: the first chunk starts at ``start_ms`` and is numbered
+        ``first_index``. Items before ``start_ms`` are ignored.
+        """
+        audio = _AudioBuffer(source.audio_rate, start_ms) if source.has_audio else None
+        detector, gate = self.detector, self.motion
+        batch_size = 1
+        if detector is not None:
+            detector.reset()
+            batch_size = detector.batch_size
+        if gate is not None:
+            gate.reset()
+            batch_size = max(batch_size, gate.batch_size)
+        # Chunks whose video is complete but whose audio has not arrived yet.
+        pending: deque[tuple[int, int, list[Frame], bool]] = deque()
+        frames: list[Frame] = []
+        batch: list[Frame] = []
+        last_ms = start_ms
+        index = first_index
+        idle = False  # the chunk being filled is a "no activity" chunk
+        still_ms: int | None = None  # start of the trailing run of motionless frames
+        still_at = 0  # position of that run's first frame in ``frames``
+        placed_ms = start_ms  # timestamp of the last frame placed
+
+        def place(batch: list[Frame]) -> None:
+            nonlocal frames, start_ms, idle, still_ms, still_at, placed_ms
+            shots = [False] * len(batch) if detector is None else detector.boundaries(batch)
+            moving = [True] * len(batch) if gate is None else gate.moving(batch)
+            for frame, shot, move in zip(batch, shots, moving):
+                timestamp_ms = placed_ms = frame.timestamp_ms
+                if idle:
+                    if not move:
+                        continue
+                    pending.append((start_ms, timestamp_ms, frames, False))
+                    frames, start_ms, idle = [], timestamp_ms, False
+                elif gate is not None:
+                    if move:
+                        still_ms = None
+                    elif still_ms is None:
+                        still_ms, still_at = timestamp_ms, len(frames)
+                    elif timestamp_ms - still_ms >= gate.min_idle_ms:
+                        if still_ms > start_ms:
+                            pending.append((start_ms, still_ms, frames[:still_at], True))
+                            start_ms = still_ms
+                        frames, idle, still_ms = frames[still_at : still_at + 1], True, None
+                        continue
+                cuts = self._cuts(start_ms, timestamp_ms, bool(shot) and bool(frames))
+                for end_ms in cuts:
+                    # Keyframe-snapped cuts can fall before frames already placed.
+                    head = next((i for i, f in enumerate(frames) if f.timestamp_ms >= end_ms), len(frames))
+                    pending.append((start_ms, end_ms, frames[:head], True))
+                    frames = frames[head:]
+                    start_ms = end_ms
+                    still_at = max(still_at - head, 0)  # a still run outlasting a cut continues
+                frames.append(frame)
+
+        for item in source:
+            if isinstance(item, AudioBlock):
+                if audio is not None:
+                    audio.push(item)
+            elif item.timestamp_ms >= start_ms:
+                last_ms = max(last_ms, item.timestamp_ms)
+                batch.append(item)
+                if len(batch) >= batch_size:
+                    place(batch)
+                    batch = []
+            while pending and (audio is None or audio.end_ms >= pending[0][1]):
+                yield self._emit(index, *pending.popleft(), audio)
+                index += 1
+            if idle and not pending and audio is not None:
+                audio.take(placed_ms)  # an idle chunk's audio is dropped; don't buffer hours of it
+
+        place(batch)
+        while pending:
+            yield self._emit(index, *pending.popleft(), audio)
+            index += 1
+        end_ms = max(last_ms, audio.end_ms if audio is not None else 0)
+        if frames or end_ms > start_ms:
+            yield self._emit(index, start_ms, max(end_ms, start_ms + 1), frames, not idle, audio)
+
+    def _cuts(self, start_ms: int, timestamp_ms: int, shot: bool) -> list[int]:
+        """Return the chunk end times to close before placing a frame."""
+        if self.keyframes is not None:
+            return self._keyframe_cuts(start_ms, timestamp_ms, shot)
+        if self.detector is None:
+            count = max(0, (timestamp_ms - start_ms) // self.chunk_ms)
+            return [start_ms + (k + 1) * self.chunk_ms for k in range(count)]
+        elapsed = timestamp_ms - start_ms
+        if (shot and elapsed >= self.min_chunk_ms) or elapsed >= self.chunk_ms:
+            return [timestamp_ms]
+        return []
+
+    def _keyframe_cuts(self, start_ms: int, timestamp_ms: int, shot: bool) -> list[int]:
+        keyframes = self.keyframes
+        if self.detector is not None and shot and timestamp_ms - start_ms >= self.min_chunk_ms:
+            end_ms = keyframes.at_or_before(timestamp_ms)
+            if end_ms is not None and end_ms > start_ms:
+                return [end_ms]
+        cuts = []
+        end_ms = keyframes.at_or_after(start_ms + self.chunk_ms)
+        while end_ms is not None and end_ms <= timestamp_ms:
+            cuts.append(end_ms)
+            end_ms = keyframes.at_or_after(end_ms + self.chunk_ms)
+        return cuts if self.detector is None else cuts[:1]
+
+    @staticmethod
+    def _emit(
+        index: int,
+        start_ms: int,
+        end_ms: int,
+        frames: list[Frame],
+        active: bool,
+        audio: _AudioBuffer | None,
+    ) -> Chunk:
+        span = None
+        if audio is not None:
+            samples = audio.take(end_ms)
+            if active:
+                span = AudioSpan(start_ms, end_ms, samples, audio.sample_rate)
+        return Chunk(index, start_ms, end_ms, tuple(frames), span, active)
+
+
+def iter_chunks(
+    path: str | Path,
+    *,
+    chunk_ms: int = 30_000,
+    sample_fps: float | None = 1.0,
+    audio_rate: int = 16_000,
+    detector: ShotDetector | SlideDetector | None = None,
+    min_chunk_ms: int = 2_000,
+    motion: MotionGate | None = None,
+    snap_to_keyframes: bool = False,
+    max_size: int | None = None,
+    proxy: ProxyCache | None = None,
+    digest: str | None = None,
+) -> Iterator[Chunk]:
+    """Decode ``path`` once and yield its chunks as they become available.
+
+    With ``snap_to_keyframes`` the video's keyframes are indexed first (a
+    demux-only pass) and every chunk carries a :class:`SegmentRef` to its
+    compressed packets, for playback or export without re-encoding.
+    ``max_size`` scales sampled frames down so neither side exceeds it.
+    With a ``proxy`` cache, frames and audio are decoded from the video's
+    low-resolution proxy (created on first use) instead; chunk times and
+    segment references still address ``path``. ``digest`` is the video's
+    :func:`~video_agent.cache.file_digest`, if already known, to find its
+    proxy without hashing the file again.
+    """
+    keyframes = KeyframeIndex.from_file(path) if snap_to_keyframes else None
+    chunker = StreamingChunker(
+        chunk_ms, detector=detector, min_chunk_ms=min_chunk_ms, motion=motion, keyframes=keyframes
+    )
+    decode_path = path if proxy is None else proxy.path_for(path, digest=digest)
+    with AVDecoder(decode_path, sample_fps=sample_fps, audio_rate=audio_rate, max_size=max_size) as source:
+        for chunk in chunker.split(source):
+            if keyframes is not None:
+                chunk = replace(chunk, segment=keyframes.segment(path, chunk.start_ms, chunk.end_ms))
+            yield chunk
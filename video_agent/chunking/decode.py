@@ -0,0 +1,174 @@
+"""Single-pass media decoding.
+
+A media source yields decoded video frames and audio blocks interleaved in
+presentation order, so downstream stages can consume a whole file in one
+demux/decode pass without seeking.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Protocol, Union
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class Frame:
+    """A decoded video frame.
+
+    ``index`` is the ordinal of the frame in the decoded stream (counting
+    frames that were skipped by sampling), ``image`` is an ``(H, W, 3)``
+    uint8 RGB array.
+    """
+
+    index: int
+    timestamp_ms: int
+    image: np.ndarray
+
+
+@dataclass(frozen=True)
+class AudioBlock:
+    """A block of mono float32 PCM samples starting at ``timestamp_ms``."""
+
+    timestamp_ms: int
+    samples: np.ndarray
+    sample_rate: int
+
+
+MediaItem = Union[Frame, AudioBlock]
+
+
+class MediaSource(Protocol):
+    """Anything that yields :class:`Frame` and :class:`AudioBlock` items in order."""
+
+    has_audio: bool
+    audio_rate: int
+
+    def __iter__(self) -> Iterator[MediaItem]: ...
+
+
+def fit_size(width: int, height: int, max_size: int | None) -> tuple[int, int]:
+    """Even dimensions of ``width`` x ``height`` scaled down so neither side exceeds ``max_size``."""
+    if max_size is not None and max(width, height) > max_size:
+        scale = max_size / max(width, height)
+        width, height = round(width * scale), round(height * scale)
+    return max(2, width - width % 2), max(2, height - height % 2)
+
+
+def _require_av():
+    try:
+        import av
+    except ImportError as exc:  # pragma: no cover - depends on environment
+        raise ImportError("PyAV is required to decode video files: pip install av") from exc
+    return av
+
+
+class AVDecoder:
+    """Decode a container file once with PyAV.
+
+    Video frames are sampled at ``sample_fps`` (``None`` keeps every frame);
+    unsampled frames are decoded but never converted to arrays, which is
+    where most of the per-frame cost lies. With ``max_size`` sampled frames
+    are scaled down (keeping the aspect ratio) so neither side exceeds it,
+    in the same conversion that produces the RGB array, so everything
+    downstream works on the smaller frames. Audio is resampled to mono
+    float32 at ``audio_rate``. With ``start_ms`` the decoder seeks to the
+    preceding keyframe and drops everything before ``start_ms``; frame
+    indices then count from the seek point.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        sample_fps: float | None = 1.0,
+        audio_rate: int = 16_000,
+        start_ms: int = 0,
+        max_size: int | None = None,
+    ) -> None:
+        if start_ms < 0:
+            raise ValueError("start_ms must be >= 0")
+        if sample_fps is not None and sample_fps <= 0:
+            raise ValueError("sample_fps must be positive or None")
+        if max_size is not None and max_size < 2:
+            raise ValueError("max_size must be >= 2 or None")
+        av = _require_av()
+        self.path = Path(path)
+        self.sample_fps = sample_fps
+        self.audio_rate = audio_rate
+        self.start_ms = start_ms
+        self.max_size = max_size
+        self._container = av.open(str(self.path))
+        if not self._container.streams.video:
+            self._container.close()
+            raise ValueError(f"{self.path} has no video stream")
+        self._video = self._container.streams.video[0]
+        self._video.thread_type = "AUTO"
+        self._audio = self._container.streams.audio[0] if self._container.streams.audio else None
+        self._size = None
+        if max_size is not None and max(self._video.width, self._video.height) > max_size:
+            self._size = fit_size(self._video.width, self._video.height, max_size)
+
+    @property
+    def has_audio(self) -> bool:
+        return self._audio is not None
+
+    @property
+    def duration_ms(self) -> int | None:
+        duration = self._container.duration
+        return None if duration is None else duration // 1000
+
+    def close(self) -> None:
+        self._container.close()
+
+    def __enter__(self) -> "AVDecoder":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __iter__(self) -> Iterator[MediaItem]:
+        av = _require_av()
+        streams = [self._video] if self._audio is None else [self._video, self._audio]
+        resampler = None
+        if self._audio is not None:
+            resampler = av.AudioResampler(format="flt", layout="mono", rate=self.audio_rate)
+        if self.start_ms:
+            self._container.seek(self.start_ms * 1000, backward=True)
+        interval_ms = None if self.sample_fps is None else 1000.0 / self.sample_fps
+        next_due_ms = float(self.start_ms)
+        frame_index = 0
+        audio_position: int | None = None  # absolute sample index of the next audio sample
+
+        for packet in self._container.demux(*streams):
+            for decoded in packet.decode():
+                if packet.stream is self._video:
+                    index, frame_index = frame_index, frame_index + 1
+                    if decoded.time is None:
+                        continue
+                    timestamp_ms = decoded.time * 1000.0
+                    if timestamp_ms < self.start_ms:
+                        continue
+                    if interval_ms is not None:
+                        if timestamp_ms < next_due_ms:
+                            continue
+                        while next_due_ms <= timestamp_ms:
+                            next_due_ms += interval_ms
+                    if self._size is not None:
+                        decoded = decoded.reformat(*self._size, format="rgb24", interpolation="AREA")
+                    yield Frame(index, round(timestamp_ms), decoded.to_ndarray(format="rgb24"))
+                else:
+                    if audio_position is None:
+                        audio_position = round((decoded.time or 0.0) * self.audio_rate)
+                    for block in resampler.resample(decoded):
+                        samples = block.to_ndarray().reshape(-1).astype(np.float32, copy=False)
+                        yield AudioBlock(audio_position * 1000 // self.audio_rate, samples, self.audio_rate)
+                        audio_position += samples.size
+
+        if resampler is not None and audio_position is not None:
+            for block in resampler.resample(None):
+                samples = block.to_ndarray().reshape(-1).astype(np.float32, copy=False)
+                yield AudioBlock(audio_position * 1000 // self.audio_rate, samples, self.audio_rate)
+                audio_position += samples.size
@@ -0,0 +1,67 @@
+"""Grayscale thumbnails and run splitting shared by the frame analysers.
+
+Shot, motion and slide detection and frame deduplication all compare small
+grayscale versions of the sampled frames. Slide detection and deduplication
+also split a batch into runs of frames that stay close to the run's first
+frame.
+"""
+
+from __future__ import annotations
+
+from typing import Callable
+
+import numpy as np
+
+LUMA = np.array([0.299, 0.587, 0.114], dtype=np.float32)  # BT.601 RGB weights
+
+
+def area_mean(values: np.ndarray, axis: int, cells: int) -> np.ndarray:
+    """Means of ``values`` over ``cells`` near-equal slices along ``axis``."""
+    edges = np.linspace(0, values.shape[axis], cells + 1).astype(np.intp)
+    sums = np.add.reduceat(values, edges[:-1], axis=axis)
+    shape = [1] * values.ndim
+    shape[axis] = cells
+    return sums / np.diff(edges).reshape(shape)
+
+
+def thumbnails(images: np.ndarray, rows: int, cols: int, *, min_cell: int = 2) -> np.ndarray:
+    """Area-averaged ``(N, rows, cols)`` grayscale thumbnails in ``[0, 1]`` of an ``(N, H, W, 3)`` batch.
+
+    Images are subsampled first, as far as every cell still averages at
+    least ``min_cell`` x ``min_cell`` pixels; images smaller than the
+    thumbnail are upsampled by repetition.
+    """
+    stride = max(1, min(images.shape[1] // (min_cell * rows), images.shape[2] // (min_cell * cols)))
+    gray = images[:, ::stride, ::stride].astype(np.float32) @ (LUMA / 255.0)
+    if gray.shape[1] < rows or gray.shape[2] < cols:
+        gray = gray.repeat(-(-rows // gray.shape[1]), axis=1).repeat(-(-cols // gray.shape[2]), axis=2)
+    return area_mean(area_mean(gray, 1, rows), 2, cols).astype(np.float32)
+
+
+def run_starts(
+    items: np.ndarray,
+    far: Callable[[np.ndarray, np.ndarray], np.ndarray],
+    reference: np.ndarray | None = None,
+) -> np.ndarray:
+    """Indices of the ``items`` that start a new run.
+
+    ``far(later, first)`` is a boolean mask of the ``later`` items that are
+    too far from a run's ``first`` item to belong to its run. ``reference``
+    is the first item of the run in progress before ``items``; without one
+    the first item starts a run.
+    """
+    starts = []
+    i = 0
+    if reference is None and len(items):
+        starts.append(0)
+        reference, i = items[0], 1
+    while i < len(items):
+        # One vectorized pass per run: the next run starts at the first
+        # later item too far from this run's first item.
+        hits = np.flatnonzero(far(items[i:], reference))
+        if len(hits) == 0:
+            break
+        i += int(hits[0])
+        starts.append(i)
+        reference, i = items[i], i + 1
+    return np.asarray(starts, dtype=np.intp)
@@ -0,0 +1,130 @@
+"""Keyframe-aligned segment references.
+
+A :class:`KeyframeIndex` lists the video stream's keyframes (timestamp and
+byte offset) from a demux-only pass, which reads packet headers without
+decoding. Cutting chunks on keyframes means every chunk can be played or
+exported by copying the compressed packets between two keyframes: a
+:class:`SegmentRef` records the chunk's byte range in the original file, and
+:func:`copy_segment` remuxes it into a standalone file without re-encoding,
+so segments are never duplicated on disk.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from fractions import Fraction
+from pathlib import Path
+
+import numpy as np
+
+from video_agent.chunking.decode import _require_av
+
+
+@dataclass(frozen=True)
+class SegmentRef:
+    """``[start_ms, end_ms)`` of ``path``; ``start_ms`` is on a keyframe.
+
+    ``byte_start`` and ``byte_end`` bound the video packets of the segment
+    (interleaved audio included) when the container reports packet offsets.
+    """
+
+    path: str
+    start_ms: int
+    end_ms: int
+    byte_start: int | None
+    byte_end: int | None
+
+
+class KeyframeIndex:
+    """Sorted keyframe timestamps (ms) and byte offsets (-1 if unknown)."""
+
+    def __init__(self, timestamps_ms: np.ndarray, positions: np.ndarray, *, size: int | None = None) -> None:
+        order = np.argsort(timestamps_ms, kind="stable")
+        self.timestamps_ms = np.asarray(timestamps_ms, dtype=np.int64)[order]
+        self.positions = np.asarray(positions, dtype=np.int64)[order]
+        self.size = size
+
+    @classmethod
+    def from_file(cls, path: str | Path) -> "KeyframeIndex":
+        av = _require_av()
+        timestamps, positions = [], []
+        with av.open(str(path)) as container:
+            if not container.streams.video:
+                raise ValueError(f"{path} has no video stream")
+            video = container.streams.video[0]
+            for packet in container.demux(video):
+                if packet.is_keyframe and packet.pts is not None:
+                    timestamps.append(round(float(packet.pts * packet.time_base) * 1000))
+                    positions.append(-1 if packet.pos is None else packet.pos)
+        return cls(np.asarray(timestamps), np.asarray(positions), size=Path(path).stat().st_size)
+
+    def __len__(self) -> int:
+        return len(self.timestamps_ms)
+
+    def at_or_before(self, time_ms: int) -> int | None:
+        i = np.searchsorted(self.timestamps_ms, time_ms, side="right")
+        return None if i == 0 else int(self.timestamps_ms[i - 1])
+
+    def at_or_after(self, time_ms: int) -> int | None:
+        i = np.searchsorted(self.timestamps_ms, time_ms, side="left")
+        return None if i == len(self.timestamps_ms) else int(self.timestamps_ms[i])
+
+    def byte_range(self, start_ms: int, end_ms: int) -> tuple[int | None, int | None]:
+        """Offsets of the keyframe at or before ``start_ms`` and of the first
+        keyframe at or after ``end_ms`` (the file size past the last one)."""
+        first = np.searchsorted(self.timestamps_ms, start_ms, side="right") - 1
+        last = np.searchsorted(self.timestamps_ms, end_ms, side="left")
+        start = int(self.positions[first]) if first >= 0 and self.positions[first] >= 0 else None
+        if last < len(self.positions):
+            end = int(self.positions[last]) if self.positions[last] >= 0 else None
+        else:
+            end = self.size
+        return start, end
+
+    def segment(self, path: str | Path, start_ms: int, end_ms: int) -> SegmentRef:
+        return SegmentRef(str(path), start_ms, end_ms, *self.byte_range(start_ms, end_ms))
+
+
+def copy_segment(segment: SegmentRef, out_path: str | Path) -> None:
+    """Stream-copy ``segment`` into a new container at ``out_path`` without re-encoding.
+
+    Packets are copied from the keyframe at or before ``start_ms`` up to
+    ``end_ms``. Every stream is shifted by that keyframe's time, rescaled to
+    the stream's time base, so the output starts at zero with audio and
+    video still in sync; audio packets starting before the keyframe are
+    dropped.
+    """
+    av = _require_av()
+    with av.open(segment.path) as source, av.open(str(out_path), "w") as sink:
+        streams = [s for s in (source.streams.video[:1] + source.streams.audio[:1])]
+        outputs = {s.index: sink.add_stream_from_template(s) for s in streams}
+        source.seek(segment.start_ms * 1000, backward=True)
+        origin: Fraction | None = None  # seconds; the first video packet is the keyframe
+        held = []  # packets demuxed before the keyframe, until its time is known
+
+        def mux(packet) -> None:
+            shift = round(origin / packet.time_base)
+            if packet.pts < shift and packet.stream.type != "video":
+                return
+            packet.pts -= shift
+            packet.dts -= shift
+            packet.stream = outputs[packet.stream.index]
+            sink.mux(packet)
+
+        for packet in source.demux(*streams):
+            if packet.dts is None or packet.pts is None:
+                continue
+            time_ms = float(packet.pts * packet.time_base) * 1000
+            if time_ms >= segment.end_ms:
+                if packet.stream.type == "video":
+                    break
+                continue
+            if origin is None:
+                if packet.stream.type != "video":
+                    held.append(packet)
+                    continue
+                origin = packet.pts * packet.time_base
+                for early in held:
+                    mux(early)
+                held.clear()
+            mux(packet)
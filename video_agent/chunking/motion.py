@@ -0,0 +1,92 @@
+"""Motion gating for surveillance footage.
+
+Fixed cameras are idle most of the time. A running-average background model
+is kept on a grayscale thumbnail (2x2 block means of a strided subsample,
+which averages out sensor and compression noise), and a frame's motion
+energy is the fraction of thumbnail pixels that differ from the background
+by more than
+``pixel_threshold`` (after removing the frame's mean difference, so global
+lighting changes do not count as motion). Frames whose energy reaches
+``threshold`` are moving; :class:`~video_agent.chunking.chunker.StreamingChunker`
+folds long motionless stretches into single "no activity" chunks.
+"""
+
+from __future__ import annotations
+
+from typing import Sequence
+
+import numpy as np
+
+from video_agent.chunking.decode import Frame
+from video_agent.chunking.imaging import LUMA
+
+
+class MotionGate:
+    """Flag frames with motion against an adaptive background.
+
+    ``min_idle_ms`` is how long frames must stay motionless before the
+    chunker treats the stretch as idle. The background is updated frame by
+    frame anyway, so batching frames (``batch_size``) only delays them.
+    """
+
+    def __init__(
+        self,
+        *,
+        threshold: float = 0.01,
+        pixel_threshold: float = 0.08,
+        stride: int = 8,
+        learning_rate: float = 0.05,
+        min_idle_ms: int = 10_000,
+        batch_size: int = 1,
+    ) -> None:
+        if stride < 2:
+            raise ValueError("stride must be >= 2")
+        if not 0.0 < learning_rate <= 1.0:
+            raise ValueError("learning_rate must be in (0, 1]")
+        if min_idle_ms < 0:
+            raise ValueError("min_idle_ms must be >= 0")
+        if batch_size < 1:
+            raise ValueError("batch_size must be >= 1")
+        self.threshold = threshold
+        self.pixel_threshold = pixel_threshold
+        self.stride = stride
+        self.learning_rate = learning_rate
+        self.min_idle_ms = min_idle_ms
+        self.batch_size = batch_size
+        self._background: np.ndarray | None = None
+
+    def reset(self) -> None:
+        """Forget the background, e.g. before a new video."""
+        self._background = None
+
+    def thumbnails(self, images: np.ndarray) -> np.ndarray:
+        """Grayscale thumbnails in ``[0, 1]``, one pixel per ``stride`` x ``stride`` block."""
+        half = self.stride // 2
+        gray = images[:, ::half, ::half].astype(np.float32) @ (LUMA / 255.0)
+        n, h, w = gray.shape
+        h, w = max(h - h % 2, 2), max(w - w % 2, 2)
+        return gray[:, :h, :w].reshape(n, h // 2, 2, w // 2, 2).mean(axis=(2, 4))
+
+    def energy(self, images: np.ndarray) -> np.ndarray:
+        """Motion energy in ``[0, 1]`` of each frame of an ``(N, H, W, 3)`` uint8 batch.
+
+        The background is updated frame by frame, so a batch must be in
+        stream order. The first frame after :meth:`reset` has energy 0.
+        """
+        gray = self.thumbnails(images)
+        if self._background is None or self._background.shape != gray.shape[1:]:
+            self._background = gray[0].copy()
+        energy = np.empty(len(gray), dtype=np.float32)
+        rate = self.learning_rate
+        for i, frame in enumerate(gray):
+            diff = frame - self._background
+            diff -= diff.mean()
+            energy[i] = np.count_nonzero(np.abs(diff) > self.pixel_threshold) / diff.size
+            self._background += rate * (frame - self._background)
+        return energy
+
+    def moving(self, frames: Sequence[Frame]) -> np.ndarray:
+        """Boolean mask of the frames showing motion."""
+        if not frames:
+            return np.zeros(0, dtype=bool)
+        return self.energy(np.stack([frame.image for frame in frames])) >= self.threshold
@@ -0,0 +1,135 @@
+"""Low-resolution analysis proxies.
+
+Decoding and colour conversion cost scales with pixels, and the analysis
+stages never need full-resolution frames. :func:`make_proxy` decodes a video
+once and re-encodes it downscaled and at a reduced frame rate, with every
+timestamp kept, so a proxy can stand in for its original anywhere in the
+chunking pipeline. Chunk times, and the keyframe segment references used
+for playback, still refer to the original file. :class:`ProxyCache` keeps
+one proxy per video content and configuration, so re-ingesting a video (for
+example after changing an embedding model) decodes only the proxy.
+
+Cached proxies are QuickTime files. Audio packets are copied unchanged when
+the container accepts the codec (AAC, MP3, Opus, G.711 and linear PCM among
+others) and decoded to 16-bit PCM otherwise, as for the G.726 audio of some
+surveillance cameras.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from fractions import Fraction
+from pathlib import Path
+
+from video_agent.cache import cache_key, file_digest
+from video_agent.chunking.decode import _require_av, fit_size
+
+_MS = Fraction(1, 1000)
+
+
+def make_proxy(
+    path: str | Path,
+    out_path: str | Path,
+    *,
+    max_size: int = 360,
+    fps: float = 5.0,
+    codec: str = "libx264",
+) -> None:
+    """Write a proxy of ``path`` to ``out_path``: at most ``max_size`` pixels
+    on a side and ``fps`` frames per second, with the original timestamps.
+
+    The proxy has a keyframe every two seconds, so decoders can start part
+    way through it.
+    """
+    if max_size < 2:
+        raise ValueError("max_size must be >= 2")
+    if fps <= 0:
+        raise ValueError("fps must be positive")
+    av = _require_av()
+    with av.open(str(path)) as source, av.open(str(out_path), "w") as sink:
+        if not source.streams.video:
+            raise ValueError(f"{path} has no video stream")
+        video = source.streams.video[0]
+        video.thread_type = "AUTO"
+        audio = source.streams.audio[0] if source.streams.audio else None
+        width, height = fit_size(video.width, video.height, max_size)
+        encoder = sink.add_stream(codec, rate=Fraction(fps).limit_denominator(1000))
+        encoder.width, encoder.height, encoder.pix_fmt = width, height, "yuv420p"
+        encoder.codec_context.time_base = _MS
+        encoder.codec_context.gop_size = max(1, round(2 * fps))
+        copied = transcoded = None
+        if audio is not None and audio.codec_context.name in sink.supported_codecs:
+            copied = sink.add_stream_from_template(audio)
+        elif audio is not None:
+            transcoded = sink.add_stream("pcm_s16le", rate=audio.codec_context.sample_rate)
+            transcoded.layout = audio.codec_context.layout
+
+        interval_ms = 1000.0 / fps
+        next_due_ms = None
+        last_ms = -1
+        for packet in source.demux(*([video] if audio is None else [video, audio])):
+            if packet.stream is not video:
+                if copied is not None and packet.dts is not None:
+                    packet.stream = copied
+                    sink.mux(packet)
+                elif transcoded is not None:
+                    for samples in packet.decode():
+                        sink.mux(transcoded.encode(samples))
+                continue
+            for decoded in packet.decode():
+                if decoded.time is None:
+                    continue
+                timestamp_ms = decoded.time * 1000.0
+                if next_due_ms is None:
+                    next_due_ms = timestamp_ms
+                if timestamp_ms < next_due_ms or round(timestamp_ms) <= last_ms:
+                    continue
+                while next_due_ms <= timestamp_ms:
+                    next_due_ms += interval_ms
+                frame = decoded.reformat(width, height, format="yuv420p", interpolation="AREA")
+                frame.pts, frame.time_base = round(timestamp_ms), _MS
+                last_ms = frame.pts
+                sink.mux(encoder.encode(frame))
+        sink.mux(encoder.encode())
+        if transcoded is not None:
+            sink.mux(transcoded.encode())
+
+
+class ProxyCache:
+    """Proxies under ``root``, keyed by the source's content and the proxy settings.
+
+    ``fps`` should be at least the analysis ``sample_fps``; decoding a proxy
+    with a higher ``sample_fps`` yields every proxy frame.
+    """
+
+    def __init__(
+        self, root: str | Path, *, max_size: int = 360, fps: float = 5.0, codec: str = "libx264"
+    ) -> None:
+        if max_size < 2:
+            raise ValueError("max_size must be >= 2")
+        if fps <= 0:
+            raise ValueError("fps must be positive")
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_size = max_size
+        self.fps = fps
+        self.codec = codec
+
+    def cache_config(self) -> dict[str, object]:
+        return {"max_size": self.max_size, "fps": self.fps, "codec": self.codec}
+
+    def path_for(self, path: str | Path, *, digest: str | None = None) -> Path:
+        """The proxy of ``path``, created on first use.
+
+        ``digest`` is ``file_digest(path)`` if the caller already has it.
+        """
+        proxy = self.root / f"{cache_key(digest or file_digest(path), 'proxy', self)}.mov"
+        if not proxy.exists():
+            tmp = proxy.with_name(f"{proxy.stem}.{os.getpid()}.{threading.get_ident()}.tmp.mov")
+            try:
+                make_proxy(path, tmp, max_size=self.max_size, fps=self.fps, codec=self.codec)
+                os.replace(tmp, proxy)
+            finally:
+                tmp.unlink(missing_ok=True)
+        return proxy
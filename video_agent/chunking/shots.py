@@ -0,0 +1,101 @@
+"""Vectorized shot-boundary detection.
+
+Each frame is downsampled and quantized into a joint RGB colour histogram
+and a grayscale thumbnail with a handful of NumPy operations, then compared
+against its predecessor. The last frame scored is carried over, so scores
+do not depend on how the stream is batched. Per-frame NumPy already runs far
+above real time and larger batches only add cache pressure (see
+``benchmarks/bench_shot_detection.py``), so frames are scored one at a time
+by default.
+"""
+
+from __future__ import annotations
+
+from typing import Sequence
+
+import numpy as np
+
+from video_agent.chunking.decode import Frame
+from video_agent.chunking.imaging import LUMA
+
+
+class ShotDetector:
+    """Score frame-to-frame change and flag shot boundaries.
+
+    The score of a frame is a weighted mix of the histogram delta (half the
+    L1 distance between normalized colour histograms) and the mean absolute
+    grayscale difference, both in ``[0, 1]``. A frame whose score reaches
+    ``threshold`` starts a new shot.
+    """
+
+    def __init__(
+        self,
+        *,
+        threshold: float = 0.35,
+        bins: int = 8,
+        stride: int = 4,
+        histogram_weight: float = 0.7,
+        batch_size: int = 1,
+    ) -> None:
+        if bins < 1 or 256 % bins:
+            raise ValueError("bins must divide 256")
+        if stride < 1:
+            raise ValueError("stride must be >= 1")
+        if not 0.0 <= histogram_weight <= 1.0:
+            raise ValueError("histogram_weight must be in [0, 1]")
+        if batch_size < 1:
+            raise ValueError("batch_size must be >= 1")
+        self.threshold = threshold
+        self.bins = bins
+        self.stride = stride
+        self.histogram_weight = histogram_weight
+        self.batch_size = batch_size
+        self._prev_hist: np.ndarray | None = None
+        self._prev_gray: np.ndarray | None = None
+
+    def reset(self) -> None:
+        """Forget the previous frame, e.g. before scoring a new video."""
+        self._prev_hist = None
+        self._prev_gray = None
+
+    def features(self, images: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Return ``(histograms, thumbnails)`` for an ``(N, H, W, 3)`` uint8 batch."""
+        small = images[:, :: self.stride, :: self.stride]
+        n = small.shape[0]
+        pixels = small.shape[1] * small.shape[2]
+        shift = 8 - int(np.log2(self.bins))
+        q = (small >> shift).astype(np.int64)
+        codes = (q[..., 0] * self.bins + q[..., 1]) * self.bins + q[..., 2]
+        nbins = self.bins**3
+        codes = codes.reshape(n, -1) + (np.arange(n, dtype=np.int64) * nbins)[:, None]
+        hist = np.bincount(codes.ravel(), minlength=n * nbins).reshape(n, nbins)
+        hist = hist.astype(np.float32) / pixels
+        gray = small.astype(np.float32) @ LUMA
+        return hist, gray.reshape(n, -1)
+
+    def scores(self, images: np.ndarray) -> np.ndarray:
+        """Score an ``(N, H, W, 3)`` batch against the preceding frames.
+
+        The first frame ever scored (after :meth:`reset`) gets a score of 0.
+        """
+        if len(images) == 0:
+            return np.zeros(0, dtype=np.float32)
+        hist, gray = self.features(images)
+        if self._prev_gray is None or self._prev_gray.shape[1:] != gray.shape[1:]:
+            prev_hist, prev_gray = hist[:1], gray[:1]
+        else:
+            prev_hist, prev_gray = self._prev_hist, self._prev_gray
+        prev_hist = np.concatenate([prev_hist, hist[:-1]])
+        prev_gray = np.concatenate([prev_gray, gray[:-1]])
+        hist_delta = 0.5 * np.abs(hist - prev_hist).sum(axis=1)
+        pixel_delta = np.abs(gray - prev_gray).mean(axis=1) / 255.0
+        self._prev_hist, self._prev_gray = hist[-1:], gray[-1:]
+        w = self.histogram_weight
+        return (w * hist_delta + (1.0 - w) * pixel_delta).astype(np.float32)
+
+    def boundaries(self, frames: Sequence[Frame]) -> np.ndarray:
+        """Return a boolean mask marking frames that start a new shot."""
+        if not frames:
+            return np.zeros(0, dtype=bool)
+        images = np.stack([frame.image for frame in frames])
+        return self.scores(images) >= self.threshold
@@ -0,0 +1,132 @@
+"""Slide-transition detection for lecture videos.
+
+A slide stays on screen for minutes while the lecturer moves, points and
+talks, so frame-to-frame colour change (as used by the shot detector) is the
+wrong signal. Instead the slide region of each frame is reduced to a
+grayscale thumbnail and compared against the first frame of the current
+slide by structural similarity (SSIM over small blocks), which reacts to
+new text and figures but not to uniform brightness shifts or noise. Comparing against
+the slide's first frame rather than the previous frame also catches slides
+that are built up gradually.
+"""
+
+from __future__ import annotations
+
+from typing import Sequence
+
+import numpy as np
+
+from video_agent.chunking.decode import Frame
+from video_agent.chunking.imaging import run_starts, thumbnails
+
+_C1 = 0.01**2  # SSIM stabilisers for intensities in [0, 1]
+_C2 = 0.03**2
+
+
+def structural_dissimilarity(a: np.ndarray, b: np.ndarray, block: int = 8) -> np.ndarray:
+    """``(1 - SSIM) / 2`` in ``[0, 1]`` between ``(..., H, W)`` thumbnails, broadcasting.
+
+    SSIM is computed on non-overlapping ``block`` x ``block`` windows and
+    averaged with weights proportional to the windows' variance, so the
+    blank background that covers most of a slide does not dilute changes
+    in its text and figures. ``H`` and ``W`` must be multiples of ``block``.
+    """
+    a, b = np.broadcast_arrays(a, b)
+    *lead, h, w = a.shape
+    shape = (*lead, h // block, block, w // block, block)
+    a, b = a.reshape(shape), b.reshape(shape)
+    axes = (-3, -1)
+    mu_a, mu_b = a.mean(axis=axes), b.mean(axis=axes)
+    var_a, var_b = a.var(axis=axes), b.var(axis=axes)
+    cov = (a * b).mean(axis=axes) - mu_a * mu_b
+    ssim = ((2 * mu_a * mu_b + _C1) * (2 * cov + _C2)) / (
+        (mu_a**2 + mu_b**2 + _C1) * (var_a + var_b + _C2)
+    )
+    weight = var_a + var_b + _C2
+    ssim = (ssim * weight).sum(axis=(-2, -1)) / weight.sum(axis=(-2, -1))
+    return (1.0 - ssim) / 2.0
+
+
+class SlideDetector:
+    """Flag frames that show a new slide.
+
+    ``region`` is the slide's ``(top, left, bottom, right)`` as fractions of
+    the frame (for example to exclude a picture-in-picture of the speaker);
+    ``None`` uses the whole frame. A frame starts a new slide when its
+    structural dissimilarity to the current slide's first frame reaches
+    ``threshold``. Usable as the ``detector`` of
+    :class:`~video_agent.chunking.chunker.StreamingChunker`, so chunks
+    follow slide transitions.
+    """
+
+    def __init__(
+        self,
+        *,
+        threshold: float = 0.03,
+        region: tuple[float, float, float, float] | None = None,
+        size: tuple[int, int] = (96, 128),
+        block: int = 8,
+        batch_size: int = 1,
+    ) -> None:
+        if not 0.0 < threshold <= 1.0:
+            raise ValueError("threshold must be in (0, 1]")
+        if region is not None:
+            top, left, bottom, right = region
+            if not (0.0 <= top < bottom <= 1.0 and 0.0 <= left < right <= 1.0):
+                raise ValueError("region must be (top, left, bottom, right) fractions of the frame")
+        if block < 2 or size[0] % block or size[1] % block:
+            raise ValueError("size must be a multiple of block, and block >= 2")
+        if batch_size < 1:
+            raise ValueError("batch_size must be >= 1")
+        self.threshold = threshold
+        self.region = region
+        self.size = size
+        self.block = block
+        self.batch_size = batch_size
+        self._reference: np.ndarray | None = None
+
+    def reset(self) -> None:
+        """Forget the current slide, e.g. before a new video."""
+        self._reference = None
+
+    def crop(self, images: np.ndarray) -> np.ndarray:
+        """The slide region of an ``(..., H, W, 3)`` image or batch."""
+        if self.region is None:
+            return images
+        top, left, bottom, right = self.region
+        h, w = images.shape[-3:-1]
+        y0, x0 = int(top * h), int(left * w)
+        return images[..., y0 : max(int(bottom * h), y0 + 1), x0 : max(int(right * w), x0 + 1), :]
+
+    def thumbnails(self, images: np.ndarray) -> np.ndarray:
+        """Grayscale ``size`` thumbnails in ``[0, 1]`` of the slide region of an ``(N, H, W, 3)`` batch."""
+        return thumbnails(self.crop(images), *self.size)
+
+    def slide_starts(self, thumbnails: np.ndarray, reference: np.ndarray | None = None) -> np.ndarray:
+        """Indices of the thumbnails that start a new slide.
+
+        Without a ``reference`` (the thumbnail of the slide shown before
+        the batch) the first thumbnail starts a slide.
+        """
+        return run_starts(
+            thumbnails,
+            lambda later, first: structural_dissimilarity(later, first, self.block) >= self.threshold,
+            reference,
+        )
+
+    def boundaries(self, frames: Sequence[Frame]) -> np.ndarray:
+        """Boolean mask of the frames that start a new slide.
+
+        The first frame after :meth:`reset` is not a boundary.
+        """
+        mask = np.zeros(len(frames), dtype=bool)
+        if not frames:
+            return mask
+        thumbs = self.thumbnails(np.stack([frame.image for frame in frames]))
+        starts = self.slide_starts(thumbs, self._reference)
+        mask[starts] = True
+        if self._reference is None:
+            mask[0] = False
+        if len(starts):
+            self._reference = thumbs[starts[-1]]
+        return mask
@@ -0,0 +1,186 @@
+"""Incremental ingest for growing recordings.
+
+Surveillance footage arrives either as a file that keeps growing or as a
+sequence of segment files. :class:`IncrementalIngestor` remembers where the
+last ingest stopped and only decodes, analyses and indexes what came after,
+appending to the coarse and fine vector stores instead of rebuilding them,
+so each update costs O(new footage).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Iterable, Iterator, Protocol
+
+from video_agent.agent.cache import QueryCache
+from video_agent.chunking.chunker import Chunk, StreamingChunker
+from video_agent.chunking.decode import AVDecoder, MediaItem, MediaSource
+from video_agent.chunking.motion import MotionGate
+from video_agent.chunking.shots import ShotDetector
+from video_agent.chunking.slides import SlideDetector
+from video_agent.pipeline import IngestedChunk, IngestPipeline
+from video_agent.stores.lexical import BM25Index
+from video_agent.stores.memory import VectorRecord
+from video_agent.stores.transcripts import TranscriptStore
+
+
+class RecordSink(Protocol):
+    def add(self, records: Iterable[VectorRecord]) -> None: ...
+
+
+def index_ingested(
+    video_id: str,
+    item: IngestedChunk,
+    coarse_store: RecordSink,
+    fine_store: RecordSink | None = None,
+    transcript_store: TranscriptStore | None = None,
+    lexical_index: BM25Index | None = None,
+) -> None:
+    """Append one ingested chunk's embeddings (and transcript) to the stores.
+
+    The chunk's transcript and on-screen text go into ``lexical_index`` as
+    one document spanning the coarse segment, so lexical and coarse hits
+    line up.
+    """
+    coarse = item.coarse
+    coarse_store.add([VectorRecord(video_id, coarse.start_ms, coarse.end_ms, coarse.embedding)])
+    if fine_store is not None and item.fine:
+        fine_store.add(
+            VectorRecord(video_id, segment.start_ms, segment.end_ms, segment.embedding)
+            for segment in item.fine
+        )
+    if transcript_store is not None and item.transcript:
+        transcript_store.add(video_id, item.transcript)
+    if lexical_index is not None and (item.transcript or coarse.text):
+        text = " ".join([*(segment.text for segment in item.transcript), coarse.text])
+        lexical_index.add(video_id, coarse.start_ms, coarse.end_ms, text)
+
+
+@dataclass
+class IngestState:
+    """Progress of an incremental ingest: the end of the last indexed chunk."""
+
+    end_ms: int = 0
+    next_index: int = 0
+
+
+class _Offset:
+    """Shift a segment file's timestamps onto the recording's timeline."""
+
+    def __init__(self, source: MediaSource, offset_ms: int) -> None:
+        self.source = source
+        self.offset_ms = offset_ms
+        self.has_audio = source.has_audio
+        self.audio_rate = source.audio_rate
+
+    def __iter__(self) -> Iterator[MediaItem]:
+        for item in self.source:
+            yield replace(item, timestamp_ms=item.timestamp_ms + self.offset_ms)
+
+
+def _all_but_last(chunks: Iterable[Chunk]) -> Iterator[Chunk]:
+    previous = None
+    for chunk in chunks:
+        if previous is not None:
+            yield previous
+        previous = chunk
+
+
+class IncrementalIngestor:
+    """Ingest a recording piece by piece into existing vector stores.
+
+    Use :meth:`update` when the same file keeps growing and
+    :meth:`add_segment` when the recording arrives as consecutive files.
+    ``state`` may be restored from a previous process to resume. Cached
+    query answers about the video are invalidated whenever chunks are added.
+    Frames are scaled down to ``max_size`` as they are decoded (live
+    recordings are analysed directly rather than through a proxy file).
+    """
+
+    def __init__(
+        self,
+        video_id: str,
+        pipeline: IngestPipeline,
+        coarse_store: RecordSink,
+        fine_store: RecordSink | None = None,
+        *,
+        transcript_store: TranscriptStore | None = None,
+        lexical_index: BM25Index | None = None,
+        query_cache: QueryCache | None = None,
+        state: IngestState | None = None,
+        chunk_ms: int = 30_000,
+        sample_fps: float | None = 1.0,
+        audio_rate: int = 16_000,
+        detector: ShotDetector | SlideDetector | None = None,
+        min_chunk_ms: int = 2_000,
+        motion: MotionGate | None = None,
+        max_size: int | None = None,
+    ) -> None:
+        self.video_id = video_id
+        self.pipeline = pipeline
+        self.coarse_store = coarse_store
+        self.fine_store = fine_store
+        self.transcript_store = transcript_store
+        self.lexical_index = lexical_index
+        self.query_cache = query_cache
+        self.state = state if state is not None else IngestState()
+        self.sample_fps = sample_fps
+        self.audio_rate = audio_rate
+        self.max_size = max_size
+        self._chunker = StreamingChunker(
+            chunk_ms, detector=detector, min_chunk_ms=min_chunk_ms, motion=motion
+        )
+
+    def update(self, path: str | Path, *, final: bool = False) -> int:
+        """Ingest the part of a growing file after the last indexed chunk.
+
+        The last chunk is held back, since the file may still be written
+        to, unless ``final`` is true. Returns the number of chunks indexed.
+        """
+        state = self.state
+        with AVDecoder(
+            path,
+            sample_fps=self.sample_fps,
+            audio_rate=self.audio_rate,
+            start_ms=state.end_ms,
+            max_size=self.max_size,
+        ) as source:
+            chunks = self._chunker.split(source, start_ms=state.end_ms, first_index=state.next_index)
+            return self._consume(chunks if final else _all_but_last(chunks))
+
+    def add_segment(self, path: str | Path) -> int:
+        """Ingest a complete segment file that continues the recording.
+
+        Returns the number of chunks indexed.
+        """
+        state = self.state
+        offset_ms = state.end_ms
+        with AVDecoder(
+            path, sample_fps=self.sample_fps, audio_rate=self.audio_rate, max_size=self.max_size
+        ) as decoder:
+            source = _Offset(decoder, offset_ms)
+            count = self._consume(
+                self._chunker.split(source, start_ms=offset_ms, first_index=state.next_index)
+            )
+            if decoder.duration_ms is not None:
+                state.end_ms = max(state.end_ms, offset_ms + decoder.duration_ms)
+        return count
+
+    def _consume(self, chunks: Iterable[Chunk]) -> int:
+        count = 0
+        for item in self.pipeline.run(chunks, scope=f"video:{self.video_id}"):
+            index_ingested(
+                self.video_id,
+                item,
+                self.coarse_store,
+                self.fine_store,
+                self.transcript_store,
+                self.lexical_index,
+            )
+            self.state.end_ms = item.chunk.end_ms
+            self.state.next_index = item.chunk.index + 1
+            count += 1
+        if count and self.query_cache is not None:
+            self.query_cache.invalidate(self.video_id)
+        return count
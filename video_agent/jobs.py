@@ -0,0 +1,271 @@
+"""SQLite-backed ingest job queue and a local worker pool.
+
+Uploads enqueue a job instead of ingesting inside the request handler;
+:class:`WorkerPool` threads (usually in a separate process, see the
+``ingest_worker`` management command) claim queued jobs, run them and
+record per-stage progress, which the API reads back from the same
+database. SQLite serialises writers, so claiming a job is a single atomic
+``UPDATE ... RETURNING`` and no broker is needed. Finishing or failing a
+job bumps its video's generation counter in the same database, which
+processes serving queries check to drop cached answers about the video.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable
+
+from video_agent.chunking.chunker import Chunk
+from video_agent.pipeline import IngestedChunk, IngestPipeline, ProgressCallback
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    video_id TEXT NOT NULL,
+    path TEXT NOT NULL,
+    options TEXT NOT NULL,
+    status TEXT NOT NULL,
+    progress TEXT NOT NULL DEFAULT '{}',
+    error TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, id);
+CREATE TABLE IF NOT EXISTS generations (
+    video_id TEXT PRIMARY KEY,
+    generation INTEGER NOT NULL
+);
+"""
+
+_BUMP = (
+    "INSERT INTO generations (video_id, generation) VALUES ((SELECT video_id FROM jobs WHERE id = ?), 1) "
+    "ON CONFLICT (video_id) DO UPDATE SET generation = generation + 1"
+)
+
+
+@dataclass(frozen=True)
+class Job:
+    """An ingest job. ``progress`` maps a stage to its chunk count and the
+    media time (``end_ms``) it has reached."""
+
+    id: int
+    video_id: str
+    path: str
+    options: dict[str, Any]
+    status: str
+    progress: dict[str, dict[str, int]]
+    error: str | None
+    created_at: float
+    started_at: float | None
+    finished_at: float | None
+
+
+def _job(row: sqlite3.Row) -> Job:
+    values = dict(row)
+    values["options"] = json.loads(values["options"])
+    values["progress"] = json.loads(values["progress"])
+    return Job(**values)
+
+
+class JobQueue:
+    """Jobs stored in the SQLite database at ``path``; safe to share across
+    threads and processes."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = str(path)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30.0)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _execute(self, sql: str, params: tuple = (), *, bump_job: int | None = None) -> sqlite3.Row | None:
+        conn = self._connect()
+        try:
+            with conn:
+                row = conn.execute(sql, params).fetchone()
+                if bump_job is not None:
+                    conn.execute(_BUMP, (bump_job,))
+                return row
+        finally:
+            conn.close()
+
+    def enqueue(self, video_id: str, path: str | Path, **options: Any) -> int:
+        """Queue ingest of ``path`` as ``video_id``; ``options`` are passed to
+        the handler (e.g. chunking options). Returns the job id."""
+        row = self._execute(
+            "INSERT INTO jobs (video_id, path, options, status, created_at) VALUES (?, ?, ?, ?, ?) RETURNING id",
+            (video_id, str(path), json.dumps(options), QUEUED, time.time()),
+        )
+        return int(row["id"])
+
+    def get(self, job_id: int) -> Job | None:
+        row = self._execute("SELECT * FROM jobs WHERE id = ?", (job_id,))
+        return None if row is None else _job(row)
+
+    def claim(self) -> Job | None:
+        """Mark the oldest queued job running and return it, if there is one."""
+        row = self._execute(
+            "UPDATE jobs SET status = ?, started_at = ? "
+            "WHERE id = (SELECT id FROM jobs WHERE status = ? ORDER BY id LIMIT 1) RETURNING *",
+            (RUNNING, time.time(), QUEUED),
+        )
+        return None if row is None else _job(row)
+
+    def set_progress(self, job_id: int, progress: dict[str, dict[str, int]]) -> None:
+        self._execute("UPDATE jobs SET progress = ? WHERE id = ?", (json.dumps(progress), job_id))
+
+    def finish(self, job_id: int) -> None:
+        self._execute(
+            "UPDATE jobs SET status = ?, finished_at = ? WHERE id = ?",
+            (DONE, time.time(), job_id),
+            bump_job=job_id,
+        )
+
+    def fail(self, job_id: int, error: str) -> None:
+        # A failed job may still have indexed some chunks.
+        self._execute(
+            "UPDATE jobs SET status = ?, error = ?, finished_at = ? WHERE id = ?",
+            (FAILED, error, time.time(), job_id),
+            bump_job=job_id,
+        )
+
+    def generation(self, video_id: str | None) -> int:
+        """How many ingest jobs have ended for ``video_id`` (for all videos if None).
+
+        Pass as :class:`~video_agent.agent.QueryCache`'s ``generation``.
+        """
+        if video_id is None:
+            row = self._execute("SELECT COALESCE(SUM(generation), 0) AS generation FROM generations")
+        else:
+            row = self._execute("SELECT generation FROM generations WHERE video_id = ?", (video_id,))
+        return 0 if row is None else int(row["generation"])
+
+    def requeue_running(self) -> int:
+        """Put jobs left running by a crashed worker back in the queue.
+
+        Only call this when no other worker is alive. Returns the number of
+        jobs requeued.
+        """
+        conn = self._connect()
+        try:
+            with conn:
+                cursor = conn.execute(
+                    "UPDATE jobs SET status = ?, started_at = NULL, progress = '{}' WHERE status = ?",
+                    (QUEUED, RUNNING),
+                )
+                return cursor.rowcount
+        finally:
+            conn.close()
+
+
+JobHandler = Callable[[Job, ProgressCallback], None]
+
+
+def pipeline_handler(pipeline: IngestPipeline, index: Callable[[str, IngestedChunk], None]) -> JobHandler:
+    """A handler that ingests the job's file with ``pipeline`` and passes
+    each chunk to ``index(video_id, item)``, e.g. :func:`index_ingested`.
+
+    Calls to ``index`` are serialised, so worker threads can share stores
+    and each chunk's records land in all of them together.
+    """
+    lock = threading.Lock()
+
+    def handle(job: Job, progress: ProgressCallback) -> None:
+        items = pipeline.ingest(job.path, progress=progress, scope=f"video:{job.video_id}", **job.options)
+        for item in items:
+            with lock:
+                index(job.video_id, item)
+
+    return handle
+
+
+class _Progress:
+    def __init__(self, queue: JobQueue, job_id: int) -> None:
+        self.queue = queue
+        self.job_id = job_id
+        self.stages: dict[str, dict[str, int]] = {}
+        self.lock = threading.Lock()
+
+    def __call__(self, stage: str, chunk: Chunk) -> None:
+        with self.lock:
+            state = self.stages.setdefault(stage, {"chunks": 0, "end_ms": 0})
+            state["chunks"] += 1
+            state["end_ms"] = max(state["end_ms"], chunk.end_ms)
+            self.queue.set_progress(self.job_id, self.stages)
+
+
+class WorkerPool:
+    """``workers`` threads that claim and run jobs from ``queue`` with ``handler``."""
+
+    def __init__(self, queue: JobQueue, handler: JobHandler, *, workers: int = 2, poll_s: float = 1.0) -> None:
+        if workers < 1:
+            raise ValueError("workers must be >= 1")
+        self.queue = queue
+        self.handler = handler
+        self.workers = workers
+        self.poll_s = poll_s
+        self._stop = threading.Event()
+        self._threads: list[threading.Thread] = []
+
+    def start(self) -> None:
+        if self._threads:
+            return
+        self._stop.clear()
+        self._threads = [
+            threading.Thread(target=self._loop, name=f"ingest-worker-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self) -> None:
+        """Stop claiming jobs and wait for running ones to finish."""
+        self._stop.set()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def run_forever(self) -> None:
+        self.start()
+        try:
+            while not self._stop.wait(self.poll_s):
+                pass
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+
+    def run_job(self, job: Job) -> None:
+        try:
+            self.handler(job, _Progress(self.queue, job.id))
+        except Exception as exc:
+            logger.exception("ingest job %d failed", job.id)
+            self.queue.fail(job.id, f"{type(exc).__name__}: {exc}")
+        else:
+            self.queue.finish(job.id)
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            job = self.queue.claim()
+            if job is None:
+                self._stop.wait(self.poll_s)
+            else:
+                self.run_job(job)
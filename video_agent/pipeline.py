@@ -0,0 +1,379 @@
+"""Pipelined ingest.
+
+Ingest stages (Video Chunking, Audio-to-Text, coarse and fine embedding) run
+concurrently in their own threads, connected by bounded queues: while chunk
+N is being transcribed, chunk N+1 is being cut and chunk N-1 embedded.
+End-to-end latency approaches that of the slowest stage, and a full queue
+blocks its producer, which caps the number of chunks held in memory.
+Decoding, NumPy and model inference release the GIL, so threads overlap
+real work. Coarse embedding that holds the GIL can instead be fanned out to
+a process pool with :class:`~video_agent.analysis.parallel.ParallelAnalyzer`.
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Executor
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, Sequence
+
+from video_agent.analysis.coarse import CoarseSegment, describe_chunk
+from video_agent.analysis.fine import FineSegment, describe_frames
+from video_agent.analysis.parallel import ParallelAnalyzer
+from video_agent.asr.base import TranscriptSegment, Transcriber
+from video_agent.cache import DiskCache, cache_key, file_digest
+from video_agent.chunking.chunker import Chunk, iter_chunks
+from video_agent.profiling import Profiler, stage_timer
+
+_DONE = object()
+_POLL_S = 0.1
+
+
+class _Failure:
+    def __init__(self, exc: BaseException) -> None:
+        self.exc = exc
+
+
+def _put(outbox: queue.Queue, item: Any, stop: threading.Event) -> bool:
+    while not stop.is_set():
+        try:
+            outbox.put(item, timeout=_POLL_S)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _get(inbox: queue.Queue, stop: threading.Event) -> Any:
+    while not stop.is_set():
+        try:
+            return inbox.get(timeout=_POLL_S)
+        except queue.Empty:
+            continue
+    return _DONE
+
+
+def _feed(source: Iterable[Any], outbox: queue.Queue, stop: threading.Event) -> None:
+    iterator = iter(source)
+    try:
+        for item in iterator:
+            if not _put(outbox, item, stop):
+                break
+        else:
+            _put(outbox, _DONE, stop)
+    except BaseException as exc:
+        _put(outbox, _Failure(exc), stop)
+    finally:
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            close()
+
+
+def _work(
+    fn: Callable[[Any], Any],
+    inbox: queue.Queue,
+    outbox: queue.Queue,
+    stop: threading.Event,
+) -> None:
+    while True:
+        item = _get(inbox, stop)
+        if item is _DONE or isinstance(item, _Failure):
+            _put(outbox, item, stop)
+            return
+        try:
+            result = fn(item)
+        except BaseException as exc:
+            _put(outbox, _Failure(exc), stop)
+            return
+        if not _put(outbox, result, stop):
+            return
+
+
+def run_stages(
+    source: Iterable[Any],
+    stages: Sequence[Callable[[Any], Any]],
+    *,
+    queue_size: int = 2,
+) -> Iterator[Any]:
+    """Stream ``source`` through ``stages``, each running in its own thread.
+
+    Items keep their order. An exception in any stage is re-raised in the
+    consumer; closing the returned generator early stops all stages.
+    """
+    if queue_size < 1:
+        raise ValueError("queue_size must be >= 1")
+    stop = threading.Event()
+    queues = [queue.Queue(maxsize=queue_size) for _ in range(len(stages) + 1)]
+    threads = [threading.Thread(target=_feed, args=(source, queues[0], stop), daemon=True)]
+    for i, fn in enumerate(stages):
+        threads.append(
+            threading.Thread(target=_work, args=(fn, queues[i], queues[i + 1], stop), daemon=True)
+        )
+    for thread in threads:
+        thread.start()
+    try:
+        while True:
+            item = queues[-1].get()
+            if item is _DONE:
+                return
+            if isinstance(item, _Failure):
+                raise item.exc
+            yield item
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+
+@dataclass(frozen=True)
+class IngestedChunk:
+    """A chunk together with its transcript and coarse/fine-grained analysis."""
+
+    chunk: Chunk
+    transcript: tuple[TranscriptSegment, ...]
+    coarse: CoarseSegment
+    fine: tuple[FineSegment, ...] = ()
+
+
+_STAGES = ("asr", "coarse", "fine")
+
+_Transcribed = tuple[Chunk, tuple[TranscriptSegment, ...]]
+
+ProgressCallback = Callable[[str, Chunk], None]
+
+
+def _no_progress(stage: str, chunk: Chunk) -> None:
+    pass
+
+
+class _Timed:
+    """Call ``fn`` and also return the wall and CPU seconds it took, where it ran."""
+
+    def __init__(self, fn: Callable[[Any], Any]) -> None:
+        self.fn = fn
+
+    def __call__(self, item: Any) -> tuple[Any, float, float]:
+        wall, cpu = time.perf_counter(), time.thread_time()
+        result = self.fn(item)
+        return result, time.perf_counter() - wall, time.thread_time() - cpu
+
+
+def _timed_chunks(chunks: Iterable[Chunk], profiler: Profiler | None, scope: str) -> Iterator[Chunk]:
+    """Attribute the time spent producing each chunk to the chunking stage."""
+    iterator = iter(chunks)
+    try:
+        while True:
+            with stage_timer(profiler, scope, "chunking") as call:
+                chunk = next(iterator, None)
+                if chunk is None:
+                    call.items = 0
+            if chunk is None:
+                return
+            yield chunk
+    finally:
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            close()
+
+
+class IngestPipeline:
+    """Chunk → Audio-to-Text → coarse → fine embedding, overlapped across chunks.
+
+    ``transcriber`` may be ``None`` for footage whose audio is not needed;
+    ``embed`` maps a chunk to its :class:`CoarseSegment` and ``fine_embed``
+    to its :class:`FineSegment` list (``None`` skips fine-grained analysis).
+    With a ``cache``, :meth:`ingest` reuses chunk boundaries, transcripts and
+    embeddings from earlier runs on the same content and configuration,
+    recomputing only the stages whose configuration changed. When every
+    stage is cached the video is not decoded at all, and the yielded chunks
+    carry boundaries only (no frames or audio). With a ``profiler`` every
+    stage's time per chunk is recorded under the ``scope`` passed to
+    :meth:`run` or :meth:`ingest`.
+
+    With a ``coarse_pool`` (such as a
+    :class:`~concurrent.futures.ProcessPoolExecutor` owned by the caller),
+    ``embed`` runs on the pool through
+    :meth:`~video_agent.analysis.parallel.ParallelAnalyzer.map_on`: results
+    stay in chunk order and at most ``coarse_in_flight`` chunks (default two
+    per CPU core) are submitted ahead of the fine stage. ``embed`` and the
+    chunks must then be picklable, and ``embed`` must not carry state from
+    one chunk to the next: embedders marked ``sequential`` (such as
+    :class:`~video_agent.analysis.lecture.SlideAnalyzer`) are rejected.
+    """
+
+    def __init__(
+        self,
+        *,
+        transcriber: Transcriber | None = None,
+        embed: Callable[[Chunk], CoarseSegment] = describe_chunk,
+        fine_embed: Callable[[Chunk], list[FineSegment]] | None = describe_frames,
+        queue_size: int = 2,
+        cache: DiskCache | None = None,
+        profiler: Profiler | None = None,
+        coarse_pool: Executor | None = None,
+        coarse_in_flight: int | None = None,
+    ) -> None:
+        if coarse_in_flight is not None and coarse_in_flight < 1:
+            raise ValueError("coarse_in_flight must be >= 1")
+        if coarse_pool is not None and getattr(embed, "sequential", False):
+            raise ValueError("a sequential embed cannot run on coarse_pool; run it in-process")
+        self.transcriber = transcriber
+        self.embed = embed
+        self.fine_embed = fine_embed
+        self.queue_size = queue_size
+        self.cache = cache
+        self.profiler = profiler
+        self.coarse_pool = coarse_pool
+        self.coarse_in_flight = coarse_in_flight
+
+    def run(
+        self,
+        chunks: Iterable[Chunk],
+        *,
+        transcripts: Sequence[tuple[TranscriptSegment, ...]] | None = None,
+        coarse: Sequence[CoarseSegment] | None = None,
+        fine: Sequence[tuple[FineSegment, ...]] | None = None,
+        progress: ProgressCallback | None = None,
+        scope: str = "ingest",
+    ) -> Iterator[IngestedChunk]:
+        """Process already-cut chunks; the iterable is consumed on its own thread.
+
+        ``transcripts``, ``coarse`` and ``fine`` are previously computed
+        per-chunk results, indexed by chunk index, that replace running
+        that stage. ``progress(stage, chunk)`` is called from the stage's
+        thread whenever ``"chunking"``, ``"asr"``, ``"coarse"`` or
+        ``"fine"`` finishes a chunk.
+        """
+        report = progress or _no_progress
+        profiler = self.profiler
+
+        def transcribe(chunk: Chunk) -> _Transcribed:
+            report("chunking", chunk)
+            with stage_timer(profiler, scope, "asr"):
+                if transcripts is not None:
+                    transcript = transcripts[chunk.index]
+                elif self.transcriber is None or chunk.audio is None:
+                    transcript = ()
+                else:
+                    transcript = tuple(self.transcriber.transcribe(chunk.audio))
+            report("asr", chunk)
+            return chunk, transcript
+
+        def embed(item: _Transcribed) -> IngestedChunk:
+            chunk, transcript = item
+            with stage_timer(profiler, scope, "coarse"):
+                segment = coarse[chunk.index] if coarse is not None else self.embed(chunk)
+            report("coarse", chunk)
+            return IngestedChunk(chunk, transcript, segment)
+
+        def embed_fine(item: IngestedChunk) -> IngestedChunk:
+            with stage_timer(profiler, scope, "fine"):
+                if fine is not None:
+                    item = replace(item, fine=fine[item.chunk.index])
+                elif self.fine_embed is not None:
+                    item = replace(item, fine=tuple(self.fine_embed(item.chunk)))
+            report("fine", item.chunk)
+            return item
+
+        def embed_on_pool(items: Iterable[_Transcribed]) -> Iterator[IngestedChunk]:
+            pending: deque[_Transcribed] = deque()
+
+            def submitted() -> Iterator[Chunk]:
+                for chunk, transcript in items:
+                    pending.append((chunk, transcript))
+                    yield chunk
+
+            analyzer = ParallelAnalyzer(_Timed(self.embed), max_in_flight=self.coarse_in_flight)
+            results = analyzer.map_on(self.coarse_pool, submitted())
+            try:
+                for segment, wall_s, cpu_s in results:
+                    chunk, transcript = pending.popleft()
+                    if profiler is not None:
+                        profiler.record(scope, "coarse", wall_s=wall_s, cpu_s=cpu_s)
+                    report("coarse", chunk)
+                    yield IngestedChunk(chunk, transcript, segment)
+            finally:
+                results.close()
+
+        if profiler is not None:
+            chunks = _timed_chunks(chunks, profiler, scope)
+        if self.coarse_pool is None or coarse is not None:
+            return run_stages(chunks, [transcribe, embed, embed_fine], queue_size=self.queue_size)
+        transcribed = run_stages(chunks, [transcribe], queue_size=self.queue_size)
+        return run_stages(embed_on_pool(transcribed), [embed_fine], queue_size=self.queue_size)
+
+    def cache_keys(self, digest: str, chunk_options: dict[str, Any]) -> dict[str, str]:
+        """Cache keys of each stage for a video with content hash ``digest``."""
+        chunking = cache_key(digest, "chunking", chunk_options)
+        return {
+            "chunking": chunking,
+            "asr": cache_key(chunking, "asr", self.transcriber),
+            "coarse": cache_key(chunking, "coarse", self.embed),
+            "fine": cache_key(chunking, "fine", self.fine_embed),
+        }
+
+    def ingest(
+        self,
+        path: str | Path,
+        *,
+        progress: ProgressCallback | None = None,
+        scope: str = "ingest",
+        **chunk_options: Any,
+    ) -> Iterator[IngestedChunk]:
+        """Decode, cut and process ``path``; ``chunk_options`` go to :func:`iter_chunks`.
+
+        ``progress`` and ``scope`` are as in :meth:`run`.
+        """
+        if self.cache is None:
+            return self.run(iter_chunks(path, **chunk_options), progress=progress, scope=scope)
+        return self._ingest_cached(path, chunk_options, progress or _no_progress, scope)
+
+    def _ingest_cached(
+        self,
+        path: str | Path,
+        chunk_options: dict[str, Any],
+        progress: ProgressCallback,
+        scope: str,
+    ) -> Iterator[IngestedChunk]:
+        cache = self.cache
+        digest = file_digest(path)
+        keys = self.cache_keys(digest, chunk_options)
+        bounds = cache.get(keys["chunking"])
+        cached = {stage: None if bounds is None else cache.get(keys[stage]) for stage in _STAGES}
+        if bounds is not None and all(value is not None for value in cached.values()):
+            results = zip(bounds, cached["asr"], cached["coarse"], cached["fine"])
+            for bound, transcript, coarse, fine in results:
+                index, start_ms, end_ms, active, segment = bound
+                chunk = Chunk(index, start_ms, end_ms, (), None, active, segment)
+                for stage in ("chunking", *_STAGES):
+                    progress(stage, chunk)
+                yield IngestedChunk(chunk, transcript, coarse, fine)
+            return
+
+        computed: dict[str, list[Any]] = {stage: [] for stage in ("chunking", *_STAGES)}
+        items = self.run(
+            iter_chunks(path, digest=digest, **chunk_options),
+            transcripts=cached["asr"],
+            coarse=cached["coarse"],
+            fine=cached["fine"],
+            progress=progress,
+            scope=scope,
+        )
+        for item in items:
+            chunk = item.chunk
+            computed["chunking"].append(
+                (chunk.index, chunk.start_ms, chunk.end_ms, chunk.active, chunk.segment)
+            )
+            computed["asr"].append(item.transcript)
+            computed["coarse"].append(item.coarse)
+            computed["fine"].append(item.fine)
+            yield item
+        if bounds is None:
+            cache.put(keys["chunking"], computed["chunking"])
+        for stage in _STAGES:
+            if cached[stage] is None:
+                cache.put(keys[stage], computed[stage])
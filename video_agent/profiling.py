@@ -0,0 +1,195 @@
+"""Per-stage profiling of ingest and queries.
+
+A :class:`Profiler` accumulates, for every ``(scope, stage)`` pair, the
+number of calls and items, wall time, CPU time and peak memory. Scopes name
+what the work was for, e.g. ``"video:<id>"`` for an ingest or
+``"query:<n>"`` for one agent query; stages are the pipeline stages
+(``chunking``, ``asr``, ``coarse``, ``fine``) and the agent's graph nodes.
+Per-scope statistics export as JSON. The Prometheus export instead carries
+running totals per stage and scope kind (the scope up to its first ``:``,
+e.g. ``query``), which keeps the number of series bounded and the counters
+monotonic when old scopes are dropped.
+
+CPU time is that of the calling thread, which is exact for the ingest
+stages since each runs on its own thread; a stage whose work runs on other
+threads reports their CPU time itself (see :meth:`Profiler.stage`). Peak memory is only measured
+with ``trace_memory=True`` (tracemalloc slows allocation-heavy code); it is
+the peak of traced allocations above the level at the start of the call,
+which is approximate while stages run concurrently since they share the
+tracer.
+"""
+
+from __future__ import annotations
+
+import json
+import resource
+import threading
+import time
+import tracemalloc
+from collections import OrderedDict
+from contextlib import contextmanager, nullcontext
+from dataclasses import asdict, dataclass
+from typing import ContextManager, Iterator
+
+
+@dataclass
+class StageStats:
+    calls: int = 0
+    items: int = 0
+    wall_s: float = 0.0
+    cpu_s: float = 0.0
+    peak_bytes: int = 0
+
+    @property
+    def items_per_s(self) -> float:
+        return self.items / self.wall_s if self.wall_s > 0 else 0.0
+
+
+@dataclass
+class _Call:
+    items: int
+    cpu_s: float | None = None
+
+
+def _kind(scope: str) -> str:
+    return scope.split(":", 1)[0]
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+_METRICS = (
+    ("calls_total", "counter", "Stage invocations.", lambda s: s.calls),
+    ("items_total", "counter", "Items processed by the stage.", lambda s: s.items),
+    ("wall_seconds_total", "counter", "Wall time spent in the stage.", lambda s: s.wall_s),
+    ("cpu_seconds_total", "counter", "CPU time spent in the stage.", lambda s: s.cpu_s),
+    ("peak_bytes", "gauge", "Peak traced memory of one stage call.", lambda s: s.peak_bytes),
+    ("items_per_second", "gauge", "Stage throughput over its wall time.", lambda s: s.items_per_s),
+)
+
+
+class Profiler:
+    """Thread-safe registry of stage statistics.
+
+    Only the ``max_scopes`` most recently used scopes are kept, so per-query
+    scopes do not grow without bound; totals per scope kind are kept for
+    good.
+    """
+
+    def __init__(self, *, trace_memory: bool = False, max_scopes: int = 1000) -> None:
+        if max_scopes < 1:
+            raise ValueError("max_scopes must be >= 1")
+        self.trace_memory = trace_memory
+        self.max_scopes = max_scopes
+        self._scopes: OrderedDict[str, dict[str, StageStats]] = OrderedDict()
+        self._totals: dict[tuple[str, str], StageStats] = {}
+        self._queries = 0
+        self._lock = threading.Lock()
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def query_scope(self) -> str:
+        """A fresh ``"query:<n>"`` scope name."""
+        with self._lock:
+            self._queries += 1
+            return f"query:{self._queries}"
+
+    @contextmanager
+    def stage(self, scope: str, stage: str, items: int = 1) -> Iterator[_Call]:
+        """Time the body as one call of ``stage`` processing ``items`` items.
+
+        The body may correct the item count through the yielded object's
+        ``items`` attribute, and set its ``cpu_s`` when the work ran on
+        other threads (the calling thread's CPU time is then ignored).
+        """
+        call = _Call(items)
+        tracing = self.trace_memory and tracemalloc.is_tracing()
+        if tracing:
+            baseline = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        wall, cpu = time.perf_counter(), time.thread_time()
+        try:
+            yield call
+        finally:
+            wall_s, cpu_s = time.perf_counter() - wall, time.thread_time() - cpu
+            if call.cpu_s is not None:
+                cpu_s = call.cpu_s
+            peak = max(tracemalloc.get_traced_memory()[1] - baseline, 0) if tracing else 0
+            self.record(scope, stage, items=call.items, wall_s=wall_s, cpu_s=cpu_s, peak_bytes=peak)
+
+    def record(
+        self,
+        scope: str,
+        stage: str,
+        *,
+        items: int = 1,
+        wall_s: float = 0.0,
+        cpu_s: float = 0.0,
+        peak_bytes: int = 0,
+    ) -> None:
+        with self._lock:
+            stages = self._scopes.get(scope)
+            if stages is None:
+                stages = self._scopes[scope] = {}
+                while len(self._scopes) > self.max_scopes:
+                    self._scopes.popitem(last=False)
+            else:
+                self._scopes.move_to_end(scope)
+            total = self._totals.setdefault((_kind(scope), stage), StageStats())
+            for stats in (stages.setdefault(stage, StageStats()), total):
+                stats.calls += 1
+                stats.items += items
+                stats.wall_s += wall_s
+                stats.cpu_s += cpu_s
+                stats.peak_bytes = max(stats.peak_bytes, peak_bytes)
+
+    def stats(self) -> dict[str, dict[str, StageStats]]:
+        """A snapshot: scope -> stage -> statistics."""
+        with self._lock:
+            return {
+                scope: {stage: StageStats(**asdict(stats)) for stage, stats in stages.items()}
+                for scope, stages in self._scopes.items()
+            }
+
+    def totals(self) -> dict[tuple[str, str], StageStats]:
+        """A snapshot of the running totals: (scope kind, stage) -> statistics."""
+        with self._lock:
+            return {key: StageStats(**asdict(stats)) for key, stats in self._totals.items()}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._scopes.clear()
+            self._totals.clear()
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                scope: {stage: {**asdict(stats), "items_per_s": stats.items_per_s} for stage, stats in stages.items()}
+                for scope, stages in self.stats().items()
+            },
+            indent=2,
+        )
+
+    def to_prometheus(self, prefix: str = "video_agent_stage") -> str:
+        """Prometheus text exposition of the running totals, labelled by scope kind and stage."""
+        totals = self.totals()
+        lines = []
+        for name, metric_type, help_text, value in _METRICS:
+            metric = f"{prefix}_{name}"
+            lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} {metric_type}"]
+            for (kind, stage), stats in totals.items():
+                lines.append(f'{metric}{{kind="{_label(kind)}",stage="{_label(stage)}"}} {value(stats)}')
+        # ru_maxrss is in KiB on Linux.
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+        lines += [
+            "# HELP video_agent_process_max_rss_bytes Peak resident set size of the process.",
+            "# TYPE video_agent_process_max_rss_bytes gauge",
+            f"video_agent_process_max_rss_bytes {max_rss}",
+        ]
+        return "\n".join(lines) + "\n"
+
+
+def stage_timer(profiler: Profiler | None, scope: str, stage: str, items: int = 1) -> ContextManager[_Call]:
+    """``profiler.stage(...)``, or a no-op without a profiler."""
+    return nullcontext(_Call(items)) if profiler is None else profiler.stage(scope, stage, items)
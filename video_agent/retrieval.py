@@ -0,0 +1,166 @@
+"""Hierarchical coarse-to-fine retrieval.
+
+A query first searches the coarse-grained store, which has one record per
+chunk. The fine-grained store, which has one record per frame or sentence
+and is orders of magnitude larger, is then searched only within the time
+ranges of the top coarse segments. If the coarse stage is not confident
+(its best score, or the best pruned fine score, is below a threshold) the
+fine store is searched globally instead, so pruning cannot hide a good
+match that the coarse embedding missed.
+
+:class:`HybridRetriever` combines the coarse store with a BM25 index of the
+transcripts using reciprocal rank fusion, so queries naming an exact term
+are found even when the embedding does not capture it.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Protocol
+
+import numpy as np
+
+from video_agent.stores.lexical import BM25Index, LexicalHit
+from video_agent.stores.memory import SearchHit, VectorStore
+
+
+class CoarseIndex(Protocol):
+    def search(self, query: np.ndarray, k: int = 10, *, video_id: str | None = None) -> list[SearchHit]: ...
+
+
+@dataclass(frozen=True)
+class RetrievalResult:
+    """Coarse segments that scoped the search and the fine-grained hits.
+
+    ``pruned`` is false when the search fell back to the whole fine store.
+    """
+
+    coarse: list[SearchHit]
+    fine: list[SearchHit]
+    pruned: bool
+
+
+class HierarchicalRetriever:
+    """Search ``fine_store`` within the spans of the best ``coarse_k`` coarse hits."""
+
+    def __init__(
+        self,
+        coarse_store: CoarseIndex,
+        fine_store: VectorStore,
+        *,
+        coarse_k: int = 5,
+        min_coarse_score: float = 0.2,
+        min_fine_score: float = 0.2,
+    ) -> None:
+        if coarse_k < 1:
+            raise ValueError("coarse_k must be >= 1")
+        self.coarse_store = coarse_store
+        self.fine_store = fine_store
+        self.coarse_k = coarse_k
+        self.min_coarse_score = min_coarse_score
+        self.min_fine_score = min_fine_score
+
+    def search(
+        self,
+        coarse_query: np.ndarray,
+        fine_query: np.ndarray | None = None,
+        k: int = 10,
+        *,
+        video_id: str | None = None,
+    ) -> RetrievalResult:
+        """Retrieve the ``k`` best fine-grained records.
+
+        ``fine_query`` is the query embedded for the fine store; it defaults
+        to ``coarse_query`` when both stores share an embedding space.
+        """
+        if fine_query is None:
+            fine_query = coarse_query
+        coarse = self.coarse_store.search(coarse_query, self.coarse_k, video_id=video_id)
+        if coarse and coarse[0].score >= self.min_coarse_score:
+            rows = [
+                self.fine_store.rows_overlapping(hit.record.video_id, hit.record.start_ms, hit.record.end_ms)
+                for hit in coarse
+            ]
+            fine = self.fine_store.search_rows(fine_query, np.unique(np.concatenate(rows)), k)
+            if fine and fine[0].score >= self.min_fine_score:
+                return RetrievalResult(coarse, fine, pruned=True)
+        fine = self.fine_store.search(fine_query, k, video_id=video_id)
+        return RetrievalResult(coarse, fine, pruned=False)
+
+
+@dataclass(frozen=True)
+class FusedHit:
+    """A span ranked by reciprocal rank fusion.
+
+    ``lexical`` and ``vector`` are the hits from each ranking, or None if
+    the span was not retrieved by that side.
+    """
+
+    video_id: str
+    start_ms: int
+    end_ms: int
+    score: float
+    lexical: LexicalHit | None
+    vector: SearchHit | None
+
+
+def reciprocal_rank_fusion(
+    lexical: list[LexicalHit],
+    vector: list[SearchHit],
+    k: int = 10,
+    *,
+    rank_constant: int = 60,
+) -> list[FusedHit]:
+    """Fuse two best-first rankings of spans, keyed on ``(video_id, start_ms, end_ms)``."""
+    scores: dict[tuple[str, int, int], float] = {}
+    lexical_hits: dict[tuple[str, int, int], LexicalHit] = {}
+    vector_hits: dict[tuple[str, int, int], SearchHit] = {}
+    for rank, hit in enumerate(lexical, start=1):
+        key = (hit.video_id, hit.start_ms, hit.end_ms)
+        scores[key] = scores.get(key, 0.0) + 1.0 / (rank_constant + rank)
+        lexical_hits[key] = hit
+    for rank, hit in enumerate(vector, start=1):
+        key = (hit.record.video_id, hit.record.start_ms, hit.record.end_ms)
+        scores[key] = scores.get(key, 0.0) + 1.0 / (rank_constant + rank)
+        vector_hits[key] = hit
+    ranked = sorted(scores.items(), key=lambda item: -item[1])[:k]
+    return [FusedHit(*key, score, lexical_hits.get(key), vector_hits.get(key)) for key, score in ranked]
+
+
+class HybridRetriever:
+    """Fuse BM25 transcript hits with coarse vector hits.
+
+    Each side contributes ``1 / (rank_constant + rank)`` for every span it
+    ranks in its top ``depth``; spans are matched on ``(video_id, start_ms,
+    end_ms)``, which is how chunk transcripts and coarse records line up.
+    A query without an embedding is answered from the posting lists alone.
+    """
+
+    def __init__(
+        self,
+        lexical_index: BM25Index,
+        coarse_store: CoarseIndex,
+        *,
+        depth: int = 50,
+        rank_constant: int = 60,
+    ) -> None:
+        if depth < 1:
+            raise ValueError("depth must be >= 1")
+        self.lexical_index = lexical_index
+        self.coarse_store = coarse_store
+        self.depth = depth
+        self.rank_constant = rank_constant
+
+    def search(
+        self,
+        text: str,
+        query: np.ndarray | None = None,
+        k: int = 10,
+        *,
+        video_id: str | None = None,
+    ) -> list[FusedHit]:
+        """The ``k`` best spans for the query ``text`` and its embedding ``query``."""
+        depth = max(self.depth, k)
+        lexical = self.lexical_index.search(text, depth, video_id=video_id)
+        vector = [] if query is None else self.coarse_store.search(query, depth, video_id=video_id)
+        return reciprocal_rank_fusion(lexical, vector, k, rank_constant=self.rank_constant)
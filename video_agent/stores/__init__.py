@@ -0,0 +1,26 @@
+"""Coarse- and fine-grained vector stores."""
+
+from video_agent.stores.interval import IntervalIndex, TemporalIndex
+from video_agent.stores.ivf import IVFIndex
+from video_agent.stores.lexical import BM25Index, LexicalHit
+from video_agent.stores.memory import SearchHit, VectorRecord, VectorStore
+from video_agent.stores.mmap import MmapVectorStore
+from video_agent.stores.quantization import ProductQuantizer, Quantizer, ScalarQuantizer, load_quantizer
+from video_agent.stores.transcripts import TranscriptStore
+
+__all__ = [
+    "BM25Index",
+    "IVFIndex",
+    "IntervalIndex",
+    "LexicalHit",
+    "MmapVectorStore",
+    "ProductQuantizer",
+    "Quantizer",
+    "ScalarQuantizer",
+    "SearchHit",
+    "TemporalIndex",
+    "TranscriptStore",
+    "VectorRecord",
+    "VectorStore",
+    "load_quantizer",
+]
@@ -0,0 +1,125 @@
+"""Sorted-array interval index for timestamp-range queries.
+
+Intervals are bucketed by length class (lengths in ``[2**c, 2**(c + 1))``)
+and each bucket is kept sorted by start time. Every interval of a bucket
+overlapping ``[start, end)`` starts in ``(start - 2**(c + 1), end)``, a
+contiguous slice found with two binary searches, and at most a few
+intervals of that length fit in the window without overlapping the query.
+Range lookups therefore cost O(log n + k) per length class, however the
+lengths are mixed: a multi-hour idle chunk only widens the window of its
+own bucket. Ingest appends in time order, which keeps the arrays sorted
+without re-sorting.
+"""
+
+from __future__ import annotations
+
+from typing import Generic, Hashable, Iterable, TypeVar
+
+import numpy as np
+
+K = TypeVar("K", bound=Hashable)
+
+
+class _SortedIntervals:
+    """Intervals sorted by start, with the longest length among them."""
+
+    def __init__(self) -> None:
+        self.starts = np.zeros(0, dtype=np.int64)
+        self.ends = np.zeros(0, dtype=np.int64)
+        self.ids = np.zeros(0, dtype=np.int64)
+        self.count = 0
+        self.sorted = True
+        self.max_length = 0
+
+    def add(self, starts: np.ndarray, ends: np.ndarray, ids: np.ndarray) -> None:
+        count = self.count + len(starts)
+        if count > len(self.starts):
+            capacity = max(count, 2 * len(self.starts), 64)
+            for name in ("starts", "ends", "ids"):
+                grown = np.zeros(capacity, dtype=np.int64)
+                grown[: self.count] = getattr(self, name)[: self.count]
+                setattr(self, name, grown)
+        if self.sorted:
+            previous = self.starts[self.count - 1] if self.count else starts[0]
+            self.sorted = previous <= starts[0] and bool(np.all(np.diff(starts) >= 0))
+        self.starts[self.count : count] = starts
+        self.ends[self.count : count] = ends
+        self.ids[self.count : count] = ids
+        self.count = count
+        self.max_length = max(self.max_length, int((ends - starts).max()))
+
+    def _sort(self) -> None:
+        order = np.argsort(self.starts[: self.count], kind="stable")
+        for name in ("starts", "ends", "ids"):
+            array = getattr(self, name)
+            array[: self.count] = array[: self.count][order]
+        self.sorted = True
+
+    def overlapping(self, start_ms: int, end_ms: int) -> tuple[np.ndarray, np.ndarray]:
+        """``(starts, ids)`` of the intervals overlapping ``[start_ms, end_ms)``, by start."""
+        if not self.sorted:
+            self._sort()
+        starts = self.starts[: self.count]
+        lo = np.searchsorted(starts, start_ms - self.max_length, side="right")
+        hi = np.searchsorted(starts, end_ms, side="left")
+        hit = self.ends[lo:hi] > start_ms
+        return starts[lo:hi][hit], self.ids[lo:hi][hit]
+
+
+class IntervalIndex:
+    """Half-open ``[start_ms, end_ms)`` intervals, each labelled with an integer id."""
+
+    def __init__(self) -> None:
+        self._buckets: dict[int, _SortedIntervals] = {}
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def add(self, starts: Iterable[int], ends: Iterable[int], ids: Iterable[int]) -> None:
+        starts = np.fromiter(starts, dtype=np.int64)
+        ends = np.fromiter(ends, dtype=np.int64)
+        ids = np.fromiter(ids, dtype=np.int64)
+        if not len(starts) == len(ends) == len(ids):
+            raise ValueError("starts, ends and ids must have the same length")
+        if len(starts) == 0:
+            return
+        classes = np.frexp(np.maximum(ends - starts, 1).astype(np.float64))[1]
+        for length_class in np.unique(classes):
+            mine = classes == length_class
+            bucket = self._buckets.setdefault(int(length_class), _SortedIntervals())
+            bucket.add(starts[mine], ends[mine], ids[mine])
+        self._count += len(starts)
+
+    def overlapping(self, start_ms: int, end_ms: int) -> np.ndarray:
+        """Ids of intervals overlapping ``[start_ms, end_ms)``, ordered by start."""
+        found = [bucket.overlapping(start_ms, end_ms) for bucket in self._buckets.values()]
+        found = [(starts, ids) for starts, ids in found if len(ids)]
+        if not found:
+            return np.zeros(0, dtype=np.int64)
+        if len(found) == 1:
+            return found[0][1]
+        starts = np.concatenate([starts for starts, _ in found])
+        ids = np.concatenate([ids for _, ids in found])
+        return ids[np.argsort(starts, kind="stable")]
+
+    def at(self, time_ms: int) -> np.ndarray:
+        """Ids of intervals containing ``time_ms``."""
+        return self.overlapping(time_ms, time_ms + 1)
+
+
+class TemporalIndex(Generic[K]):
+    """One :class:`IntervalIndex` per key, typically per video id."""
+
+    def __init__(self) -> None:
+        self._indexes: dict[K, IntervalIndex] = {}
+
+    def add(self, key: K, starts: Iterable[int], ends: Iterable[int], ids: Iterable[int]) -> None:
+        self._indexes.setdefault(key, IntervalIndex()).add(starts, ends, ids)
+
+    def overlapping(self, key: K, start_ms: int, end_ms: int) -> np.ndarray:
+        index = self._indexes.get(key)
+        return np.zeros(0, dtype=np.int64) if index is None else index.overlapping(start_ms, end_ms)
+
+    def remove(self, key: K) -> None:
+        self._indexes.pop(key, None)
@@ -0,0 +1,112 @@
+"""Inverted-file (IVF) approximate nearest-neighbour index.
+
+Vectors are partitioned by spherical k-means into ``nlist`` cells; a query
+is scored exactly against the vectors of its ``nprobe`` closest cells only.
+Raising ``nprobe`` trades latency for recall, and ``nprobe == nlist`` is
+exact search. The index stores row numbers, not vectors, so it sits on top
+of whatever matrix the owning store keeps.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+_BLOCK_ROWS = 1 << 15
+
+
+def _assign(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    out = np.empty(len(vectors), dtype=np.int32)
+    for start in range(0, len(vectors), _BLOCK_ROWS):
+        block = vectors[start : start + _BLOCK_ROWS]
+        out[start : start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+    return out
+
+
+class IVFIndex:
+    """IVF index over unit-normalised vectors (inner product = cosine).
+
+    The index trains itself on the first ``train_rows`` vectors added
+    (default ``40 * nlist``); until then :meth:`candidates` returns
+    ``None`` and callers should search exactly. Searches may run while
+    one writer adds rows (the owning store serialises writers).
+    """
+
+    def __init__(
+        self,
+        *,
+        nlist: int = 256,
+        nprobe: int = 8,
+        train_rows: int | None = None,
+        iterations: int = 10,
+        seed: int = 0,
+    ) -> None:
+        if nlist < 1 or not 1 <= nprobe <= nlist:
+            raise ValueError("need nlist >= 1 and 1 <= nprobe <= nlist")
+        if train_rows is not None and train_rows < nlist:
+            raise ValueError("train_rows must be >= nlist, one vector per cell")
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.train_rows = train_rows if train_rows is not None else 40 * nlist
+        self.iterations = iterations
+        self.seed = seed
+        self.centroids: np.ndarray | None = None
+        # Per cell, a row buffer and how much of it is in use. Writers fill
+        # the buffer past that count and then publish a new pair, so
+        # searches never see a partly written list and never write.
+        self._cells: list[tuple[np.ndarray, int]] = [(np.zeros(0, dtype=np.int64), 0)] * nlist
+
+    @property
+    def trained(self) -> bool:
+        return self.centroids is not None
+
+    def train(self, vectors: np.ndarray) -> None:
+        """Fit the cell centroids with spherical k-means on ``vectors``."""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if len(vectors) < self.nlist:
+            raise ValueError(f"need at least nlist={self.nlist} training vectors")
+        rng = np.random.default_rng(self.seed)
+        if len(vectors) > self.train_rows:
+            vectors = vectors[rng.choice(len(vectors), self.train_rows, replace=False)]
+        centroids = vectors[rng.choice(len(vectors), self.nlist, replace=False)].copy()
+        for _ in range(self.iterations):
+            assign = _assign(vectors, centroids)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assign, vectors)
+            counts = np.bincount(assign, minlength=self.nlist)
+            empty = counts == 0
+            sums[empty] = vectors[rng.choice(len(vectors), int(empty.sum()))]
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            centroids = sums / np.where(norms > 0, norms, 1.0)
+        self.centroids = centroids.astype(np.float32)
+
+    def add(self, vectors: np.ndarray, first_row: int) -> None:
+        """Assign rows ``first_row .. first_row + len(vectors) - 1`` to cells."""
+        if self.centroids is None:
+            raise RuntimeError("IVFIndex must be trained before adding vectors")
+        if len(vectors) == 0:
+            return
+        assign = _assign(np.asarray(vectors, dtype=np.float32), self.centroids)
+        order = np.argsort(assign, kind="stable")
+        cells, starts = np.unique(assign[order], return_index=True)
+        rows = order.astype(np.int64) + first_row
+        for cell, part in zip(cells, np.split(rows, starts[1:])):
+            buffer, used = self._cells[cell]
+            if used + len(part) > len(buffer):
+                grown = np.zeros(max(used + len(part), 2 * len(buffer), 16), dtype=np.int64)
+                grown[:used] = buffer[:used]
+                buffer = grown
+            buffer[used : used + len(part)] = part
+            self._cells[cell] = (buffer, used + len(part))
+
+    def _list(self, cell: int) -> np.ndarray:
+        buffer, used = self._cells[cell]
+        return buffer[:used]
+
+    def candidates(self, query: np.ndarray, nprobe: int | None = None) -> np.ndarray | None:
+        """Rows in the ``nprobe`` cells closest to ``query``, or ``None`` if untrained."""
+        if self.centroids is None:
+            return None
+        nprobe = min(nprobe or self.nprobe, self.nlist)
+        similarity = self.centroids @ np.asarray(query, dtype=np.float32)
+        cells = np.argpartition(-similarity, nprobe - 1)[:nprobe]
+        return np.concatenate([self._list(int(cell)) for cell in cells])
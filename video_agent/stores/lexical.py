@@ -0,0 +1,120 @@
+"""BM25 inverted index over transcripts.
+
+Each document is the transcript of one video span (normally one chunk, so
+documents line up with coarse-grained records). Postings are kept as
+per-term arrays of document ids and term frequencies, so scoring a query
+touches only the postings of its terms, which makes exact-term lookups
+(names, technical terms) far cheaper than a vector scan.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass
+
+import numpy as np
+
+# CJK ideographs are indexed one character at a time, other scripts by word.
+_TOKEN = re.compile(r"[㐀-鿿]|[^\W_㐀-鿿]+")
+
+
+def tokenize(text: str) -> list[str]:
+    return _TOKEN.findall(text.lower())
+
+
+@dataclass(frozen=True)
+class LexicalHit:
+    video_id: str
+    start_ms: int
+    end_ms: int
+    score: float
+
+
+class _Postings:
+    __slots__ = ("docs", "freqs", "count")
+
+    def __init__(self) -> None:
+        self.docs = np.zeros(4, dtype=np.int64)
+        self.freqs = np.zeros(4, dtype=np.float32)
+        self.count = 0
+
+    def append(self, doc: int, freq: int) -> None:
+        if self.count == len(self.docs):
+            self.docs = np.resize(self.docs, 2 * self.count)
+            self.freqs = np.resize(self.freqs, 2 * self.count)
+        self.docs[self.count] = doc
+        self.freqs[self.count] = freq
+        self.count += 1
+
+
+class BM25Index:
+    """Append-only Okapi BM25 index of transcript spans; writers are serialised by a lock."""
+
+    def __init__(self, *, k1: float = 1.2, b: float = 0.75) -> None:
+        self.k1 = k1
+        self.b = b
+        self._postings: dict[str, _Postings] = {}
+        self._spans: list[tuple[str, int, int]] = []
+        self._lengths = np.zeros(0, dtype=np.float32)
+        self._live = np.zeros(0, dtype=bool)
+        self._total_length = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return int(self._live[: len(self._spans)].sum())
+
+    def add(self, video_id: str, start_ms: int, end_ms: int, text: str) -> None:
+        """Index the transcript ``text`` of ``[start_ms, end_ms)`` of ``video_id``."""
+        tokens = tokenize(text)
+        with self._lock:
+            doc = len(self._spans)
+            if doc == len(self._lengths):
+                self._lengths = np.resize(self._lengths, max(64, 2 * doc))
+                self._live = np.resize(self._live, max(64, 2 * doc))
+            self._lengths[doc] = len(tokens)
+            self._live[doc] = True
+            self._total_length += len(tokens)
+            for term, freq in Counter(tokens).items():
+                self._postings.setdefault(term, _Postings()).append(doc, freq)
+            self._spans.append((video_id, start_ms, end_ms))  # last: searches see complete documents
+
+    def remove_video(self, video_id: str) -> None:
+        with self._lock:
+            for doc, (owner, _, _) in enumerate(self._spans):
+                if owner == video_id and self._live[doc]:
+                    self._live[doc] = False
+                    self._total_length -= int(self._lengths[doc])
+
+    def search(self, query: str, k: int = 10, *, video_id: str | None = None) -> list[LexicalHit]:
+        """The ``k`` best-scoring spans for ``query``, best first."""
+        docs_total = len(self)
+        if docs_total == 0:
+            return []
+        avg_length = max(self._total_length / docs_total, 1e-9)
+        touched = []
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            docs = postings.docs[: postings.count]
+            live = self._live[docs]
+            docs, freqs = docs[live], postings.freqs[: postings.count][live]
+            if len(docs) == 0:
+                continue
+            idf = math.log(1.0 + (docs_total - len(docs) + 0.5) / (len(docs) + 0.5))
+            norm = self.k1 * (1.0 - self.b + self.b * self._lengths[docs] / avg_length)
+            touched.append((docs, idf * freqs * (self.k1 + 1.0) / (freqs + norm)))
+        if not touched:
+            return []
+        docs = np.concatenate([d for d, _ in touched])
+        partial = np.concatenate([s for _, s in touched])
+        unique, inverse = np.unique(docs, return_inverse=True)
+        accumulated = np.bincount(inverse, weights=partial)
+        if video_id is not None:
+            mask = np.array([self._spans[doc][0] == video_id for doc in unique], dtype=bool)
+            unique, accumulated = unique[mask], accumulated[mask]
+        order = np.argsort(-accumulated, kind="stable")[:k]
+        return [LexicalHit(*self._spans[int(unique[i])], float(accumulated[i])) for i in order]
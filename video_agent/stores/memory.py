@@ -0,0 +1,247 @@
+"""In-memory vector store with exact, IVF or quantized cosine search."""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from typing import Iterable
+
+import numpy as np
+
+from video_agent.stores.interval import TemporalIndex
+from video_agent.stores.ivf import IVFIndex
+from video_agent.stores.quantization import Quantizer
+
+
+@dataclass(frozen=True)
+class VectorRecord:
+    """An embedding of the span ``[start_ms, end_ms)`` of a video."""
+
+    video_id: str
+    start_ms: int
+    end_ms: int
+    embedding: np.ndarray
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    record: VectorRecord
+    score: float
+
+
+def _top_k(rows: np.ndarray, scores: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+    k = min(k, len(scores))
+    if k <= 0:
+        return rows[:0], scores[:0]
+    top = np.argpartition(-scores, k - 1)[:k]
+    top = top[np.argsort(-scores[top])]
+    return rows[top], scores[top]
+
+
+def _grow(array: np.ndarray, capacity: int, used: int, fill: int = 0) -> np.ndarray:
+    grown = np.full((capacity, *array.shape[1:]), fill, dtype=array.dtype)
+    grown[:used] = array[:used]
+    return grown
+
+
+class VectorStore:
+    """Append-only store of records, searched by cosine similarity.
+
+    Normalised embeddings are kept in a growing matrix next to per-row
+    metadata arrays. Without an ``index`` every search is exact; with an
+    :class:`IVFIndex` (used for the fine-grained store) global searches only
+    score the probed cells, while searches restricted to one video stay
+    exact over that video's rows.
+
+    With a ``quantizer`` the float matrix is only kept until the quantizer
+    (and index, if any) have trained on the first rows; after that rows are
+    stored as compressed codes, scored with asymmetric distances, and hits
+    carry reconstructed (approximate) embeddings.
+
+    Writers (:meth:`add`, :meth:`remove_video`) are serialised by a lock, so
+    several ingest threads may share a store.
+    """
+
+    def __init__(self, *, index: IVFIndex | None = None, quantizer: Quantizer | None = None) -> None:
+        self.index = index
+        self.quantizer = quantizer
+        self._count = 0
+        self._dim: int | None = None
+        self._matrix: np.ndarray | None = None
+        self._codes: np.ndarray | None = None
+        self._videos = np.zeros(0, dtype=np.int32)  # per-row video code, -1 if removed
+        self._spans = np.zeros((0, 2), dtype=np.int64)  # per-row (start_ms, end_ms)
+        self._video_codes: dict[str, int] = {}
+        self._video_ids: list[str] = []
+        self._temporal: TemporalIndex[int] = TemporalIndex()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self._videos[: self._count] >= 0))
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """Normalised embeddings, one row per record (removed rows included).
+
+        Decoded from the codes once the store is quantized.
+        """
+        if self._codes is not None and self._matrix is None:
+            return self.quantizer.decode(self._codes[: self._count])
+        if self._matrix is None:
+            return np.zeros((0, self._dim or 0), dtype=np.float32)
+        return self._matrix[: self._count]
+
+    def nbytes(self) -> int:
+        """Memory held by embeddings (float matrix and/or codes)."""
+        total = 0 if self._matrix is None else self._matrix[: self._count].nbytes
+        return total + (0 if self._codes is None else self._codes[: self._count].nbytes)
+
+    def add(self, records: Iterable[VectorRecord]) -> None:
+        """Append records; existing records are left untouched."""
+        records = list(records)
+        if not records:
+            return
+        vectors = np.stack([np.asarray(r.embedding, dtype=np.float32) for r in records])
+        with self._lock:
+            self._add(records, vectors)
+
+    def _add(self, records: list[VectorRecord], vectors: np.ndarray) -> None:
+        if self._dim is None:
+            if self.quantizer is not None:
+                self.quantizer.code_size(vectors.shape[1])  # raises if it cannot encode them
+            self._dim = vectors.shape[1]
+            self._matrix = np.zeros((0, self._dim), dtype=np.float32)
+        elif vectors.shape[1] != self._dim:
+            raise ValueError(f"expected {self._dim}-dimensional embeddings, got {vectors.shape[1]}")
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors /= np.where(norms > 0, norms, 1.0)
+        first, count = self._count, self._count + len(records)
+        # Rows past ``_count`` are invisible to readers: stage the new rows
+        # there and encode and train before publishing anything, so a failure
+        # leaves the store as it was.
+        self._reserve(count)
+        for record in records:
+            if record.video_id not in self._video_codes:
+                self._video_codes[record.video_id] = len(self._video_ids)
+                self._video_ids.append(record.video_id)
+        self._videos[first:count] = [self._video_codes[r.video_id] for r in records]
+        self._spans[first:count] = [(r.start_ms, r.end_ms) for r in records]
+        if self._matrix is not None:
+            self._matrix[first:count] = vectors
+        codes = self._codes
+        if codes is not None:
+            codes[first:count] = self.quantizer.encode(vectors)
+        elif self.quantizer is not None and count >= self.quantizer.train_rows:
+            if not self.quantizer.trained:
+                self.quantizer.train(self._matrix[:count])
+            codes = np.zeros((len(self._videos), self.quantizer.code_size(self._dim)), dtype=np.uint8)
+            codes[:count] = self.quantizer.encode(self._matrix[:count])
+        if self.index is not None:
+            if self.index.trained:
+                self.index.add(vectors, first)
+            elif count >= self.index.train_rows:
+                self.index.train(self._matrix[:count])
+                self.index.add(self._matrix[:count], 0)
+
+        videos, spans = self._videos[first:count], self._spans[first:count]
+        for code in np.unique(videos):
+            mine = np.flatnonzero(videos == code)
+            self._temporal.add(int(code), spans[mine, 0], spans[mine, 1], mine + first)
+        self._codes = codes
+        self._count = count
+        if codes is not None and (self.index is None or self.index.trained):
+            self._matrix = None  # the codes are all that search needs from now on
+
+    def _reserve(self, rows: int) -> None:
+        if rows <= len(self._videos):
+            return
+        capacity = max(rows, 2 * len(self._videos), 64)
+        used = self._count
+        self._videos = _grow(self._videos, capacity, used, fill=-1)
+        self._spans = _grow(self._spans, capacity, used)
+        if self._matrix is not None:
+            self._matrix = _grow(self._matrix, capacity, used)
+        if self._codes is not None:
+            self._codes = _grow(self._codes, capacity, used)
+
+    def remove_video(self, video_id: str) -> None:
+        with self._lock:
+            code = self._video_codes.get(video_id)
+            if code is not None:
+                self._videos[self._videos == code] = -1
+                self._temporal.remove(code)
+
+    def record(self, row: int) -> VectorRecord:
+        start_ms, end_ms = self._spans[row]
+        if self._matrix is not None:
+            embedding = self._matrix[row].copy()
+        else:
+            embedding = self.quantizer.decode(self._codes[row : row + 1])[0]
+        return VectorRecord(self._video_ids[self._videos[row]], int(start_ms), int(end_ms), embedding)
+
+    def rows(self, video_id: str | None = None) -> np.ndarray:
+        """Row numbers of live records, optionally of one video only."""
+        videos = self._videos[: self._count]
+        if video_id is None:
+            return np.flatnonzero(videos >= 0)
+        code = self._video_codes.get(video_id)
+        return np.zeros(0, dtype=np.int64) if code is None else np.flatnonzero(videos == code)
+
+    def rows_overlapping(self, video_id: str, start_ms: int, end_ms: int) -> np.ndarray:
+        """Row numbers of live records of ``video_id`` overlapping ``[start_ms, end_ms)``."""
+        code = self._video_codes.get(video_id)
+        if code is None:
+            return np.zeros(0, dtype=np.int64)
+        return self._temporal.overlapping(code, start_ms, end_ms)
+
+    def _scores(self, query: np.ndarray, rows: np.ndarray | slice) -> np.ndarray:
+        if self._matrix is not None:
+            return self._matrix[rows] @ query
+        return self.quantizer.scores(query, self._codes[rows])
+
+    @staticmethod
+    def _normalise(query: np.ndarray) -> np.ndarray:
+        query = np.asarray(query, dtype=np.float32)
+        return query / (np.linalg.norm(query) or 1.0)
+
+    def search_rows(
+        self,
+        query: np.ndarray,
+        rows: np.ndarray,
+        k: int = 10,
+    ) -> list[SearchHit]:
+        """Search over the given row numbers only."""
+        if len(rows) == 0:
+            return []
+        query = self._normalise(query)
+        return self._hits(*_top_k(rows, self._scores(query, rows), k))
+
+    def _search_all(self, query: np.ndarray, k: int) -> list[SearchHit]:
+        # Score the matrix in place (gathering the live rows would copy it)
+        # and drop removed rows afterwards.
+        count = self._count
+        scores = self._scores(self._normalise(query), slice(0, count))
+        live = self._videos[:count] >= 0
+        scores[~live] = -np.inf
+        return self._hits(*_top_k(np.arange(count), scores, min(k, int(np.count_nonzero(live)))))
+
+    def _hits(self, rows: np.ndarray, scores: np.ndarray) -> list[SearchHit]:
+        return [SearchHit(self.record(int(row)), float(score)) for row, score in zip(rows, scores)]
+
+    def search(
+        self,
+        query: np.ndarray,
+        k: int = 10,
+        *,
+        video_id: str | None = None,
+        nprobe: int | None = None,
+    ) -> list[SearchHit]:
+        """Return the ``k`` records most similar to ``query``, best first."""
+        if self._count == 0:
+            return []
+        if video_id is not None:
+            return self.search_rows(query, self.rows(video_id), k)
+        candidates = None if self.index is None else self.index.candidates(self._normalise(query), nprobe)
+        if candidates is None:
+            return self._search_all(query, k)
+        return self.search_rows(query, candidates[self._videos[candidates] >= 0], k)
@@ -0,0 +1,233 @@
+"""Memory-mapped, array-backed vector store for coarse-grained embeddings.
+
+Embeddings live in one contiguous row-major file of unit-normalised
+float32 (or float16) vectors, with a side-car table of fixed-width
+metadata rows (video, start, end) and a small JSON list of video ids.
+Opening a store maps the files instead of loading them, so startup is
+near-instant, processes serving the same store share page-cache pages, and
+cosine search is a matrix-vector product over the mapped matrix.
+
+With a quantizer, compact codes are written next to the float rows and
+searched with asymmetric distances; only the top candidates are re-ranked
+against the full-precision rows, which therefore stay on disk rather than
+resident in memory.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Iterable
+
+import numpy as np
+
+from video_agent.stores.memory import SearchHit, VectorRecord, _top_k
+from video_agent.stores.quantization import Quantizer, load_quantizer
+
+META_DTYPE = np.dtype([("video", "<i4"), ("start_ms", "<i8"), ("end_ms", "<i8")])
+_REMOVED = -1
+_BLOCK_ROWS = 1 << 16  # rows scored per block when upcasting float16
+
+
+class MmapVectorStore:
+    """Append-only vector store persisted under ``root``.
+
+    ``dim`` and ``dtype`` are fixed when the store is created and read back
+    from ``header.json`` afterwards. Removed videos are tombstoned in the
+    metadata table rather than rewritten. A ``quantizer`` is likewise fixed
+    at creation; it trains on the first ``quantizer.train_rows`` rows.
+    Writers within one process are serialised by a lock.
+    """
+
+    def __init__(
+        self,
+        root: str | Path,
+        dim: int | None = None,
+        *,
+        dtype: str = "float32",
+        quantizer: Quantizer | None = None,
+    ) -> None:
+        self.root = Path(root)
+        header_path = self.root / "header.json"
+        if header_path.exists():
+            header = json.loads(header_path.read_text())
+            if dim is not None and dim != header["dim"]:
+                raise ValueError(f"store at {self.root} has dim {header['dim']}, not {dim}")
+            self.dim = header["dim"]
+            self.dtype = np.dtype(header["dtype"])
+            quantizer_path = self.root / "quantizer.npz"
+            self.quantizer = load_quantizer(quantizer_path) if quantizer_path.exists() else None
+        else:
+            if dim is None:
+                raise ValueError(f"no store at {self.root}; pass dim to create one")
+            if np.dtype(dtype) not in (np.float32, np.float16):
+                raise ValueError("dtype must be float32 or float16")
+            if quantizer is not None:
+                quantizer.code_size(dim)  # raises if it cannot encode dim-dimensional vectors
+            self.dim = dim
+            self.dtype = np.dtype(dtype)
+            self.root.mkdir(parents=True, exist_ok=True)
+            header_path.write_text(json.dumps({"dim": dim, "dtype": self.dtype.name}))
+            (self.root / "embeddings.bin").touch()
+            (self.root / "meta.bin").touch()
+            (self.root / "videos.json").write_text("[]")
+            self.quantizer = quantizer
+            if quantizer is not None:
+                quantizer.save(self.root / "quantizer.npz")
+                (self.root / "codes.bin").touch()
+        self._videos: list[str] = []
+        self._video_index: dict[str, int] = {}
+        self._matrix = np.zeros((0, self.dim), dtype=self.dtype)
+        self._meta = np.zeros(0, dtype=META_DTYPE)
+        self._codes: np.ndarray | None = None
+        self._lock = threading.Lock()
+        self.refresh()
+
+    @property
+    def _embeddings_path(self) -> Path:
+        return self.root / "embeddings.bin"
+
+    @property
+    def _meta_path(self) -> Path:
+        return self.root / "meta.bin"
+
+    def refresh(self) -> None:
+        """Re-map the files, picking up rows appended by other processes."""
+        self._videos = json.loads((self.root / "videos.json").read_text())
+        self._video_index = {video_id: i for i, video_id in enumerate(self._videos)}
+        rows = min(
+            self._meta_path.stat().st_size // META_DTYPE.itemsize,
+            self._embeddings_path.stat().st_size // (self.dim * self.dtype.itemsize),
+        )
+        self._codes = None
+        if rows == 0:
+            self._matrix = np.zeros((0, self.dim), dtype=self.dtype)
+            self._meta = np.zeros(0, dtype=META_DTYPE)
+            return
+        self._matrix = np.memmap(self._embeddings_path, dtype=self.dtype, mode="r", shape=(rows, self.dim))
+        self._meta = np.memmap(self._meta_path, dtype=META_DTYPE, mode="r+", shape=(rows,))
+        if self.quantizer is not None and not self.quantizer.trained:
+            # Another process may have trained it since this store was opened.
+            self.quantizer = load_quantizer(self.root / "quantizer.npz")
+        if self.quantizer is not None and self.quantizer.trained:
+            code_size = self.quantizer.code_size(self.dim)
+            if (self.root / "codes.bin").stat().st_size // code_size >= rows:
+                self._codes = np.memmap(
+                    self.root / "codes.bin", dtype=np.uint8, mode="r", shape=(rows, code_size)
+                )
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self._meta["video"] != _REMOVED))
+
+    def add(self, records: Iterable[VectorRecord]) -> None:
+        records = list(records)
+        if not records:
+            return
+        matrix = np.stack([np.asarray(r.embedding, dtype=np.float32) for r in records])
+        if matrix.shape[1] != self.dim:
+            raise ValueError(f"expected {self.dim}-dimensional embeddings, got {matrix.shape[1]}")
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix /= np.where(norms > 0, norms, 1.0)
+        with self._lock:
+            self._append(records, matrix)
+
+    def _append(self, records: list[VectorRecord], matrix: np.ndarray) -> None:
+        meta = np.empty(len(records), dtype=META_DTYPE)
+        for i, record in enumerate(records):
+            if record.video_id not in self._video_index:
+                self._video_index[record.video_id] = len(self._videos)
+                self._videos.append(record.video_id)
+            meta[i] = (self._video_index[record.video_id], record.start_ms, record.end_ms)
+        self._write_videos()
+        with open(self._embeddings_path, "ab") as f:
+            f.write(matrix.astype(self.dtype).tobytes())
+        quantizer = self.quantizer
+        if quantizer is not None and quantizer.trained:
+            with open(self.root / "codes.bin", "ab") as f:
+                f.write(quantizer.encode(matrix).tobytes())
+        # Metadata last: a row only becomes visible once both files contain it.
+        with open(self._meta_path, "ab") as f:
+            f.write(meta.tobytes())
+        self.refresh()
+        if quantizer is not None and not quantizer.trained and len(self._meta) >= quantizer.train_rows:
+            quantizer.train(np.asarray(self._matrix, dtype=np.float32))
+            (self.root / "codes.bin").write_bytes(
+                quantizer.encode(np.asarray(self._matrix, dtype=np.float32)).tobytes()
+            )
+            quantizer.save(self.root / "quantizer.npz")
+            self.refresh()
+
+    def _write_videos(self) -> None:
+        path = self.root / "videos.json"
+        tmp = path.with_name(f"videos.json.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(self._videos))
+        os.replace(tmp, path)
+
+    def remove_video(self, video_id: str) -> None:
+        with self._lock:
+            index = self._video_index.get(video_id)
+            if index is None or len(self._meta) == 0:
+                return
+            self._meta["video"][self._meta["video"] == index] = _REMOVED
+            if isinstance(self._meta, np.memmap):
+                self._meta.flush()
+
+    def scores(self, query: np.ndarray, *, exact: bool = False) -> np.ndarray:
+        """Cosine similarity of ``query`` with every row (removed rows included).
+
+        Scores come from the quantized codes when the store has them, unless
+        ``exact`` is true.
+        """
+        query = np.asarray(query, dtype=np.float32)
+        query = query / (np.linalg.norm(query) or 1.0)
+        if self._codes is not None and not exact:
+            return self.quantizer.scores(query, self._codes)
+        if self.dtype == np.float32:
+            return self._matrix @ query
+        out = np.empty(len(self._matrix), dtype=np.float32)
+        for start in range(0, len(self._matrix), _BLOCK_ROWS):
+            block = self._matrix[start : start + _BLOCK_ROWS].astype(np.float32)
+            out[start : start + len(block)] = block @ query
+        return out
+
+    def record(self, row: int) -> VectorRecord:
+        meta = self._meta[row]
+        return VectorRecord(
+            self._videos[meta["video"]],
+            int(meta["start_ms"]),
+            int(meta["end_ms"]),
+            np.array(self._matrix[row], dtype=np.float32),
+        )
+
+    def search(
+        self,
+        query: np.ndarray,
+        k: int = 10,
+        *,
+        video_id: str | None = None,
+        rerank: int = 0,
+    ) -> list[SearchHit]:
+        """Return the ``k`` records most similar to ``query``, best first.
+
+        On a quantized store, ``rerank > 0`` re-scores the best
+        ``max(k, rerank)`` approximate candidates against the full-precision
+        rows and returns exact scores for them.
+        """
+        if len(self._meta) == 0:
+            return []
+        videos = self._meta["video"]
+        if video_id is not None:
+            rows = np.flatnonzero(videos == self._video_index.get(video_id, _REMOVED - 1))
+        else:
+            rows = np.flatnonzero(videos != _REMOVED)
+        scores = self.scores(query)[rows]
+        if self._codes is not None and rerank > 0:
+            rows, _ = _top_k(rows, scores, max(k, rerank))
+            rows = np.sort(rows)  # sequential reads from the mapped file
+            normalised = np.asarray(query, dtype=np.float32)
+            normalised = normalised / (np.linalg.norm(normalised) or 1.0)
+            scores = np.asarray(self._matrix[rows], dtype=np.float32) @ normalised
+        rows, scores = _top_k(rows, scores, k)
+        return [SearchHit(self.record(int(row)), float(score)) for row, score in zip(rows, scores)]
@@ -0,0 +1,218 @@
+"""Compressed embedding codes with asymmetric-distance search.
+
+Both quantizers keep database vectors as uint8 codes and score a float32
+query against them directly (asymmetric distance computation), so vectors
+are never decompressed during search:
+
+* :class:`ScalarQuantizer` stores one byte per dimension with a
+  per-dimension offset and scale (4x smaller than float32).
+* :class:`ProductQuantizer` splits vectors into ``subspaces`` and stores one
+  byte per subspace, the index of the nearest of 256 sub-centroids
+  (e.g. 32x smaller for 256-d float32 with 32 subspaces).
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Protocol
+
+import numpy as np
+
+_BLOCK_ROWS = 1 << 15
+
+
+class Quantizer(Protocol):
+    """What the vector stores need from a quantizer.
+
+    Stores call :meth:`code_size` before adding their first vector; it
+    raises :class:`ValueError` if ``dim``-dimensional vectors cannot be
+    encoded.
+    """
+
+    train_rows: int
+
+    @property
+    def trained(self) -> bool: ...
+
+    def code_size(self, dim: int) -> int: ...
+
+    def train(self, vectors: np.ndarray) -> None: ...
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray: ...
+
+    def decode(self, codes: np.ndarray) -> np.ndarray: ...
+
+    def scores(self, query: np.ndarray, codes: np.ndarray) -> np.ndarray: ...
+
+    def save(self, path: str | Path) -> None: ...
+
+
+class ScalarQuantizer:
+    """8-bit scalar quantization with per-dimension offset and scale."""
+
+    def __init__(self, *, train_rows: int = 10_000) -> None:
+        self.train_rows = train_rows
+        self.offset: np.ndarray | None = None
+        self.scale: np.ndarray | None = None
+
+    @property
+    def trained(self) -> bool:
+        return self.offset is not None
+
+    def code_size(self, dim: int) -> int:
+        return dim
+
+    def train(self, vectors: np.ndarray) -> None:
+        vectors = np.asarray(vectors, dtype=np.float32)
+        low, high = vectors.min(axis=0), vectors.max(axis=0)
+        self.offset = low
+        self.scale = np.maximum(high - low, 1e-12) / 255.0
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        codes = np.rint((np.asarray(vectors, dtype=np.float32) - self.offset) / self.scale)
+        return np.clip(codes, 0, 255).astype(np.uint8)
+
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        return codes.astype(np.float32) * self.scale + self.offset
+
+    def scores(self, query: np.ndarray, codes: np.ndarray) -> np.ndarray:
+        """Inner products of ``query`` with the vectors encoded by ``codes``."""
+        query = np.asarray(query, dtype=np.float32)
+        weights = query * self.scale
+        bias = np.float32(query @ self.offset)
+        out = np.empty(len(codes), dtype=np.float32)
+        for start in range(0, len(codes), _BLOCK_ROWS):
+            block = codes[start : start + _BLOCK_ROWS]
+            out[start : start + len(block)] = block.astype(np.float32) @ weights + bias
+        return out
+
+    def save(self, path: str | Path) -> None:
+        empty = np.zeros(0, dtype=np.float32)
+        np.savez(
+            path,
+            kind="scalar",
+            train_rows=self.train_rows,
+            offset=self.offset if self.trained else empty,
+            scale=self.scale if self.trained else empty,
+        )
+
+
+class ProductQuantizer:
+    """Product quantization with 256 centroids (one byte) per subspace."""
+
+    def __init__(
+        self,
+        *,
+        subspaces: int = 16,
+        train_rows: int = 20_000,
+        iterations: int = 15,
+        seed: int = 0,
+    ) -> None:
+        if subspaces < 1:
+            raise ValueError("subspaces must be >= 1")
+        if train_rows < 256:
+            raise ValueError("train_rows must be >= 256, one vector per centroid")
+        self.subspaces = subspaces
+        self.train_rows = train_rows
+        self.iterations = iterations
+        self.seed = seed
+        self.centroids: np.ndarray | None = None  # (subspaces, 256, dim // subspaces)
+
+    @property
+    def trained(self) -> bool:
+        return self.centroids is not None
+
+    def code_size(self, dim: int) -> int:
+        if dim % self.subspaces:
+            raise ValueError(f"dimension {dim} is not divisible by {self.subspaces} subspaces")
+        return self.subspaces
+
+    def _split(self, vectors: np.ndarray) -> np.ndarray:
+        vectors = np.asarray(vectors, dtype=np.float32)
+        self.code_size(vectors.shape[1])
+        return vectors.reshape(len(vectors), self.subspaces, -1)
+
+    @staticmethod
+    def _nearest(parts: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+        # argmin ||x - c||^2 == argmin (||c||^2 - 2 x.c)
+        norms = np.einsum("kd,kd->k", centroids, centroids)
+        out = np.empty(len(parts), dtype=np.uint8)
+        for start in range(0, len(parts), _BLOCK_ROWS):
+            block = parts[start : start + _BLOCK_ROWS]
+            out[start : start + len(block)] = np.argmin(norms - 2.0 * block @ centroids.T, axis=1)
+        return out
+
+    def train(self, vectors: np.ndarray) -> None:
+        parts = self._split(vectors)
+        if len(parts) < 256:
+            raise ValueError("need at least 256 training vectors")
+        rng = np.random.default_rng(self.seed)
+        if len(parts) > self.train_rows:
+            parts = parts[rng.choice(len(parts), self.train_rows, replace=False)]
+        centroids = np.empty((self.subspaces, 256, parts.shape[2]), dtype=np.float32)
+        for j in range(self.subspaces):
+            data = np.ascontiguousarray(parts[:, j])
+            cells = data[rng.choice(len(data), 256, replace=False)].copy()
+            for _ in range(self.iterations):
+                assign = self._nearest(data, cells)
+                sums = np.zeros_like(cells)
+                np.add.at(sums, assign, data)
+                counts = np.bincount(assign, minlength=256)
+                empty = counts == 0
+                cells = sums / np.maximum(counts, 1)[:, None]
+                cells[empty] = data[rng.choice(len(data), int(empty.sum()))]
+            centroids[j] = cells
+        self.centroids = centroids
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        parts = self._split(vectors)
+        codes = np.empty((len(parts), self.subspaces), dtype=np.uint8)
+        for j in range(self.subspaces):
+            codes[:, j] = self._nearest(np.ascontiguousarray(parts[:, j]), self.centroids[j])
+        return codes
+
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        parts = self.centroids[np.arange(self.subspaces), codes]
+        return parts.reshape(len(codes), -1)
+
+    def scores(self, query: np.ndarray, codes: np.ndarray) -> np.ndarray:
+        """Inner products of ``query`` with the vectors encoded by ``codes``."""
+        query = np.asarray(query, dtype=np.float32).reshape(self.subspaces, -1)
+        table = np.einsum("jkd,jd->jk", self.centroids, query)  # (subspaces, 256)
+        out = np.zeros(len(codes), dtype=np.float32)
+        for j in range(self.subspaces):
+            out += table[j, codes[:, j]]
+        return out
+
+    def save(self, path: str | Path) -> None:
+        np.savez(
+            path,
+            kind="product",
+            subspaces=self.subspaces,
+            train_rows=self.train_rows,
+            iterations=self.iterations,
+            seed=self.seed,
+            centroids=self.centroids if self.trained else np.zeros(0, dtype=np.float32),
+        )
+
+
+def load_quantizer(path: str | Path) -> ScalarQuantizer | ProductQuantizer:
+    """Load a quantizer written by ``save``."""
+    with np.load(path) as data:
+        kind = str(data["kind"])
+        if kind == "scalar":
+            quantizer = ScalarQuantizer(train_rows=int(data["train_rows"]))
+            if data["offset"].size:
+                quantizer.offset, quantizer.scale = data["offset"], data["scale"]
+            return quantizer
+        if kind == "product":
+            quantizer = ProductQuantizer(
+                subspaces=int(data["subspaces"]),
+                train_rows=int(data["train_rows"]),
+                iterations=int(data["iterations"]),
+                seed=int(data["seed"]),
+            )
+            if data["centroids"].size:
+                quantizer.centroids = data["centroids"]
+            return quantizer
+    raise ValueError(f"unknown quantizer kind {kind!r} in {path}")
@@ -0,0 +1,50 @@
+"""Timestamped transcript storage with range lookups."""
+
+from __future__ import annotations
+
+import threading
+from typing import Iterable
+
+from video_agent.asr.base import TranscriptSegment
+from video_agent.stores.interval import TemporalIndex
+
+
+class TranscriptStore:
+    """Transcript segments per video, queryable by time range; writers are serialised by a lock."""
+
+    def __init__(self) -> None:
+        self._segments: list[TranscriptSegment] = []
+        self._videos: list[str] = []
+        self._index: TemporalIndex[str] = TemporalIndex()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._segments)
+
+    def add(self, video_id: str, segments: Iterable[TranscriptSegment]) -> None:
+        segments = list(segments)
+        with self._lock:
+            first = len(self._segments)
+            self._segments.extend(segments)
+            self._videos.extend([video_id] * len(segments))
+            self._index.add(
+                video_id,
+                (s.start_ms for s in segments),
+                (s.end_ms for s in segments),
+                range(first, first + len(segments)),
+            )
+
+    def remove_video(self, video_id: str) -> None:
+        with self._lock:
+            self._index.remove(video_id)
+
+    def segment(self, segment_id: int) -> tuple[str, TranscriptSegment]:
+        """``(video_id, segment)`` for an id handed out in insertion order."""
+        return self._videos[segment_id], self._segments[segment_id]
+
+    def between(self, video_id: str, start_ms: int, end_ms: int) -> list[TranscriptSegment]:
+        """Segments of ``video_id`` overlapping ``[start_ms, end_ms)``, in time order."""
+        return [self._segments[i] for i in self._index.overlapping(video_id, start_ms, end_ms)]
+
+    def text_between(self, video_id: str, start_ms: int, end_ms: int) -> str:
+        return " ".join(segment.text for segment in self.between(video_id, start_ms, end_ms))